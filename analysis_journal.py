@@ -0,0 +1,183 @@
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+from schema_migrations import CURRENT_SCHEMA_VERSION
+
+
+def get_journal_path(analysis_path: str) -> Path:
+    """Journal file that sits next to an analysis file"""
+    return Path(f"{analysis_path}.journal")
+
+
+def read_journal_records(journal_path: Path) -> List[Dict[str, Any]]:
+    """Read all complete records from a journal, ignoring a torn trailing line from a crash"""
+    records = []
+    if not journal_path.exists():
+        return records
+
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"[DEBUG] Skipping incomplete journal record in {journal_path}")
+                break
+    return records
+
+
+def apply_journal_record(data: Dict[str, Any], record: Dict[str, Any]):
+    """Apply one journal delta onto clean-format export data in place"""
+    if 'header' in record:
+        # The file's own schema version still describes the sprites that were not journaled
+        data.update({key: value for key, value in record['header'].items() if key != 'schema_version'})
+
+    if 'sprite' in record:
+        # Journaled sprites are written in the current schema whatever version the file is
+        sprite_data = dict(record['sprite'], schema_version=CURRENT_SCHEMA_VERSION)
+        sprites = data.setdefault('sprites', [])
+        for i, existing in enumerate(sprites):
+            if existing.get('sprite_index') == sprite_data['sprite_index']:
+                sprites[i] = sprite_data
+                break
+        else:
+            sprites.append(sprite_data)
+            sprites.sort(key=lambda s: s.get('sprite_index', 0))
+
+
+def replay_journal(data: Dict[str, Any], analysis_path: str) -> int:
+    """Replay the journal next to analysis_path onto loaded export data, returns records applied"""
+    records = read_journal_records(get_journal_path(analysis_path))
+    for record in records:
+        apply_journal_record(data, record)
+    return len(records)
+
+
+class AnalysisJournal:
+    """
+    Append-only autosave journal for an analysis file.
+
+    The UI thread collects per-sprite deltas for dirty sprites only and hands them
+    to a background writer thread, which appends them as JSON lines to
+    '<analysis file>.journal'. Once the journal grows past compact_threshold records
+    the writer merges it into the full analysis file and truncates it. Because the
+    writer works on plain export dicts it never touches the live model.
+    """
+
+    def __init__(self, analysis_path: str, autosave_interval: float = 5.0, compact_threshold: int = 200):
+        self.analysis_path = str(analysis_path)
+        self.journal_path = get_journal_path(self.analysis_path)
+        self.autosave_interval = autosave_interval
+        self.compact_threshold = compact_threshold
+
+        self.record_count = len(read_journal_records(self.journal_path))
+        self._last_flush_time = time.monotonic()
+        self._file_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        # Record batches the writer failed to append, handed back to the UI thread to be marked dirty again
+        self._failed_records: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer_loop, name="analysis-journal", daemon=True)
+        self._thread.start()
+
+    def autosave_due(self) -> bool:
+        """Check whether the autosave interval has elapsed since the last flush"""
+        return time.monotonic() - self._last_flush_time >= self.autosave_interval
+
+    def compaction_due(self, pending: int = 0) -> bool:
+        """Check whether appending pending more records makes the writer compact the journal"""
+        return self.record_count + pending >= self.compact_threshold
+
+    def append(self, records: List[Dict[str, Any]]):
+        """Queue journal records for the background writer"""
+        self._last_flush_time = time.monotonic()
+        if records:
+            self._queue.put(('append', records))
+
+    def take_failed_records(self) -> List[Dict[str, Any]]:
+        """Records whose append failed since the last call"""
+        records: List[Dict[str, Any]] = []
+        while True:
+            try:
+                records.extend(self._failed_records.get_nowait())
+            except queue.Empty:
+                return records
+
+    def run_full_save(self, save_callable):
+        """Run a full save of the analysis file once pending writes finish, then truncate the journal"""
+        self._queue.join()
+        with self._file_lock:
+            save_callable(self.analysis_path)
+            self._truncate()
+
+    def close(self):
+        """Flush pending records and stop the writer thread"""
+        self._queue.put(('stop', None))
+        self._thread.join()
+
+    def _writer_loop(self):
+        """Background thread: append records and compact when the journal grows too long"""
+        while True:
+            action, payload = self._queue.get()
+            try:
+                if action == 'stop':
+                    return
+                with self._file_lock:
+                    if action == 'append':
+                        try:
+                            self._write_records(payload)
+                        except Exception:
+                            # The model already cleared these edits from its dirty state; give them back for a retry
+                            self._failed_records.put(payload)
+                            raise
+                        if self.compaction_due():
+                            self._compact()
+            except Exception as e:
+                print(f"Error writing analysis journal: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write_records(self, records: List[Dict[str, Any]]):
+        """Append records as JSON lines and fsync so they survive a crash"""
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.record_count += len(records)
+        print(f"[DEBUG] Journal autosave: {len(records)} records -> {self.journal_path.name}")
+
+    def _compact(self):
+        """Merge the journal into the full analysis file with an atomic replace"""
+        from spritesheet_model import SpritesheetModel, write_clean_export, write_sprite_index
+
+        if self.record_count == 0 or not Path(self.analysis_path).exists():
+            return
+
+        compression = SpritesheetModel._detect_compression(self.analysis_path) or 'none'
+        with SpritesheetModel._open_export_stream(self.analysis_path, compression, mode='rt') as f:
+            data = json.load(f)
+        applied = replay_journal(data, self.analysis_path)
+
+        # Rewrite with the same streaming writer as a full save, refreshing the sprite index for plain files
+        index = {} if compression == 'none' else None
+        sprites = data.pop('sprites', [])
+        temp_path = f"{self.analysis_path}.tmp"
+        with SpritesheetModel._open_export_stream(temp_path, compression) as f:
+            write_clean_export(f, data, sprites, index=index)
+        os.replace(temp_path, self.analysis_path)
+        if index is not None:
+            write_sprite_index(self.analysis_path, index)
+        self._truncate()
+        print(f"[DEBUG] Journal compacted: {applied} records merged into {Path(self.analysis_path).name}")
+
+    def _truncate(self):
+        """Empty the journal after its records are part of the full file"""
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.record_count = 0
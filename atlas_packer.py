@@ -0,0 +1,224 @@
+import json
+import pygame
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any
+from spritesheet_model import SpritesheetModel, SpriteData
+
+
+def next_power_of_two(value: int) -> int:
+    """Smallest power of two that is >= value"""
+    power = 1
+    while power < value:
+        power <<= 1
+    return power
+
+
+class MaxRectsBin:
+    """
+    MaxRects bin packer using the Best Short Side Fit heuristic.
+
+    Keeps a list of maximal free rectangles. Each placement splits every free rectangle
+    it overlaps, and only the newly split pieces are checked for containment, which keeps
+    insertion fast enough for thousands of sprites.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.free_rects: List[Tuple[int, int, int, int]] = [(0, 0, width, height)]
+        self.used_width = 0
+        self.used_height = 0
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Place a width x height rectangle, returns its position or None if it does not fit"""
+        best = None
+        best_short = best_long = None
+        for free_x, free_y, free_w, free_h in self.free_rects:
+            if width <= free_w and height <= free_h:
+                leftover_w = free_w - width
+                leftover_h = free_h - height
+                short_side = min(leftover_w, leftover_h)
+                long_side = max(leftover_w, leftover_h)
+                if best is None or short_side < best_short or (short_side == best_short and long_side < best_long):
+                    best = (free_x, free_y)
+                    best_short, best_long = short_side, long_side
+        if best is None:
+            return None
+
+        self._place(best[0], best[1], width, height)
+        self.used_width = max(self.used_width, best[0] + width)
+        self.used_height = max(self.used_height, best[1] + height)
+        return best
+
+    def _place(self, x: int, y: int, width: int, height: int):
+        """Split the free rectangles around a placed rectangle and prune contained ones"""
+        right, bottom = x + width, y + height
+        kept = []
+        split = []
+        for free in self.free_rects:
+            free_x, free_y, free_w, free_h = free
+            free_right, free_bottom = free_x + free_w, free_y + free_h
+            if x >= free_right or right <= free_x or y >= free_bottom or bottom <= free_y:
+                kept.append(free)
+                continue
+            if x > free_x:
+                split.append((free_x, free_y, x - free_x, free_h))
+            if right < free_right:
+                split.append((right, free_y, free_right - right, free_h))
+            if y > free_y:
+                split.append((free_x, free_y, free_w, y - free_y))
+            if bottom < free_bottom:
+                split.append((free_x, bottom, free_w, free_bottom - bottom))
+
+        # Untouched rectangles were already maximal and each new piece lies inside a previous free
+        # rectangle, so only the new pieces can be redundant. Every piece borders the placed rectangle,
+        # so only untouched rectangles touching it can contain one.
+        touching = [k for k in kept if k[0] <= right and k[0] + k[2] >= x and k[1] <= bottom and k[1] + k[3] >= y]
+        new_rects = []
+        for i, rect in enumerate(split):
+            if any(_contains(other, rect) for other in touching):
+                continue
+            if any(_contains(other, rect) and (other != rect or j < i) for j, other in enumerate(split) if j != i):
+                continue
+            new_rects.append(rect)
+        self.free_rects = kept + new_rects
+
+
+def _contains(outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]) -> bool:
+    return (inner[0] >= outer[0] and inner[1] >= outer[1] and
+            inner[0] + inner[2] <= outer[0] + outer[2] and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+def pack_rects(sizes: List[Tuple[int, int]], max_size: int = 2048) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """
+    Pack rectangles into as few max_size bins as needed.
+    Returns (page, x, y) per input rectangle and the power-of-two size of each page (capped at max_size).
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (max(sizes[i]), sizes[i][0] * sizes[i][1]), reverse=True)
+    placements: List[Optional[Tuple[int, int, int]]] = [None] * len(sizes)
+    bins: List[MaxRectsBin] = []
+
+    for i in order:
+        width, height = sizes[i]
+        if width > max_size or height > max_size:
+            raise ValueError(f"Rectangle {width}x{height} does not fit in a {max_size}x{max_size} atlas")
+        for page, atlas_bin in enumerate(bins):
+            position = atlas_bin.insert(width, height)
+            if position is not None:
+                placements[i] = (page, position[0], position[1])
+                break
+        else:
+            bins.append(MaxRectsBin(max_size, max_size))
+            position = bins[-1].insert(width, height)
+            placements[i] = (len(bins) - 1, position[0], position[1])
+
+    # Shrink each page to the smallest power-of-two size that still holds everything packed into it,
+    # never past max_size when that is not a power of two itself
+    page_sizes = [(min(next_power_of_two(atlas_bin.used_width), max_size), min(next_power_of_two(atlas_bin.used_height), max_size))
+                  for atlas_bin in bins]
+    return placements, page_sizes
+
+
+def _frame_with_bleed(frame: pygame.Surface, bleed: int) -> pygame.Surface:
+    """Copy a frame with its border pixels extruded outward by bleed pixels to avoid filtering seams"""
+    if bleed <= 0:
+        return frame
+    width, height = frame.get_size()
+    padded = pygame.Surface((width + 2 * bleed, height + 2 * bleed), pygame.SRCALPHA)
+    padded.fill((0, 0, 0, 0))
+    # BLEND_RGBA_MAX onto fully transparent pixels copies them exactly instead of alpha blending
+    padded.blit(frame, (bleed, bleed), special_flags=pygame.BLEND_RGBA_MAX)
+    for i in range(1, bleed + 1):
+        padded.blit(frame, (bleed, bleed - i), (0, 0, width, 1), special_flags=pygame.BLEND_RGBA_MAX)
+        padded.blit(frame, (bleed, bleed + height - 1 + i), (0, height - 1, width, 1), special_flags=pygame.BLEND_RGBA_MAX)
+    # Columns include the extruded rows so the corners are filled too
+    left_column = padded.subsurface((bleed, 0, 1, height + 2 * bleed)).copy()
+    right_column = padded.subsurface((bleed + width - 1, 0, 1, height + 2 * bleed)).copy()
+    for i in range(1, bleed + 1):
+        padded.blit(left_column, (bleed - i, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        padded.blit(right_column, (bleed + width - 1 + i, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    return padded
+
+
+def _rebased_point(point: Tuple[int, int], sprite: SpriteData) -> Dict[str, int]:
+    return {'x': point[0] - sprite.bbox.x, 'y': point[1] - sprite.bbox.y}
+
+
+def _sprite_manifest_geometry(model: SpritesheetModel, sprite: SpriteData) -> Dict[str, Any]:
+    """Diamond vertices and keypoints rebased onto the trimmed frame"""
+    geometry: Dict[str, Any] = {'diamond_vertices': {}, 'custom_keypoints': {}}
+    if sprite.has_diamond_info():
+        layers = {
+            'lower': sprite.diamond_info.lower_diamond,
+            'upper': sprite.diamond_info.upper_diamond,
+            **sprite.diamond_info.extra_diamonds
+        }
+        for layer, diamond in layers.items():
+            if diamond:
+                coords = model._get_export_vertex_coords(diamond, sprite.sprite_index, layer)
+                geometry['diamond_vertices'][layer] = {
+                    name: _rebased_point(point, sprite) for name, point in coords.items()
+                }
+    for name, point in sprite.custom_keypoints.items():
+        geometry['custom_keypoints'][name] = _rebased_point((point.x, point.y), sprite)
+    return geometry
+
+
+def build_texture_atlas(model: SpritesheetModel, spritesheet_surface: pygame.Surface, output_path: str,
+                        max_size: int = 2048, padding: int = 2, bleed: int = 0) -> Dict[str, Any]:
+    """
+    Crop every analyzed sprite to its bbox, pack the frames into power-of-two atlas PNGs and
+    write a JSON manifest next to them. Returns the manifest.
+
+    output_path names the manifest; pages are written as '<stem>_<page>.png' beside it.
+    """
+    output = Path(output_path)
+    sprites = [sprite for sprite in model.sprites if sprite.bbox and sprite.bbox.width > 0 and sprite.bbox.height > 0]
+    margin = 2 * bleed + padding
+    placements, page_sizes = pack_rects(
+        [(sprite.bbox.width + margin, sprite.bbox.height + margin) for sprite in sprites], max_size
+    )
+
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    for page in pages:
+        page.fill((0, 0, 0, 0))
+
+    manifest_sprites = []
+    for sprite, (page, slot_x, slot_y) in zip(sprites, placements):
+        frame_x, frame_y, _, _ = sprite.get_sprite_rect(model)
+        bbox = sprite.bbox
+        frame = spritesheet_surface.subsurface((frame_x + bbox.x, frame_y + bbox.y, bbox.width, bbox.height))
+        x, y = slot_x + bleed, slot_y + bleed
+        pages[page].blit(_frame_with_bleed(frame, bleed), (slot_x, slot_y), special_flags=pygame.BLEND_RGBA_MAX)
+
+        entry = {
+            'sprite_index': sprite.sprite_index,
+            'atlas': page,
+            'rect': {'x': x, 'y': y, 'width': bbox.width, 'height': bbox.height},
+            'trim_offset': {'x': bbox.x, 'y': bbox.y},
+            'original_size': {'width': sprite.original_size[0], 'height': sprite.original_size[1]},
+        }
+        entry.update(_sprite_manifest_geometry(model, sprite))
+        manifest_sprites.append(entry)
+
+    atlases = []
+    for page, surface in enumerate(pages):
+        page_path = output.with_name(f"{output.stem}_{page}.png")
+        pygame.image.save(surface, str(page_path))
+        atlases.append({'file': page_path.name, 'width': surface.get_width(), 'height': surface.get_height()})
+
+    manifest = {
+        'image_path': model.image_path,
+        'padding': padding,
+        'bleed': bleed,
+        'atlases': atlases,
+        'sprites': sorted(manifest_sprites, key=lambda s: s['sprite_index'])
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    packed_area = sum(sprite.bbox.width * sprite.bbox.height for sprite in sprites)
+    atlas_area = sum(width * height for width, height in page_sizes)
+    print(f"Texture atlas saved to: {output} ({len(sprites)} sprites in {len(pages)} pages, "
+          f"{(packed_area / atlas_area * 100) if atlas_area else 0:.1f}% occupancy)")
+    return manifest
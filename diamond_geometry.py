@@ -0,0 +1,85 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Any
+
+# Array axis orders used by the kernel
+VERTEX_ORDER = ('north', 'south', 'east', 'west')
+MIDPOINT_ORDER = ('north_east', 'east_south', 'south_west', 'west_north')
+QUADRANT_ORDER = ('north', 'south', 'east', 'west')
+
+
+def midpoint(a, b):
+    """Integer midpoint with the one rounding rule used everywhere: floor((a + b) / 2), for ints or arrays"""
+    return (a + b) // 2
+
+
+def compute_diamond_geometry(vertices) -> Dict[str, np.ndarray]:
+    """
+    Derive midpoints, true centers and sub-diamonds for N diamonds at once.
+
+    vertices is an (N, 4, 2) integer array of N/S/E/W vertex x,y (VERTEX_ORDER). Returns:
+      midpoints     (N, 4, 2)     NE, ES, SW, WN edge midpoints (MIDPOINT_ORDER)
+      center        (N, 2)        true center, the midpoint of the north-south diagonal
+      sub_diamonds  (N, 4, 4, 2)  per quadrant (QUADRANT_ORDER), its N/S/E/W corners
+      sub_centers   (N, 4, 2)     per quadrant, the midpoint of its tip and the true center
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, len(VERTEX_ORDER), 2)
+    north, south, east, west = vertices[:, 0], vertices[:, 1], vertices[:, 2], vertices[:, 3]
+
+    north_east = midpoint(north, east)
+    east_south = midpoint(east, south)
+    south_west = midpoint(south, west)
+    west_north = midpoint(west, north)
+    center = midpoint(north, south)
+
+    # Each quadrant is a diamond made of its tip vertex, the two adjacent edge midpoints and the true center
+    sub_diamonds = np.stack([
+        np.stack([north, center, north_east, west_north], axis=1),
+        np.stack([center, south, east_south, south_west], axis=1),
+        np.stack([north_east, east_south, east, center], axis=1),
+        np.stack([west_north, south_west, center, west], axis=1),
+    ], axis=1)
+
+    return {
+        'midpoints': np.stack([north_east, east_south, south_west, west_north], axis=1),
+        'center': center,
+        'sub_diamonds': sub_diamonds,
+        'sub_centers': midpoint(vertices, center[:, None, :]),
+    }
+
+
+def diamond_geometry_points(north: Tuple[int, int], south: Tuple[int, int],
+                            east: Tuple[int, int], west: Tuple[int, int]) -> Dict[str, Any]:
+    """Kernel result for a single diamond as plain (x, y) tuples keyed by name"""
+    geometry = {key: value[0].tolist() for key, value in compute_diamond_geometry([[north, south, east, west]]).items()}
+    return {
+        'midpoints': {name: tuple(point) for name, point in zip(MIDPOINT_ORDER, geometry['midpoints'])},
+        'center': tuple(geometry['center']),
+        'sub_diamonds': {
+            quadrant: {
+                **{name: tuple(point) for name, point in zip(VERTEX_ORDER, corners)},
+                'center': tuple(sub_center)
+            }
+            for quadrant, corners, sub_center in zip(QUADRANT_ORDER, geometry['sub_diamonds'], geometry['sub_centers'])
+        }
+    }
+
+
+def compute_sheet_geometry(model, layer: str = 'lower') -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Geometry of one diamond layer for every sprite of a sheet in a single kernel call.
+    Vertices include manual overrides. Returns a (sprites,) presence mask and the kernel output.
+    """
+    from gameplay_encoding import get_layer_diamond
+
+    present = np.zeros(len(model.sprites), dtype=bool)
+    vertices = np.zeros((len(model.sprites), len(VERTEX_ORDER), 2), dtype=np.int64)
+    for sprite in model.sprites:
+        if not sprite.has_diamond_info():
+            continue
+        diamond = get_layer_diamond(sprite, layer)
+        if diamond is None:
+            continue
+        coords = model._get_export_vertex_coords(diamond, sprite.sprite_index, layer)
+        vertices[sprite.sprite_index] = [coords[name] for name in VERTEX_ORDER]
+        present[sprite.sprite_index] = True
+    return present, compute_diamond_geometry(vertices)
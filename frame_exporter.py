@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import zlib
+import numpy as np
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any
+from spritesheet_model import SpritesheetModel, SpriteData
+
+FRAME_SIDECAR_NAME = 'frames.json'
+
+
+def encode_png_rgba(pixels: np.ndarray) -> bytes:
+    """Encode an (height, width, 4) uint8 RGBA array as PNG bytes (zlib releases the GIL, so threads scale)"""
+    height, width, _ = pixels.shape
+    # Each scanline is prefixed with filter type 0 (None)
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 4)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)) +
+            chunk(b'IEND', b''))
+
+
+def load_spritesheet_pixels(image_path: str) -> np.ndarray:
+    """Load a spritesheet as an (height, width, 4) RGBA array without opening a display"""
+    surface = pygame.image.load(image_path)
+    rgb = pygame.surfarray.array3d(surface)
+    alpha = pygame.surfarray.array_alpha(surface)  # All 255 for images without an alpha channel
+    # surfarray is indexed [x, y]; frames are handled as [y, x] like the PNG scanlines
+    return np.ascontiguousarray(np.dstack((rgb, alpha)).transpose(1, 0, 2))
+
+
+def get_frame_pivot(model: SpritesheetModel, sprite: SpriteData) -> Optional[Tuple[int, int]]:
+    """Lower diamond south vertex (manual override applied) in trimmed-frame coordinates"""
+    if not sprite.has_diamond_info() or not sprite.diamond_info.lower_diamond:
+        return None
+    coords = model._get_export_vertex_coords(sprite.diamond_info.lower_diamond, sprite.sprite_index, 'lower')
+    south_x, south_y = coords['south']
+    return south_x - sprite.bbox.x, south_y - sprite.bbox.y
+
+
+def _frame_signature(model: SpritesheetModel, sprite: SpriteData, source_stamp: Tuple[int, int]) -> str:
+    """Hash of everything that determines a frame's pixels"""
+    bbox = sprite.bbox
+    key = (source_stamp, sprite.get_sprite_rect(model), (bbox.x, bbox.y, bbox.width, bbox.height), model.alpha_threshold)
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def _write_frame(path: Path, pixels: np.ndarray):
+    """Encode and atomically write one frame PNG (runs on the worker pool)"""
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(encode_png_rgba(pixels))
+    os.replace(temp_path, path)
+
+
+def export_trimmed_frames(model: SpritesheetModel, output_dir: str, spritesheet_pixels: Optional[np.ndarray] = None,
+                          max_workers: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Write one trimmed PNG per analyzed frame plus a frames.json sidecar with pivots and edge offsets.
+
+    Frames are cropped to bbox with pixels at or below alpha_threshold cleared, then encoded on a
+    thread pool. Frames whose source, crop and threshold are unchanged since the last export are skipped.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    sidecar_path = output / FRAME_SIDECAR_NAME
+
+    previous_frames: Dict[str, Any] = {}
+    if sidecar_path.exists():
+        try:
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                previous_frames = json.load(f).get('frames', {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[DEBUG] Ignoring unreadable frame sidecar {sidecar_path}: {e}")
+
+    source_stat = os.stat(model.image_path)
+    source_stamp = (source_stat.st_size, source_stat.st_mtime_ns)
+    if spritesheet_pixels is None:
+        spritesheet_pixels = load_spritesheet_pixels(model.image_path)
+
+    frames: Dict[str, Any] = {}
+    jobs = []
+    skipped = 0
+    for sprite in model.sprites:
+        bbox = sprite.bbox
+        if not bbox or bbox.width <= 0 or bbox.height <= 0:
+            continue
+
+        file_name = f"frame_{sprite.sprite_index:04d}.png"
+        signature = _frame_signature(model, sprite, source_stamp)
+        pivot = get_frame_pivot(model, sprite)
+        frames[str(sprite.sprite_index)] = {
+            'file': file_name,
+            'width': bbox.width,
+            'height': bbox.height,
+            'pivot': {'x': pivot[0], 'y': pivot[1]} if pivot else None,
+            'pivot_normalized': {'x': pivot[0] / bbox.width, 'y': pivot[1] / bbox.height} if pivot else None,
+            'trim_offset': {'x': bbox.x, 'y': bbox.y},
+            'edge_offsets': sprite.get_edge_offsets(),
+            'signature': signature
+        }
+
+        previous = previous_frames.get(str(sprite.sprite_index))
+        if not force and previous and previous.get('signature') == signature and (output / file_name).exists():
+            skipped += 1
+            continue
+
+        frame_x, frame_y, _, _ = sprite.get_sprite_rect(model)
+        left, top = frame_x + bbox.x, frame_y + bbox.y
+        pixels = spritesheet_pixels[top:top + bbox.height, left:left + bbox.width].copy()
+        pixels[pixels[:, :, 3] <= model.alpha_threshold] = 0
+        jobs.append((output / file_name, pixels))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda job: _write_frame(*job), jobs))
+
+    sidecar = {
+        'image_path': model.image_path,
+        'alpha_threshold': model.alpha_threshold,
+        'pivot': 'lower_diamond.south_vertex',
+        'frames': frames
+    }
+    temp_sidecar = sidecar_path.with_name(sidecar_path.name + '.tmp')
+    with open(temp_sidecar, 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f, indent=2)
+    os.replace(temp_sidecar, sidecar_path)
+
+    print(f"Trimmed frames exported to: {output} ({len(jobs)} written, {skipped} up to date)")
+    return sidecar
+
+
+def main(argv: Optional[List[str]] = None):
+    """Headless entry point: export trimmed frames for a saved analysis file"""
+    parser = argparse.ArgumentParser(description="Export one trimmed PNG per analyzed frame with pivot metadata")
+    parser.add_argument('analysis', help="Analysis JSON saved by the sprite cleaner")
+    parser.add_argument('output_dir', help="Directory for frame PNGs and frames.json")
+    parser.add_argument('--image', help="Spritesheet image (defaults to the path stored in the analysis)")
+    parser.add_argument('--workers', type=int, default=None, help="Encoder threads (default: CPU count based)")
+    parser.add_argument('--force', action='store_true', help="Re-export frames even if they are up to date")
+    args = parser.parse_args(argv)
+
+    model = SpritesheetModel.load_from_json(args.analysis)
+    if args.image:
+        model.image_path = args.image
+    export_trimmed_frames(model, args.output_dir, max_workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Any
+from spritesheet_model import EdgeProperties, EdgeProperty, GameplayDiamondData, SpriteData
+
+# Fixed ordering of quadrants and edges along the packed array axes
+QUADRANTS = ('north', 'south', 'east', 'west')
+EDGES = ('north_west', 'north_east', 'south_west', 'south_east')
+QUADRANT_INDEX = {name: i for i, name in enumerate(QUADRANTS)}
+EDGE_INDEX = {name: i for i, name in enumerate(EDGES)}
+
+# Tri-state codes for Optional[bool] gameplay flags
+TRI_UNSET = 0
+TRI_FALSE = 1
+TRI_TRUE = 2
+TRI_MASK = 0b11
+
+# Packed edge layout (uint16): bits 0-1 line of sight, bits 2-3 movement, bits 4-15 portal index
+LOS_SHIFT = 0
+MOVEMENT_SHIFT = 2
+PORTAL_SHIFT = 4
+PORTAL_MASK = 0xFFF
+MAX_PORTALS = PORTAL_MASK  # Portal index 0 means "no portal", 1..MAX_PORTALS index the side table
+
+# Combined edge property for each (los | movement << 2) code, derived from EdgeProperties itself
+EDGE_PROPERTY_ORDER: List[EdgeProperty] = list(EdgeProperty)
+
+
+def encode_tristate(value: Optional[bool]) -> int:
+    """Encode an Optional[bool] as a 2-bit tri-state code"""
+    if value is None:
+        return TRI_UNSET
+    return TRI_TRUE if value else TRI_FALSE
+
+
+def decode_tristate(code: int) -> Optional[bool]:
+    """Decode a 2-bit tri-state code back to Optional[bool]"""
+    if code == TRI_UNSET:
+        return None
+    return code == TRI_TRUE
+
+
+def _build_combined_lookup() -> np.ndarray:
+    """Map every los/movement code pair to its EdgeProperty index"""
+    lookup = np.zeros(1 << PORTAL_SHIFT, dtype=np.uint8)
+    for los_code in (TRI_UNSET, TRI_FALSE, TRI_TRUE):
+        for movement_code in (TRI_UNSET, TRI_FALSE, TRI_TRUE):
+            edge = EdgeProperties(blocks_line_of_sight=decode_tristate(los_code),
+                                  blocks_movement=decode_tristate(movement_code))
+            combined = edge.get_combined_property()
+            lookup[(los_code << LOS_SHIFT) | (movement_code << MOVEMENT_SHIFT)] = EDGE_PROPERTY_ORDER.index(combined)
+    return lookup
+
+
+_COMBINED_LOOKUP = _build_combined_lookup()
+
+
+def get_layer_diamond(sprite: SpriteData, layer: str) -> Optional[GameplayDiamondData]:
+    """Get a sprite's diamond for a layer name ('lower', 'upper' or a custom diamond name)"""
+    diamond_info = sprite.diamond_info
+    if not diamond_info:
+        return None
+    if layer == 'lower':
+        return diamond_info.lower_diamond
+    if layer == 'upper':
+        return diamond_info.upper_diamond
+    return diamond_info.extra_diamonds.get(layer)
+
+
+class PackedGameplayLayer:
+    """
+    Bit-packed gameplay properties of one diamond layer across a whole tileset.
+
+    Rows are sprite indices. Walkability is a (sprites, 4) uint8 array of tri-state codes
+    per quadrant, and edges are a (sprites, 4, 4) uint16 array indexed by quadrant and edge,
+    each holding line of sight and movement tri-states plus an index into portal_table.
+    Queries run as numpy operations over every sprite at once.
+    """
+
+    def __init__(self, layer: str, sprite_count: int):
+        self.layer = layer
+        self.sprite_count = sprite_count
+        self.present = np.zeros(sprite_count, dtype=bool)
+        self.walkability = np.zeros((sprite_count, len(QUADRANTS)), dtype=np.uint8)
+        self.edges = np.zeros((sprite_count, len(QUADRANTS), len(EDGES)), dtype=np.uint16)
+        self.portal_table: List[float] = []
+        self._portal_lookup: Dict[float, int] = {}
+
+    @classmethod
+    def from_sprites(cls, layer: str, sprites: List[SpriteData]) -> 'PackedGameplayLayer':
+        """Pack one layer of every sprite"""
+        packed = cls(layer, len(sprites))
+        for sprite in sprites:
+            packed.pack_sprite(sprite)
+        return packed
+
+    def pack_sprite(self, sprite: SpriteData):
+        """(Re)pack the layer's sub-diamonds of one sprite into its row"""
+        row = sprite.sprite_index
+        self.present[row] = False
+        self.walkability[row] = TRI_UNSET
+        self.edges[row] = 0
+
+        # Sprites without any sub-diamond data are skipped without loading deferred diamond_info
+        if not sprite.has_sub_diamond_data():
+            return
+        diamond = get_layer_diamond(sprite, self.layer)
+        if diamond is None or not diamond.sub_diamonds:
+            return
+
+        self.present[row] = True
+        for quadrant, sub_diamond in diamond.sub_diamonds.items():
+            q = QUADRANT_INDEX.get(quadrant)
+            if q is None:
+                continue
+            self.walkability[row, q] = encode_tristate(sub_diamond.is_walkable)
+            for e, edge_name in enumerate(EDGES):
+                self.edges[row, q, e] = self.pack_edge(getattr(sub_diamond, f"{edge_name}_edge"))
+
+    def pack_edge(self, edge: EdgeProperties) -> int:
+        """Encode one edge, adding its portal destination to the side table if needed"""
+        code = (encode_tristate(edge.blocks_line_of_sight) << LOS_SHIFT) | \
+               (encode_tristate(edge.blocks_movement) << MOVEMENT_SHIFT)
+        if edge.z_portal is not None:
+            portal_index = self._portal_lookup.get(edge.z_portal)
+            if portal_index is None:
+                if len(self.portal_table) >= MAX_PORTALS:
+                    raise ValueError(f"Layer '{self.layer}' has more than {MAX_PORTALS} distinct z-portal targets")
+                self.portal_table.append(edge.z_portal)
+                portal_index = len(self.portal_table)
+                self._portal_lookup[edge.z_portal] = portal_index
+            code |= portal_index << PORTAL_SHIFT
+        return code
+
+    def unpack_edge(self, sprite_index: int, quadrant: str, edge: str) -> EdgeProperties:
+        """Decode one packed edge back into EdgeProperties"""
+        code = int(self.edges[sprite_index, QUADRANT_INDEX[quadrant], EDGE_INDEX[edge]])
+        portal_index = (code >> PORTAL_SHIFT) & PORTAL_MASK
+        return EdgeProperties.intern(
+            blocks_line_of_sight=decode_tristate((code >> LOS_SHIFT) & TRI_MASK),
+            blocks_movement=decode_tristate((code >> MOVEMENT_SHIFT) & TRI_MASK),
+            z_portal=self.portal_table[portal_index - 1] if portal_index else None
+        )
+
+    def _edge_codes(self, quadrant: str, edge: str) -> np.ndarray:
+        return self.edges[:, QUADRANT_INDEX[quadrant], EDGE_INDEX[edge]]
+
+    def walkable_mask(self, quadrant: str, is_walkable: Optional[bool] = True) -> np.ndarray:
+        """Sprites whose quadrant has the given walkability"""
+        return self.present & (self.walkability[:, QUADRANT_INDEX[quadrant]] == encode_tristate(is_walkable))
+
+    def line_of_sight_codes(self, quadrant: str, edge: str) -> np.ndarray:
+        """Tri-state line of sight codes of one edge for every sprite"""
+        return (self._edge_codes(quadrant, edge) >> LOS_SHIFT) & TRI_MASK
+
+    def movement_codes(self, quadrant: str, edge: str) -> np.ndarray:
+        """Tri-state movement codes of one edge for every sprite"""
+        return (self._edge_codes(quadrant, edge) >> MOVEMENT_SHIFT) & TRI_MASK
+
+    def combined_property_indices(self, quadrant: str, edge: str) -> np.ndarray:
+        """Index into EDGE_PROPERTY_ORDER of each sprite's combined edge property"""
+        return _COMBINED_LOOKUP[self._edge_codes(quadrant, edge) & ((1 << PORTAL_SHIFT) - 1)]
+
+    def edge_property_mask(self, quadrant: str, edge: str, edge_property: EdgeProperty) -> np.ndarray:
+        """Sprites whose edge has the given combined property (same rules as get_combined_property)"""
+        target = EDGE_PROPERTY_ORDER.index(EdgeProperty(edge_property))
+        return self.present & (self.combined_property_indices(quadrant, edge) == target)
+
+    def portal_mask(self, quadrant: str, edge: str) -> np.ndarray:
+        """Sprites whose edge has a z-portal"""
+        return ((self._edge_codes(quadrant, edge) >> PORTAL_SHIFT) & PORTAL_MASK) != 0
+
+    def portal_targets(self, quadrant: str, edge: str) -> np.ndarray:
+        """Z-portal destination of one edge for every sprite (NaN where there is no portal)"""
+        table = np.array([np.nan] + self.portal_table, dtype=np.float64)
+        return table[(self._edge_codes(quadrant, edge) >> PORTAL_SHIFT) & PORTAL_MASK]
+
+    def find_sprites(self, walkable: Optional[Dict[str, Optional[bool]]] = None,
+                     edges: Optional[Dict[Tuple[str, str], EdgeProperty]] = None) -> np.ndarray:
+        """
+        Indices of sprites matching every condition, e.g. a walkable north quadrant with a passable NE edge:
+        find_sprites(walkable={'north': True}, edges={('north', 'north_east'): EdgeProperty.PASSABLE})
+        """
+        mask = self.present.copy()
+        for quadrant, is_walkable in (walkable or {}).items():
+            mask &= self.walkable_mask(quadrant, is_walkable)
+        for (quadrant, edge), edge_property in (edges or {}).items():
+            mask &= self.edge_property_mask(quadrant, edge, edge_property)
+        return np.flatnonzero(mask)
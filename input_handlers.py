@@ -4,7 +4,8 @@ import os
 from typing import Optional, Dict, Any
 from pathlib import Path
 from spritesheet_model import SpritesheetModel
-from sprite_analysis import SpriteAnalyzer
+from analysis_journal import AnalysisJournal
+from diamond_geometry import midpoint, diamond_geometry_points
 
 
 class InputHandlers:
@@ -22,77 +23,77 @@ class InputHandlers:
         self.LEFT_PANEL_WIDTH = 350
         self.DRAWING_AREA_WIDTH = 1700  # 2400 - 350 - 350
         self.DRAWING_AREA_HEIGHT = 1200
+        
+        # Autosave journal for the analysis file currently being edited (attached on save/load)
+        self.journal: Optional[AnalysisJournal] = None
+        
+        # UI element -> handler routing tables, built once the panels exist
+        self._button_routes: Dict[Any, Any] = {}
+        self._slider_routes: Dict[Any, Any] = {}
+        self._text_routes: Dict[Any, Any] = {}
     
-    def handle_button_press(self, event, ui_elements):
+    def _mark_current_sprite_dirty(self, layer: Optional[str] = None):
+        """Mark the current sprite (or one of its layers) as changed for the autosave journal"""
+        if self.ui.model:
+            self.ui.model.mark_sprite_dirty(self.ui.model.current_sprite_index, layer)
+    
+    def build_ui_routes(self, ui_elements):
+        """Map each UI element to its handler once, so events dispatch with a dict lookup instead of an if-chain"""
+        self._button_routes = {ui_elements[name]: handler for name, handler in [
+            ('file_ops_file_button', self.handle_file_load),
+            ('file_ops_save_button', self.save_analysis_data),
+            ('file_ops_load_button', self.load_analysis_data),
+            ('file_ops_split_button', self.handle_split_spritesheet),
+            ('navigation_prev_button', self.handle_prev_sprite),
+            ('navigation_next_button', self.handle_next_sprite),
+            ('file_ops_asset_type_button', self.handle_set_asset_type),
+            ('analysis_overlay_button', self.handle_toggle_overlay),
+            ('analysis_diamond_height_button', self.handle_toggle_diamond_height),
+            ('analysis_upper_lines_mode_button', self.handle_toggle_upper_lines_mode),
+            ('analysis_diamond_vertices_button', self.handle_toggle_diamond_vertices),
+            ('analysis_diamond_lines_button', self.handle_toggle_diamond_lines),
+            ('analysis_raycast_analysis_button', self.handle_toggle_raycast_analysis),
+            ('analysis_manual_vertex_button', self.handle_toggle_manual_vertex_mode),
+            ('analysis_sub_diamond_mode_button', self.handle_toggle_sub_diamond_mode),
+            ('analysis_auto_populate_button', self.handle_auto_populate_vertices),
+            ('analysis_delete_keypoints_button', self.handle_delete_all_custom_keypoints),
+            ('analysis_reset_vertices_button', self.handle_reset_manual_vertices),
+            ('view_pixeloid_reset_button', self.handle_reset_view),
+            ('view_center_view_button', self.handle_center_view),
+            ('sub_diamond_set_default_button', self.handle_sub_diamond_set_default),
+            ('sub_diamond_clear_all_button', self.handle_sub_diamond_clear_all),
+            ('sub_diamond_set_all_true_button', self.handle_sub_diamond_set_all_true),
+            ('sub_diamond_set_all_false_button', self.handle_sub_diamond_set_all_false),
+            ('sub_diamond_propagate_rotation_button', self.handle_propagate_rotation),
+            ('sub_diamond_propagate_direct_button', self.handle_propagate_direct),
+        ]}
+        self._slider_routes = {
+            ui_elements['analysis_threshold_slider']: lambda value: self.handle_threshold_change(int(value)),
+        }
+        self._text_routes = {ui_elements[name]: handler for name, handler in [
+            ('analysis_global_z_input', self.handle_global_z_change),
+            ('analysis_frame_z_input', self.handle_frame_z_offset_change),
+            ('analysis_global_diamond_width_input', self.handle_global_diamond_width_change),
+            ('analysis_frame_diamond_width_input', self.handle_frame_diamond_width_change),
+        ]}
+    
+    def handle_button_press(self, event):
         """Handle button press events"""
-        if event.ui_element == ui_elements['file_ops_file_button']:
-            self.handle_file_load()
-        elif event.ui_element == ui_elements['file_ops_save_button']:
-            self.save_analysis_data()
-        elif event.ui_element == ui_elements['file_ops_load_button']:
-            self.load_analysis_data()
-        elif event.ui_element == ui_elements['file_ops_split_button']:
-            self.handle_split_spritesheet()
-        elif event.ui_element == ui_elements['navigation_prev_button']:
-            self.handle_prev_sprite()
-        elif event.ui_element == ui_elements['navigation_next_button']:
-            self.handle_next_sprite()
-        elif event.ui_element == ui_elements['file_ops_asset_type_button']:
-            self.handle_set_asset_type()
-        elif event.ui_element == ui_elements['analysis_overlay_button']:
-            self.handle_toggle_overlay()
-        elif event.ui_element == ui_elements['analysis_diamond_height_button']:
-            self.handle_toggle_diamond_height()
-        elif event.ui_element == ui_elements['analysis_upper_lines_mode_button']:
-            self.handle_toggle_upper_lines_mode()
-        elif event.ui_element == ui_elements['analysis_diamond_vertices_button']:
-            self.handle_toggle_diamond_vertices()
-        elif event.ui_element == ui_elements['analysis_diamond_lines_button']:
-            self.handle_toggle_diamond_lines()
-        elif event.ui_element == ui_elements['analysis_raycast_analysis_button']:
-            self.handle_toggle_raycast_analysis()
-        elif event.ui_element == ui_elements['analysis_manual_vertex_button']:
-            self.handle_toggle_manual_vertex_mode()
-        elif event.ui_element == ui_elements['analysis_sub_diamond_mode_button']:
-            self.handle_toggle_sub_diamond_mode()
-        elif event.ui_element == ui_elements['analysis_auto_populate_button']:
-            self.handle_auto_populate_vertices()
-        elif event.ui_element == ui_elements['analysis_delete_keypoints_button']:
-            self.handle_delete_all_custom_keypoints()
-        elif event.ui_element == ui_elements['analysis_reset_vertices_button']:
-            self.handle_reset_manual_vertices()
-        elif event.ui_element == ui_elements['view_pixeloid_reset_button']:
-            self.handle_reset_view()
-        elif event.ui_element == ui_elements['view_center_view_button']:
-            self.handle_center_view()
-        elif event.ui_element == ui_elements['sub_diamond_set_default_button']:
-            self.handle_sub_diamond_set_default()
-        elif event.ui_element == ui_elements['sub_diamond_clear_all_button']:
-            self.handle_sub_diamond_clear_all()
-        elif event.ui_element == ui_elements['sub_diamond_set_all_true_button']:
-            self.handle_sub_diamond_set_all_true()
-        elif event.ui_element == ui_elements['sub_diamond_set_all_false_button']:
-            self.handle_sub_diamond_set_all_false()
-        elif event.ui_element == ui_elements['sub_diamond_propagate_rotation_button']:
-            self.handle_propagate_rotation()
-        elif event.ui_element == ui_elements['sub_diamond_propagate_direct_button']:
-            self.handle_propagate_direct()
-    
-    def handle_slider_move(self, event, ui_elements):
+        handler = self._button_routes.get(event.ui_element)
+        if handler:
+            handler()
+    
+    def handle_slider_move(self, event):
         """Handle slider movement events"""
-        if event.ui_element == ui_elements['analysis_threshold_slider']:
-            self.handle_threshold_change(int(event.value))
+        handler = self._slider_routes.get(event.ui_element)
+        if handler:
+            handler(event.value)
     
-    def handle_text_change(self, event, ui_elements):
+    def handle_text_change(self, event):
         """Handle text entry change events"""
-        if event.ui_element == ui_elements['analysis_global_z_input']:
-            self.handle_global_z_change(event.text)
-        elif event.ui_element == ui_elements['analysis_frame_z_input']:
-            self.handle_frame_z_offset_change(event.text)
-        elif event.ui_element == ui_elements['analysis_global_diamond_width_input']:
-            self.handle_global_diamond_width_change(event.text)
-        elif event.ui_element == ui_elements['analysis_frame_diamond_width_input']:
-            self.handle_frame_diamond_width_change(event.text)
+        handler = self._text_routes.get(event.ui_element)
+        if handler:
+            handler(event.text)
     
     def handle_file_load(self):
         """Handle file loading"""
@@ -146,8 +147,6 @@ class InputHandlers:
         if self.ui.model:
             self.ui.model.update_analysis_settings(alpha_threshold=value)
             self.ui.analysis_controls_panel.components['threshold_label'].set_text(f'Alpha Threshold: {value}')
-            # Clear cache since alpha threshold affects sprite rendering
-            self.ui.renderer._clear_sprite_display_cache()
             self.ui.update_sprite_info()
     
     def handle_global_z_change(self, text: str):
@@ -157,8 +156,6 @@ class InputHandlers:
                 new_value = int(text) if text else 0
                 upper_z_offset = max(0, new_value)
                 self.ui.model.update_analysis_settings(upper_z_offset=upper_z_offset)
-                # Clear cache since Z offset affects analysis and rendering
-                self.ui.renderer._clear_sprite_display_cache()
                 self.ui.update_sprite_info()
             except ValueError:
                 pass  # Ignore invalid input
@@ -170,8 +167,6 @@ class InputHandlers:
                 new_value = int(text) if text else 0
                 frame_z_offset = max(0, new_value)
                 self.ui.model.set_frame_upper_z_offset(self.ui.model.current_sprite_index, frame_z_offset)
-                # Clear cache for this specific sprite since its rendering changed
-                self.ui.renderer._clear_sprite_cache(self.ui.model.current_sprite_index)
                 self.ui.update_sprite_info()
             except ValueError:
                 pass  # Ignore invalid input
@@ -185,6 +180,8 @@ class InputHandlers:
                     self.ui.model.manual_diamond_width = max(0, new_value) if new_value > 0 else None
                 else:
                     self.ui.model.manual_diamond_width = None
+                # The effective width of every sprite without its own override changed
+                self.ui.model.touch_settings()
                 
                 print(f"Global diamond width changed to: {self.ui.model.manual_diamond_width}")
                 
@@ -207,6 +204,7 @@ class InputHandlers:
                         current_sprite.manual_diamond_width = None
                     
                     print(f"Frame diamond width changed to: {current_sprite.manual_diamond_width}")
+                    self._mark_current_sprite_dirty()
                     
                     # Re-analyze current sprite with new effective diamond width
                     self._reanalyze_current_sprite_with_new_diamond_width()
@@ -235,8 +233,6 @@ class InputHandlers:
             self.ui.analyzer.analyze_sprite(self.ui.model.current_sprite_index)
             print("Sprite re-analysis completed")
             
-            # Clear rendering cache and update display
-            self.ui.renderer._clear_sprite_display_cache()
             self.ui.update_sprite_info()
             
         except Exception as e:
@@ -246,21 +242,19 @@ class InputHandlers:
         """Handle overlay toggle"""
         if self.ui.model:
             self.ui.model.show_overlay = not self.ui.model.show_overlay
+            self.ui.model.mark_header_dirty()
             self.ui.analysis_controls_panel.components['overlay_button'].set_text(
                 f'Toggle Overlay: {"ON" if self.ui.model.show_overlay else "OFF"}'
             )
-            # Clear cache since overlay toggle affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
     
     def handle_toggle_diamond_height(self):
         """Handle diamond height toggle"""
         if self.ui.model:
             self.ui.model.show_diamond_height = not self.ui.model.show_diamond_height
+            self.ui.model.mark_header_dirty()
             self.ui.analysis_controls_panel.components['diamond_height_button'].set_text(
                 f'Diamond Height: {"ON" if self.ui.model.show_diamond_height else "OFF"}'
             )
-            # Clear cache since diamond height toggle affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
     
     def handle_toggle_upper_lines_mode(self):
         """Handle upper lines mode toggle"""
@@ -270,8 +264,6 @@ class InputHandlers:
             self.ui.analysis_controls_panel.components['upper_lines_mode_button'].set_text(f'Upper Lines: {mode_text}')
             # Use the proper update method to clear analysis data
             self.ui.model.update_analysis_settings(upper_lines_midpoint_mode=self.ui.model.upper_lines_midpoint_mode)
-            # Clear cache since upper lines mode affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
             self.ui.update_sprite_info()
     
     def handle_set_asset_type(self):
@@ -291,6 +283,7 @@ class InputHandlers:
         for sprite in self.ui.model.sprites:
             sprite.asset_type = selected_asset_type
             sprites_updated += 1
+        self.ui.model.mark_all_sprites_dirty()
         
         # Update button text
         self.ui.file_ops_panel.components['asset_type_button'].set_text(
@@ -383,6 +376,7 @@ class InputHandlers:
         """Handle diamond vertices toggle"""
         if self.ui.model:
             self.ui.model.show_diamond_vertices = not self.ui.model.show_diamond_vertices
+            self.ui.model.mark_header_dirty()
             self.ui.analysis_controls_panel.components['diamond_vertices_button'].set_text(
                 f'Diamond Vertices: {"ON" if self.ui.model.show_diamond_vertices else "OFF"}'
             )
@@ -424,9 +418,6 @@ class InputHandlers:
                         print(f"  effective_upper_z: {self.ui.model.get_effective_upper_z_offset(self.ui.model.current_sprite_index)}")
                 else:
                     print("  No diamond analysis data available")
-            
-            # Clear cache since diamond vertices toggle affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
     
     def handle_toggle_diamond_lines(self):
         """Handle diamond lines toggle"""
@@ -436,9 +427,6 @@ class InputHandlers:
         )
         
         print(f"Diamond Lines: {'ON' if self.ui.renderer.show_diamond_lines else 'OFF'}")
-        
-        # Clear cache since diamond lines toggle affects rendering
-        self.ui.renderer._clear_sprite_display_cache()
     
     def handle_toggle_raycast_analysis(self):
         """Handle raycast analysis toggle"""
@@ -448,9 +436,6 @@ class InputHandlers:
         )
         
         print(f"Raycast Analysis: {'ON' if self.ui.renderer.show_raycast_analysis else 'OFF'}")
-        
-        # Clear cache since raycast analysis toggle affects rendering
-        self.ui.renderer._clear_sprite_display_cache()
     
     def handle_toggle_manual_vertex_mode(self):
         """Handle manual vertex mode toggle"""
@@ -497,9 +482,6 @@ class InputHandlers:
         else:
             print("=== MANUAL VERTEX MODE: OFF ===")
         
-        # Force complete cache clear and immediate update when entering manual mode
-        self.ui.renderer._clear_sprite_display_cache()
-        
         # Also update sprite info to force fresh render
         if self.ui.renderer.manual_vertex_mode:
             self.ui.update_sprite_info()
@@ -550,8 +532,7 @@ class InputHandlers:
         else:
             print("=== SUB-DIAMOND MODE: OFF ===")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         # Debug: Check sub-diamond data AFTER update_sprite_info
@@ -590,8 +571,7 @@ class InputHandlers:
             return
         
         selected_diamond = self.ui.renderer.selected_diamond
-        manual_data = self.ui.renderer.manual_vertices.get(sprite_key, {})
-        diamond_data = manual_data.get(selected_diamond, {})
+        diamond_data = self.ui.model.manual_vertices.get_layer(sprite_key, selected_diamond)
         
         if not diamond_data:
             print(f"No manual vertices for {selected_diamond} diamond to work with")
@@ -605,12 +585,6 @@ class InputHandlers:
         print(f"Starting with {selected_diamond} diamond: {diamond_data}")
         print(f"Using effective diamond width: {effective_diamond_width} (bbox width: {bbox.width})")
         
-        # Initialize if needed
-        if sprite_key not in self.ui.renderer.manual_vertices:
-            self.ui.renderer.manual_vertices[sprite_key] = {}
-        if selected_diamond not in self.ui.renderer.manual_vertices[sprite_key]:
-            self.ui.renderer.manual_vertices[sprite_key][selected_diamond] = {}
-        
         # Complete the selected diamond using existing points
         point_count = len(diamond_data)
         if point_count >= 1:
@@ -618,16 +592,16 @@ class InputHandlers:
             completed_diamond = self._complete_diamond_from_points(diamond_data, effective_diamond_width)
             
             # Update manual vertices with completed diamond
-            self.ui.renderer.manual_vertices[sprite_key][selected_diamond].update(completed_diamond)
+            self.ui.model.manual_vertices.update_layer(sprite_key, selected_diamond, completed_diamond)
             print(f"Completed {selected_diamond} diamond: {completed_diamond}")
             
             # Check if this creates a complete custom diamond and sync to model
             self._sync_complete_custom_diamond_to_model(sprite_key, selected_diamond)
+            self._mark_current_sprite_dirty(selected_diamond)
         else:
             print(f"Need at least 1 vertex to auto-populate {selected_diamond} diamond")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
     
     def _complete_diamond_from_points(self, diamond_data, diamond_width):
@@ -646,8 +620,7 @@ class InputHandlers:
             sx, sy = diamond_data['south']
             
             # Calculate center between North and South
-            center_x = (nx + sx) // 2
-            center_y = (ny + sy) // 2
+            center_x, center_y = midpoint(nx, sx), midpoint(ny, sy)
             
             print(f"  N/S center: ({center_x}, {center_y})")
             
@@ -666,8 +639,7 @@ class InputHandlers:
             wx, wy = diamond_data['west']
             
             # Calculate center between East and West
-            center_x = (ex + wx) // 2
-            center_y = (ey + wy) // 2
+            center_x, center_y = midpoint(ex, wx), midpoint(ey, wy)
             
             print(f"  E/W center: ({center_x}, {center_y})")
             
@@ -778,9 +750,6 @@ class InputHandlers:
         
         # Show/hide delete keypoints button
         self.ui.analysis_controls_panel.components['delete_keypoints_button'].visible = self.ui.renderer.custom_keypoints_mode
-        
-        # Clear cache since custom keypoints mode affects rendering
-        self.ui.renderer._clear_sprite_display_cache()
     
     def handle_delete_all_custom_keypoints(self):
         """Delete all custom keypoints for the current sprite"""
@@ -803,9 +772,9 @@ class InputHandlers:
         current_sprite = self.ui.model.get_current_sprite()
         if current_sprite:
             current_sprite.custom_keypoints.clear()
+            self._mark_current_sprite_dirty('keypoints')
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
     
     def handle_reset_manual_vertices(self):
@@ -816,16 +785,15 @@ class InputHandlers:
         
         sprite_key = self.ui.model.current_sprite_index
         
-        # Remove from renderer
-        if sprite_key in self.ui.renderer.manual_vertices:
-            del self.ui.renderer.manual_vertices[sprite_key]
+        # Remove from the manual vertex store
+        if self.ui.model.manual_vertices.clear_sprite(sprite_key):
+            self._mark_current_sprite_dirty()
             print(f"Reset manual vertices to algorithmic positions for sprite {sprite_key}")
         else:
             print("No manual vertices to reset for current sprite")
             return
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
     
     def handle_reset_view(self):
@@ -834,16 +802,12 @@ class InputHandlers:
             self.ui.model.pixeloid_multiplier = 1
             self.ui.model.pan_x = 0
             self.ui.model.pan_y = 0
-            # Clear cache since pixeloid and pan affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
     
     def handle_center_view(self):
         """Handle view centering"""
         if self.ui.model:
             self.ui.model.pan_x = 0
             self.ui.model.pan_y = 0
-            # Clear cache since pan affects rendering
-            self.ui.renderer._clear_sprite_display_cache()
     
     def handle_mouse_wheel(self, event):
         """Handle mouse wheel for pixeloid adjustment with zoom-to-mouse functionality"""
@@ -942,9 +906,6 @@ class InputHandlers:
                 
                 # Note: Skip pan constraints during zoom-to-center operations
                 # to allow the image to move freely to center the targeted pixel
-                
-                # Update UI and clear cache
-                self.ui.renderer._clear_sprite_display_cache()
     
     def handle_mouse_motion(self, event):
         """Handle mouse motion to track pixeloid position"""
@@ -1126,12 +1087,12 @@ class InputHandlers:
             current_sprite = self.ui.model.get_current_sprite()
             if current_sprite:
                 from spritesheet_model import Point
-                current_sprite.custom_keypoints[clean_name] = Point(x=original_x, y=original_y)
+                current_sprite.custom_keypoints[clean_name] = Point.intern(original_x, original_y)
+                self._mark_current_sprite_dirty('keypoints')
             
             print(f"Added custom keypoint '{clean_name}' at ({original_x}, {original_y})")
             
-            # Clear cache and update display
-            self.ui.renderer._clear_sprite_display_cache()
+            # Update display
             self.ui.update_sprite_info()
         else:
             print("Keypoint creation cancelled or invalid name provided")
@@ -1209,25 +1170,17 @@ class InputHandlers:
         
         # Store the manual vertex position
         sprite_key = self.ui.model.current_sprite_index
-        if sprite_key not in self.ui.renderer.manual_vertices:
-            self.ui.renderer.manual_vertices[sprite_key] = {}
-        
-        if self.ui.renderer.selected_diamond not in self.ui.renderer.manual_vertices[sprite_key]:
-            self.ui.renderer.manual_vertices[sprite_key][self.ui.renderer.selected_diamond] = {}
-        
         vertex_name = self.ui.renderer._get_vertex_name(self.ui.renderer.selected_vertex).lower()
-        self.ui.renderer.manual_vertices[sprite_key][self.ui.renderer.selected_diamond][vertex_name] = (original_x, original_y)
+        self.ui.model.manual_vertices.set(sprite_key, self.ui.renderer.selected_diamond, vertex_name, (original_x, original_y))
         
         # Log the positioning
         print(f"Positioned {self.ui.renderer.selected_diamond} {vertex_name} at ({original_x}, {original_y}) "
               f"[sprite pixel: ({sprite_pixel_x:.1f}, {sprite_pixel_y:.1f})]")
-        print(f"DEBUG STORAGE: manual_vertices after positioning = {self.ui.renderer.manual_vertices}")
+        print(f"DEBUG STORAGE: manual_vertices after positioning = {self.ui.model.manual_vertices}")
         
         # Check if this completes a custom diamond and sync to model
         self._sync_complete_custom_diamond_to_model(sprite_key, self.ui.renderer.selected_diamond)
-        
-        # Clear cache to trigger re-render with new vertex position
-        self.ui.renderer._clear_sprite_display_cache()
+        self._mark_current_sprite_dirty(self.ui.renderer.selected_diamond)
         
         # Update measurements display to show new manual coordinates
         self.ui.update_sprite_info()
@@ -1266,11 +1219,11 @@ class InputHandlers:
             current_sprite = self.ui.model.get_current_sprite()
             if current_sprite and closest_keypoint in current_sprite.custom_keypoints:
                 del current_sprite.custom_keypoints[closest_keypoint]
+            self._mark_current_sprite_dirty('keypoints')
             
             print(f"Removed custom keypoint '{closest_keypoint}'")
             
-            # Clear cache and update display
-            self.ui.renderer._clear_sprite_display_cache()
+            # Update display
             self.ui.update_sprite_info()
         else:
             print(f"No custom keypoint found near ({original_x}, {original_y})")
@@ -1279,7 +1232,7 @@ class InputHandlers:
         """Handle right-click in manual vertex mode to remove nearest manual vertex"""
         sprite_key = self.ui.model.current_sprite_index
         
-        if sprite_key not in self.ui.renderer.manual_vertices:
+        if not self.ui.model.manual_vertices.has_sprite(sprite_key):
             print("No manual vertices to remove for this sprite")
             return
         
@@ -1296,8 +1249,8 @@ class InputHandlers:
             all_diamond_levels.extend(current_sprite.diamond_info.extra_diamonds.keys())
         
         for diamond_level in all_diamond_levels:
-            if diamond_level in self.ui.renderer.manual_vertices[sprite_key]:
-                vertices = self.ui.renderer.manual_vertices[sprite_key][diamond_level]
+            vertices = self.ui.model.manual_vertices.get_layer(sprite_key, diamond_level)
+            if vertices:
                 for vertex_name, (v_x, v_y) in vertices.items():
                     distance = ((original_x - v_x) ** 2 + (original_y - v_y) ** 2) ** 0.5
                     if distance < removal_threshold and distance < closest_distance:
@@ -1306,19 +1259,13 @@ class InputHandlers:
                         closest_diamond = diamond_level
         
         if closest_vertex and closest_diamond:
-            # Remove the manual vertex
-            del self.ui.renderer.manual_vertices[sprite_key][closest_diamond][closest_vertex]
-            
-            # Clean up empty dictionaries
-            if not self.ui.renderer.manual_vertices[sprite_key][closest_diamond]:
-                del self.ui.renderer.manual_vertices[sprite_key][closest_diamond]
-            if not self.ui.renderer.manual_vertices[sprite_key]:
-                del self.ui.renderer.manual_vertices[sprite_key]
+            # Remove the manual vertex (empty layers and sprites are dropped by the store)
+            self.ui.model.manual_vertices.remove(sprite_key, closest_diamond, closest_vertex)
             
+            self._mark_current_sprite_dirty(closest_diamond)
             print(f"Removed manual vertex: {closest_diamond} {closest_vertex}")
             
-            # Clear cache and update display
-            self.ui.renderer._clear_sprite_display_cache()
+            # Update display
             self.ui.update_sprite_info()
         else:
             print(f"No manual vertex found near ({original_x}, {original_y})")
@@ -1389,11 +1336,10 @@ class InputHandlers:
         else:
             return  # Key not handled
         
-        # Update UI and clear cache
+        # Update UI
         self._update_vertex_info_label()
         vertex_name = self.ui.renderer._get_vertex_name(self.ui.renderer.selected_vertex)
         print(f"Selected: {self.ui.renderer.selected_diamond.title()} {vertex_name} ({self.ui.renderer.selected_vertex})")
-        self.ui.renderer._clear_sprite_display_cache()
     
     def update_panning(self, keys_pressed):
         """Update panning based on currently pressed keys"""
@@ -1446,34 +1392,66 @@ class InputHandlers:
                 initialdir=self.DEFAULT_SAVE_DIR,
                 initialfile=default_name,
                 title="Save Analysis Data",
-                filetypes=[("JSON files", "*.json")]
+                filetypes=[("JSON files", "*.json"), ("Compressed JSON", "*.json.gz *.json.xz")]
             )
             root.destroy()
             
             if file_path:
-                # Pass manual vertices to model for correct midpoint calculation
-                self.ui.model.set_manual_vertices_for_export(self.ui.renderer.manual_vertices)
-                
                 # Sync custom keypoints from renderer to model
                 self._sync_custom_keypoints_to_model()
                 
-                try:
-                    # Save with manual vertices and custom keypoints as the primary data
-                    self.ui.model.save_to_json(file_path)
-                    manual_count = len([s for s in self.ui.model.sprites if s.diamond_info and self._has_manual_vertices_for_sprite(s.sprite_index)])
-                    keypoints_count = len([s for s in self.ui.model.sprites if s.custom_keypoints])
-                    total_count = len([s for s in self.ui.model.sprites if s.diamond_info])
-                    print(f"Analysis data saved to: {file_path}")
-                    print(f"Manual vertices applied to {manual_count}/{total_count} sprites with diamond data")
-                    print(f"Custom keypoints saved for {keypoints_count} sprites")
-                    
-                finally:
-                    # Clear manual vertices from model (so runtime behavior unchanged)
-                    self.ui.model._renderer_manual_vertices = {}
+                # Save with manual vertices and custom keypoints as the primary data;
+                # the full save supersedes any autosave journal records for this file
+                self._attach_journal(file_path)
+                self.journal.run_full_save(self.ui.model.save_to_json)
+                self.ui.model.clear_dirty()
+                manual_count = len([s for s in self.ui.model.sprites if s.has_diamond_info() and self._has_manual_vertices_for_sprite(s.sprite_index)])
+                keypoints_count = len([s for s in self.ui.model.sprites if s.custom_keypoints])
+                total_count = len([s for s in self.ui.model.sprites if s.has_diamond_info()])
+                print(f"Analysis data saved to: {file_path}")
+                print(f"Manual vertices applied to {manual_count}/{total_count} sprites with diamond data")
+                print(f"Custom keypoints saved for {keypoints_count} sprites")
                 
         except Exception as e:
             print(f"Error saving analysis data: {e}")
     
+    def _attach_journal(self, file_path: str):
+        """Point the autosave journal at the given analysis file"""
+        entry = self.ui.workspace.entry_for_model(self.ui.model)
+        if entry:
+            entry.analysis_path = str(file_path)
+        if self.journal and self.journal.analysis_path == str(file_path):
+            return
+        if self.journal:
+            self.journal.close()
+        self.journal = AnalysisJournal(file_path)
+    
+    def autosave_tick(self, force: bool = False):
+        """Append journal deltas for dirty sprites once the autosave interval has elapsed"""
+        # Edits from records the writer failed to append are journaled again with the next deltas
+        if self.journal and self.ui.model:
+            self.ui.model.restore_dirty(self.journal.take_failed_records())
+        if not self.journal or not self.ui.model or not self.ui.model.has_unsaved_changes():
+            return
+        if not force and not self.journal.autosave_due():
+            return
+        
+        # Deltas are exported here on the UI thread; only file IO happens in the background
+        records = self.ui.model.collect_journal_deltas()
+        # Compaction rewrites the analysis file, so deferred sprites are loaded from it first
+        if self.journal.compaction_due(len(records)) and self.ui.model.has_lazy_sprites():
+            self.ui.model.ensure_all_sprites_loaded()
+        self.journal.append(records)
+    
+    def shutdown_autosave(self):
+        """Flush outstanding edits to the journal and stop the writer thread"""
+        if self.journal:
+            self.autosave_tick(force=True)
+            self.journal.close()
+            if self.journal.take_failed_records():
+                print(f"Warning: some edits could not be written to {self.journal.journal_path}; they are not autosaved")
+            self.journal = None
+    
     def load_analysis_data(self):
         """Load analysis data from JSON"""
         try:
@@ -1485,7 +1463,7 @@ class InputHandlers:
             file_path = filedialog.askopenfilename(
                 initialdir=self.DEFAULT_SAVE_DIR,
                 title="Load Analysis Data",
-                filetypes=[("JSON files", "*.json")]
+                filetypes=[("JSON files", "*.json"), ("Compressed JSON", "*.json.gz *.json.xz")]
             )
             root.destroy()
             
@@ -1493,20 +1471,25 @@ class InputHandlers:
                 print(f"\n=== DEBUG LOAD_ANALYSIS_DATA START ===")
                 print(f"Loading from: {file_path}")
                 
+                # Flush the current model's unsaved edits to its own journal before replacing it
+                self.shutdown_autosave()
+                
                 # Load the model
                 self.ui.model = SpritesheetModel.load_from_json(file_path)
                 
                 print(f"Model loaded, sprites count: {len(self.ui.model.sprites)}")
                 
+                # Keep journaling edits against the file we just opened
+                self._attach_journal(file_path)
+                
                 # Debug: Check loaded sub-diamond data for first few sprites
                 self._debug_loaded_subdiamonds()
                 
                 # Try to load the original image
                 if os.path.exists(self.ui.model.image_path):
-                    self.ui.load_spritesheet(self.ui.model.image_path)
-                    self.ui.analyzer = SpriteAnalyzer(self.ui.model)
-                    if self.ui.spritesheet_surface:  # Fix Pylance warning
-                        self.ui.analyzer.load_spritesheet_surface(self.ui.spritesheet_surface)
+                    if self.ui.load_spritesheet(self.ui.model.image_path):
+                        entry = self.ui.workspace.open_sheet(self.ui.model.image_path)
+                        self.ui.analyzer = self.ui.workspace.attach_model(entry, self.ui.model, analysis_path=file_path)
                 else:
                     print(f"Warning: Original image not found at {self.ui.model.image_path}")
                     print("Please load the spritesheet manually")
@@ -1548,7 +1531,7 @@ class InputHandlers:
                 self._sync_custom_keypoints_from_model()
                 
                 # Transfer diamond vertices from model to renderer as manual vertices
-                self.ui.model.transfer_vertices_to_manual(self.ui.renderer)
+                self.ui.model.transfer_vertices_to_manual()
                 
                 # Restore renderer states based on loaded data
                 self._restore_renderer_states_from_loaded_data()
@@ -1578,12 +1561,12 @@ class InputHandlers:
     
     def _apply_manual_vertices_to_model(self):
         """Temporarily replace algorithmic diamond vertices with manual ones for saving"""
-        if not hasattr(self.ui.renderer, 'manual_vertices') or not self.ui.renderer.manual_vertices:
+        if not len(self.ui.model.manual_vertices):
             return {}  # No manual vertices to apply
         
         original_data = {}
         
-        for sprite_index, manual_sprite_data in self.ui.renderer.manual_vertices.items():
+        for sprite_index, manual_sprite_data in self.ui.model.manual_vertices.items():
             if sprite_index >= len(self.ui.model.sprites):
                 continue
                 
@@ -1627,19 +1610,19 @@ class InputHandlers:
         
         if 'north' in manual_vertices:
             x, y = manual_vertices['north']
-            diamond_data.north_vertex = Point(x=x, y=y)
+            diamond_data.north_vertex = Point.intern(x, y)
         
         if 'south' in manual_vertices:
             x, y = manual_vertices['south']
-            diamond_data.south_vertex = Point(x=x, y=y)
+            diamond_data.south_vertex = Point.intern(x, y)
         
         if 'east' in manual_vertices:
             x, y = manual_vertices['east']
-            diamond_data.east_vertex = Point(x=x, y=y)
+            diamond_data.east_vertex = Point.intern(x, y)
         
         if 'west' in manual_vertices:
             x, y = manual_vertices['west']
-            diamond_data.west_vertex = Point(x=x, y=y)
+            diamond_data.west_vertex = Point.intern(x, y)
     
     def _restore_original_diamond_data(self, original_data):
         """Restore original algorithmic diamond data after saving"""
@@ -1676,7 +1659,7 @@ class InputHandlers:
             
             # Add all keypoints from renderer to model
             for keypoint_name, (x, y) in keypoints.items():
-                sprite.custom_keypoints[keypoint_name] = Point(x=x, y=y)
+                sprite.custom_keypoints[keypoint_name] = Point.intern(x, y)
     
     def _sync_custom_keypoints_from_model(self):
         """Sync custom keypoints from model to renderer after loading"""
@@ -1699,8 +1682,7 @@ class InputHandlers:
         
         # Check if any sprites have manual vertices transferred from the model
         has_manual_vertices = any(
-            sprite_index in self.ui.renderer.manual_vertices and
-            len(self.ui.renderer.manual_vertices[sprite_index]) > 0
+            self.ui.model.manual_vertices.has_sprite(sprite_index)
             for sprite_index in range(len(self.ui.model.sprites))
         )
         
@@ -1709,22 +1691,8 @@ class InputHandlers:
             sprite.custom_keypoints for sprite in self.ui.model.sprites
         )
         
-        # Check if any sprites have sub-diamond data
-        has_sub_diamonds = any(
-            sprite.diamond_info and (
-                (sprite.diamond_info.lower_diamond and
-                 hasattr(sprite.diamond_info.lower_diamond, 'sub_diamonds') and
-                 sprite.diamond_info.lower_diamond.sub_diamonds) or
-                (sprite.diamond_info.upper_diamond and
-                 hasattr(sprite.diamond_info.upper_diamond, 'sub_diamonds') and
-                 sprite.diamond_info.upper_diamond.sub_diamonds) or
-                (sprite.diamond_info.extra_diamonds and any(
-                    hasattr(diamond, 'sub_diamonds') and diamond.sub_diamonds
-                    for diamond in sprite.diamond_info.extra_diamonds.values()
-                ))
-            )
-            for sprite in self.ui.model.sprites
-        )
+        # Check if any sprites have sub-diamond data (without loading deferred sprites)
+        has_sub_diamonds = any(sprite.has_sub_diamond_data() for sprite in self.ui.model.sprites)
         
         # Auto-enable manual vertex mode if manual vertices were loaded
         if has_manual_vertices:
@@ -1773,11 +1741,11 @@ class InputHandlers:
         sprites_with_expansions = 0
         
         for sprite_index, sprite in enumerate(self.ui.model.sprites):
-            if not sprite.bbox or not sprite.diamond_info:
+            if not sprite.bbox or not sprite.has_diamond_info():
                 continue
             
             # Check if this sprite has manual vertices that might extend beyond bbox
-            manual_data = self.ui.renderer.manual_vertices.get(sprite_index, {})
+            manual_data = self.ui.model.manual_vertices.get_sprite(sprite_index)
             if not manual_data:
                 continue
             
@@ -1797,9 +1765,8 @@ class InputHandlers:
             
             if has_expansion:
                 sprites_with_expansions += 1
-                # The expansion calculation happens automatically in renderer._calculate_expanded_bounds
-                # We just need to ensure the cache is cleared to force recalculation
-                self.ui.renderer._clear_sprite_cache(sprite_index)
+                # The expansion calculation happens automatically in renderer._calculate_expanded_bounds,
+                # and the sprite's layer keys follow the expanded placement
         
         if sprites_with_expansions > 0:
             print(f"Detected {sprites_with_expansions} sprites with manual vertices extending beyond bbox")
@@ -1807,10 +1774,7 @@ class InputHandlers:
     
     def _has_manual_vertices_for_sprite(self, sprite_index):
         """Check if a sprite has any manual vertices defined"""
-        if not hasattr(self.ui.renderer, 'manual_vertices') or not self.ui.renderer.manual_vertices:
-            return False
-        
-        return sprite_index in self.ui.renderer.manual_vertices and len(self.ui.renderer.manual_vertices[sprite_index]) > 0
+        return self.ui.model.manual_vertices.has_sprite(sprite_index)
     
     def handle_create_custom_diamond(self):
         """Handle F4 key to create a new custom diamond"""
@@ -1846,11 +1810,11 @@ class InputHandlers:
         # Create a temporary SingleDiamondData for conversion
         from spritesheet_model import SingleDiamondData
         temp_diamond = SingleDiamondData(
-            north_vertex=Point(x=template.north_vertex.x, y=template.north_vertex.y - int(custom_z_offset)),
-            south_vertex=Point(x=template.south_vertex.x, y=template.south_vertex.y - int(custom_z_offset)),
-            east_vertex=Point(x=template.east_vertex.x, y=template.east_vertex.y - int(custom_z_offset)),
-            west_vertex=Point(x=template.west_vertex.x, y=template.west_vertex.y - int(custom_z_offset)),
-            center=Point(x=template.center.x, y=template.center.y - int(custom_z_offset)),
+            north_vertex=Point.intern(template.north_vertex.x, template.north_vertex.y - int(custom_z_offset)),
+            south_vertex=Point.intern(template.south_vertex.x, template.south_vertex.y - int(custom_z_offset)),
+            east_vertex=Point.intern(template.east_vertex.x, template.east_vertex.y - int(custom_z_offset)),
+            west_vertex=Point.intern(template.west_vertex.x, template.west_vertex.y - int(custom_z_offset)),
+            center=Point.intern(template.center.x, template.center.y - int(custom_z_offset)),
             z_offset=custom_z_offset
         )
         
@@ -1859,6 +1823,7 @@ class InputHandlers:
         
         # Add to model
         current_sprite.diamond_info.extra_diamonds[clean_name] = new_diamond
+        self._mark_current_sprite_dirty(clean_name)
         
         # Update renderer's custom diamonds list
         self._update_custom_diamonds_list()
@@ -1870,8 +1835,7 @@ class InputHandlers:
         print(f"Created custom diamond '{clean_name}' with z_offset {custom_z_offset}")
         print(f"Selected custom diamond: {clean_name}")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self._update_vertex_info_label()
     
     def handle_cycle_custom_diamond(self, direction):
@@ -1905,8 +1869,7 @@ class InputHandlers:
             self.ui.renderer.selected_diamond = self.ui.renderer.custom_diamonds[self.ui.renderer.selected_custom_diamond_index]
             print(f"Selected custom diamond: {self.ui.renderer.selected_diamond}")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self._update_vertex_info_label()
     
     def _update_custom_diamonds_list(self):
@@ -1957,8 +1920,7 @@ class InputHandlers:
     def _sync_complete_custom_diamond_to_model(self, sprite_key: int, diamond_name: str):
         """Sync a complete diamond from manual vertices to the model (works for lower, upper, and custom diamonds)"""
         # Check if we have manual vertices for this diamond
-        manual_data = self.ui.renderer.manual_vertices.get(sprite_key, {})
-        diamond_vertices = manual_data.get(diamond_name, {})
+        diamond_vertices = self.ui.model.manual_vertices.get_layer(sprite_key, diamond_name)
         
         # Check if the diamond is complete (has all 4 vertices)
         required_vertices = ['north', 'south', 'east', 'west']
@@ -1979,38 +1941,20 @@ class InputHandlers:
         
         # Helper function to update diamond vertices and recalculate derived properties
         def update_diamond_vertices(diamond_data):
-            diamond_data.north_vertex = Point(x=diamond_vertices['north'][0], y=diamond_vertices['north'][1])
-            diamond_data.south_vertex = Point(x=diamond_vertices['south'][0], y=diamond_vertices['south'][1])
-            diamond_data.east_vertex = Point(x=diamond_vertices['east'][0], y=diamond_vertices['east'][1])
-            diamond_data.west_vertex = Point(x=diamond_vertices['west'][0], y=diamond_vertices['west'][1])
-            
-            # Recalculate center
-            diamond_data.center = Point(
-                x=(diamond_data.north_vertex.x + diamond_data.south_vertex.x) // 2,
-                y=(diamond_data.north_vertex.y + diamond_data.south_vertex.y) // 2
-            )
-            
-            # Recalculate midpoints
-            diamond_data.north_east_midpoint = Point(
-                x=(diamond_data.north_vertex.x + diamond_data.east_vertex.x) // 2,
-                y=(diamond_data.north_vertex.y + diamond_data.east_vertex.y) // 2
-            )
-            diamond_data.east_south_midpoint = Point(
-                x=(diamond_data.east_vertex.x + diamond_data.south_vertex.x) // 2,
-                y=(diamond_data.east_vertex.y + diamond_data.south_vertex.y) // 2
-            )
-            diamond_data.south_west_midpoint = Point(
-                x=(diamond_data.south_vertex.x + diamond_data.west_vertex.x) // 2,
-                y=(diamond_data.south_vertex.y + diamond_data.west_vertex.y) // 2
-            )
-            diamond_data.west_north_midpoint = Point(
-                x=(diamond_data.west_vertex.x + diamond_data.north_vertex.x) // 2,
-                y=(diamond_data.west_vertex.y + diamond_data.north_vertex.y) // 2
-            )
-            
-            # Force recalculation of sub-diamonds with new vertex positions
-            # Clear existing sub-diamonds first to force recalculation
-            diamond_data.sub_diamonds = {}
+            diamond_data.north_vertex = Point.intern(diamond_vertices['north'][0], diamond_vertices['north'][1])
+            diamond_data.south_vertex = Point.intern(diamond_vertices['south'][0], diamond_vertices['south'][1])
+            diamond_data.east_vertex = Point.intern(diamond_vertices['east'][0], diamond_vertices['east'][1])
+            diamond_data.west_vertex = Point.intern(diamond_vertices['west'][0], diamond_vertices['west'][1])
+            
+            # Recalculate center and midpoints with the shared geometry kernel
+            geometry = diamond_geometry_points(diamond_vertices['north'], diamond_vertices['south'],
+                                               diamond_vertices['east'], diamond_vertices['west'])
+            diamond_data.center = Point.intern(geometry['center'][0], geometry['center'][1])
+            for name, (x, y) in geometry['midpoints'].items():
+                setattr(diamond_data, f"{name}_midpoint", Point.intern(x, y))
+            
+            # Sub-diamond geometry follows the new vertex positions on its own, so existing
+            # gameplay properties are kept and only missing sub-diamonds are created
             diamond_data.ensure_sub_diamonds_initialized()
         
         # Handle lower diamond
@@ -2068,13 +2012,13 @@ class InputHandlers:
                 
                 # Create the new diamond
                 new_diamond = GameplayDiamondData(
-                    north_vertex=Point(x=diamond_vertices['north'][0], y=diamond_vertices['north'][1]),
-                    south_vertex=Point(x=diamond_vertices['south'][0], y=diamond_vertices['south'][1]),
-                    east_vertex=Point(x=diamond_vertices['east'][0], y=diamond_vertices['east'][1]),
-                    west_vertex=Point(x=diamond_vertices['west'][0], y=diamond_vertices['west'][1]),
-                    center=Point(
-                        x=(diamond_vertices['north'][0] + diamond_vertices['south'][0]) // 2,
-                        y=(diamond_vertices['north'][1] + diamond_vertices['south'][1]) // 2
+                    north_vertex=Point.intern(diamond_vertices['north'][0], diamond_vertices['north'][1]),
+                    south_vertex=Point.intern(diamond_vertices['south'][0], diamond_vertices['south'][1]),
+                    east_vertex=Point.intern(diamond_vertices['east'][0], diamond_vertices['east'][1]),
+                    west_vertex=Point.intern(diamond_vertices['west'][0], diamond_vertices['west'][1]),
+                    center=Point.intern(
+                        midpoint(diamond_vertices['north'][0], diamond_vertices['south'][0]),
+                        midpoint(diamond_vertices['north'][1], diamond_vertices['south'][1])
                     ),
                     z_offset=custom_z_offset
                 )
@@ -2113,7 +2057,6 @@ class InputHandlers:
             self.ui.renderer.show_sub_diamonds = True
             self.ui.analysis_controls_panel.components['sub_diamond_mode_button'].set_text('Sub-Diamond Mode: ON')
             print(f"Sub-diamond mode: ON - Layer: LOWER - Mode: {self.ui.renderer.sub_diamond_editing_mode}")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         elif key == pygame.K_F2:
             self.ui.renderer.selected_sub_diamond_layer = 'upper'
@@ -2121,7 +2064,6 @@ class InputHandlers:
             self.ui.renderer.show_sub_diamonds = True
             self.ui.analysis_controls_panel.components['sub_diamond_mode_button'].set_text('Sub-Diamond Mode: ON')
             print(f"Sub-diamond mode: ON - Layer: UPPER - Mode: {self.ui.renderer.sub_diamond_editing_mode}")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         
         # F3 for cycling through custom diamond layers if in sub-diamond mode
@@ -2146,7 +2088,6 @@ class InputHandlers:
                 next_index = (current_index + 1) % len(available_layers)
                 self.ui.renderer.selected_sub_diamond_layer = available_layers[next_index]
                 print(f"Sub-diamond layer: {self.ui.renderer.selected_sub_diamond_layer.upper()}")
-                self.ui.renderer._clear_sprite_display_cache()
             except ValueError:
                 # Current layer not found, default to lower
                 self.ui.renderer.selected_sub_diamond_layer = 'lower'
@@ -2160,7 +2101,6 @@ class InputHandlers:
                 self.ui.renderer.sub_diamond_mode = True
                 self.ui.renderer.show_sub_diamonds = True
             print(f"Sub-diamond editing mode: SURFACE (walkability)")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         elif key == pygame.K_2:
             self.ui.renderer.sub_diamond_editing_mode = 'edge_line_of_sight'
@@ -2168,7 +2108,6 @@ class InputHandlers:
                 self.ui.renderer.sub_diamond_mode = True
                 self.ui.renderer.show_sub_diamonds = True
             print(f"Sub-diamond editing mode: EDGE LINE OF SIGHT")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         elif key == pygame.K_3:
             self.ui.renderer.sub_diamond_editing_mode = 'edge_movement'
@@ -2176,7 +2115,6 @@ class InputHandlers:
                 self.ui.renderer.sub_diamond_mode = True
                 self.ui.renderer.show_sub_diamonds = True
             print(f"Sub-diamond editing mode: EDGE MOVEMENT")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         elif key == pygame.K_4:
             self.ui.renderer.sub_diamond_editing_mode = 'z_portal'
@@ -2184,7 +2122,6 @@ class InputHandlers:
                 self.ui.renderer.sub_diamond_mode = True
                 self.ui.renderer.show_sub_diamonds = True
             print(f"Sub-diamond editing mode: Z-PORTAL")
-            self.ui.renderer._clear_sprite_display_cache()
             return True
         
         return False
@@ -2233,7 +2170,7 @@ class InputHandlers:
             if clicked_element:
                 direction, sub_diamond = clicked_element
                 self._toggle_sub_diamond_walkability(sub_diamond, event.button, direction)
-                self.ui.renderer._clear_sprite_display_cache()
+                self._mark_current_sprite_dirty(self.ui.renderer.selected_sub_diamond_layer)
                 self.ui.update_sprite_info()
                 return True
         
@@ -2243,9 +2180,11 @@ class InputHandlers:
                 edge_info = clicked_element
                 if self.ui.renderer.sub_diamond_editing_mode == 'z_portal':
                     self._handle_z_portal_click(edge_info, event.button)
+                    # Bi-directional portals also touch the target layer
+                    self._mark_current_sprite_dirty()
                 else:
                     self._handle_edge_click(edge_info, event.button)
-                self.ui.renderer._clear_sprite_display_cache()
+                    self._mark_current_sprite_dirty(self.ui.renderer.selected_sub_diamond_layer)
                 self.ui.update_sprite_info()
                 return True
         
@@ -2334,34 +2273,29 @@ class InputHandlers:
     def _handle_edge_click(self, edge_info, mouse_button):
         """Handle click on a sub-diamond edge"""
         edge_props = edge_info['edge_props']
+        sub_diamond = edge_info['sub_diamond']
         direction = edge_info['direction']
         edge_name = edge_info['edge_name']
         
+        # Edges are shared between frames, so edits swap in a new edge on this sub-diamond only
         if self.ui.renderer.sub_diamond_editing_mode == 'edge_line_of_sight':
             if mouse_button == 1:  # Left click - toggle true/false
-                if edge_props.blocks_line_of_sight is None:
-                    edge_props.blocks_line_of_sight = True
-                elif edge_props.blocks_line_of_sight:
-                    edge_props.blocks_line_of_sight = False
-                else:
-                    edge_props.blocks_line_of_sight = True
+                new_value = True if edge_props.blocks_line_of_sight is None else not edge_props.blocks_line_of_sight
+                edge_props = sub_diamond.update_edge(edge_name, blocks_line_of_sight=new_value)
                 print(f"Sub-diamond {direction} {edge_name} blocks line of sight: {edge_props.blocks_line_of_sight}")
             elif mouse_button == 3:  # Right click - set to None
-                edge_props.blocks_line_of_sight = None
+                edge_props = sub_diamond.update_edge(edge_name, blocks_line_of_sight=None)
                 print(f"Sub-diamond {direction} {edge_name} blocks line of sight: None")
         
         elif self.ui.renderer.sub_diamond_editing_mode == 'edge_movement':
             if mouse_button == 1:  # Left click - toggle true/false
-                if edge_props.blocks_movement is None:
-                    edge_props.blocks_movement = True
-                elif edge_props.blocks_movement:
-                    edge_props.blocks_movement = False
-                else:
-                    edge_props.blocks_movement = True
+                new_value = True if edge_props.blocks_movement is None else not edge_props.blocks_movement
+                edge_props = sub_diamond.update_edge(edge_name, blocks_movement=new_value)
                 print(f"Sub-diamond {direction} {edge_name} blocks movement: {edge_props.blocks_movement}")
             elif mouse_button == 3:  # Right click - set to None
-                edge_props.blocks_movement = None
+                edge_props = sub_diamond.update_edge(edge_name, blocks_movement=None)
                 print(f"Sub-diamond {direction} {edge_name} blocks movement: None")
+        edge_info['edge_props'] = edge_props
         
         # Handle shared edges - find adjacent sub-diamonds that share this edge
         self._update_shared_edges(edge_info)
@@ -2482,8 +2416,8 @@ class InputHandlers:
                 
                 if target_edge_props:
                     # Copy the properties to the shared edge
-                    target_edge_props.blocks_line_of_sight = edge_props.blocks_line_of_sight
-                    target_edge_props.blocks_movement = edge_props.blocks_movement
+                    target_sub_diamond.update_edge(target_edge_name, blocks_line_of_sight=edge_props.blocks_line_of_sight,
+                                                   blocks_movement=edge_props.blocks_movement)
                     
                     print(f"Updated shared edge: {target_direction} {target_edge_name} = {current_direction} {edge_name}")
                     print(f"  Line of sight: {edge_props.blocks_line_of_sight}")
@@ -2541,9 +2475,8 @@ class InputHandlers:
     def _set_all_edge_line_of_sight(self, sub_diamond, value):
         """Set line of sight blocking for all edges of a sub-diamond"""
         for edge_attr in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-            edge = getattr(sub_diamond, edge_attr, None)
-            if edge:
-                edge.blocks_line_of_sight = value
+            if getattr(sub_diamond, edge_attr, None):
+                sub_diamond.update_edge(edge_attr, blocks_line_of_sight=value)
     
     def handle_sub_diamond_set_default(self):
         """Set default sub-diamond properties based on diamond layer: Upper=allow all, Lower=block all"""
@@ -2595,18 +2528,16 @@ class InputHandlers:
             
             # Set all edge properties for this sub-diamond
             for edge_attr in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-                edge = getattr(sub_diamond, edge_attr, None)
-                if edge:
-                    edge.blocks_line_of_sight = default_blocking
-                    edge.blocks_movement = default_blocking
+                if getattr(sub_diamond, edge_attr, None):
+                    sub_diamond.update_edge(edge_attr, blocks_line_of_sight=default_blocking, blocks_movement=default_blocking)
             
             print(f"{direction.title()} quadrant: {'WALKABLE' if default_walkable else 'NOT WALKABLE'}, {'ALLOWS ALL' if not default_blocking else 'BLOCKS ALL'}")
         
         # Update shared edges to maintain consistency
         self._update_all_shared_edges(diamond_data.sub_diamonds)
+        self._mark_current_sprite_dirty(layer_name)
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print("Default sub-diamond properties applied successfully")
@@ -2649,15 +2580,13 @@ class InputHandlers:
             
             # Clear all edge properties for this sub-diamond
             for edge_attr in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-                edge = getattr(sub_diamond, edge_attr, None)
-                if edge:
-                    edge.blocks_line_of_sight = None
-                    edge.blocks_movement = None
+                if getattr(sub_diamond, edge_attr, None):
+                    sub_diamond.update_edge(edge_attr, blocks_line_of_sight=None, blocks_movement=None)
             
             print(f"{direction.title()} quadrant: ALL PROPERTIES CLEARED")
+        self._mark_current_sprite_dirty(layer_name)
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print("All sub-diamond properties cleared successfully")
@@ -2703,8 +2632,8 @@ class InputHandlers:
                 
                 if source_edge and target_edge:
                     # Synchronize properties (use source as reference)
-                    target_edge.blocks_line_of_sight = source_edge.blocks_line_of_sight
-                    target_edge.blocks_movement = source_edge.blocks_movement
+                    target_sub.update_edge(target_edge_name, blocks_line_of_sight=source_edge.blocks_line_of_sight,
+                                           blocks_movement=source_edge.blocks_movement)
     
     def handle_sub_diamond_set_all_true(self):
         """Set all sub-diamond properties to True (block everything)"""
@@ -2744,18 +2673,16 @@ class InputHandlers:
             
             # Set all edge properties to True (blocking)
             for edge_attr in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-                edge = getattr(sub_diamond, edge_attr, None)
-                if edge:
-                    edge.blocks_line_of_sight = True
-                    edge.blocks_movement = True
+                if getattr(sub_diamond, edge_attr, None):
+                    sub_diamond.update_edge(edge_attr, blocks_line_of_sight=True, blocks_movement=True)
             
             print(f"{direction.title()} quadrant: NOT WALKABLE, BLOCKS ALL")
         
         # Update shared edges to maintain consistency
         self._update_all_shared_edges(diamond_data.sub_diamonds)
+        self._mark_current_sprite_dirty(layer_name)
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print("All properties set to block successfully")
@@ -2798,18 +2725,16 @@ class InputHandlers:
             
             # Set all edge properties to False (allowing)
             for edge_attr in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-                edge = getattr(sub_diamond, edge_attr, None)
-                if edge:
-                    edge.blocks_line_of_sight = False
-                    edge.blocks_movement = False
+                if getattr(sub_diamond, edge_attr, None):
+                    sub_diamond.update_edge(edge_attr, blocks_line_of_sight=False, blocks_movement=False)
             
             print(f"{direction.title()} quadrant: WALKABLE, ALLOWS ALL")
         
         # Update shared edges to maintain consistency
         self._update_all_shared_edges(diamond_data.sub_diamonds)
+        self._mark_current_sprite_dirty(layer_name)
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print("All properties set to allow successfully")
@@ -2817,6 +2742,7 @@ class InputHandlers:
     def _handle_z_portal_click(self, edge_info, mouse_button):
         """Handle click on a sub-diamond edge for z-portal editing"""
         edge_props = edge_info['edge_props']
+        sub_diamond = edge_info['sub_diamond']
         direction = edge_info['direction']
         edge_name = edge_info['edge_name']
         
@@ -2825,7 +2751,7 @@ class InputHandlers:
                 # Create new z-portal - show dialog to select target elevation
                 target_elevation = self._show_z_portal_dialog(direction, edge_name)
                 if target_elevation is not None:
-                    edge_props.z_portal = target_elevation
+                    edge_info['edge_props'] = sub_diamond.update_edge(edge_name, z_portal=target_elevation)
                     print(f"Created z-portal on {direction} {edge_name} -> elevation {target_elevation}")
                     
                     # Create bi-directional portal on target diamond if possible
@@ -2837,7 +2763,7 @@ class InputHandlers:
                 current_elevation = edge_props.z_portal
                 target_elevation = self._show_z_portal_dialog(direction, edge_name, current_elevation)
                 if target_elevation is not None:
-                    edge_props.z_portal = target_elevation
+                    edge_info['edge_props'] = sub_diamond.update_edge(edge_name, z_portal=target_elevation)
                     print(f"Modified z-portal on {direction} {edge_name} -> elevation {target_elevation}")
                     
                     # Update bi-directional portal
@@ -2848,7 +2774,7 @@ class InputHandlers:
         elif mouse_button == 3:  # Right click - remove z-portal
             if edge_props.z_portal is not None:
                 old_elevation = edge_props.z_portal
-                edge_props.z_portal = None
+                edge_info['edge_props'] = sub_diamond.update_edge(edge_name, z_portal=None)
                 print(f"Removed z-portal from {direction} {edge_name} (was -> elevation {old_elevation})")
                 
                 # Remove bi-directional portal if it exists
@@ -3040,7 +2966,7 @@ class InputHandlers:
                     
                     if target_edge:
                         # Create return portal with source elevation
-                        target_edge.z_portal = source_z_offset
+                        target_sub_diamond.update_edge(source_edge_name, z_portal=source_z_offset)
                         print(f"Created bi-directional portal: {target_layer_name} {source_direction} {source_edge_name} -> elevation {source_z_offset}")
                     else:
                         print(f"Could not find target edge for bi-directional portal")
@@ -3097,7 +3023,7 @@ class InputHandlers:
                 target_edge = getattr(target_sub_diamond, source_edge_name, None)
                 
                 if target_edge and target_edge.z_portal is not None:
-                    target_edge.z_portal = None
+                    target_sub_diamond.update_edge(source_edge_name, z_portal=None)
                     print(f"Removed bi-directional portal from {target_layer_name} {source_direction} {source_edge_name}")
                 else:
                     print(f"No bi-directional portal found on {target_layer_name} {source_direction} {source_edge_name}")
@@ -3203,6 +3129,7 @@ class InputHandlers:
                     if self._apply_rotation_mapping(target_sprite, layer_name, source_diamond_data, rotation_steps):
                         successful_propagations += 1
                         frame_success_count += 1
+                        self.ui.model.mark_sprite_dirty(target_frame_index, layer_name)
                         print(f"  ✓ {layer_name} layer propagated")
                     else:
                         print(f"  ✗ Failed to apply rotation mapping to {layer_name} layer")
@@ -3211,8 +3138,7 @@ class InputHandlers:
             
             print(f"Frame {target_frame_index}: {frame_success_count}/{len(source_layers)} layers successful")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print(f"\n=== PROPAGATION COMPLETE ===")
@@ -3280,16 +3206,16 @@ class InputHandlers:
                 
                 from spritesheet_model import Point
                 target_sprite.diamond_info.extra_diamonds[source_layer] = GameplayDiamondData(
-                    north_vertex=Point(x=lower_diamond.north_vertex.x, y=lower_diamond.north_vertex.y - z_offset_diff),
-                    south_vertex=Point(x=lower_diamond.south_vertex.x, y=lower_diamond.south_vertex.y - z_offset_diff),
-                    east_vertex=Point(x=lower_diamond.east_vertex.x, y=lower_diamond.east_vertex.y - z_offset_diff),
-                    west_vertex=Point(x=lower_diamond.west_vertex.x, y=lower_diamond.west_vertex.y - z_offset_diff),
-                    center=Point(x=lower_diamond.center.x, y=lower_diamond.center.y - z_offset_diff),
+                    north_vertex=Point.intern(lower_diamond.north_vertex.x, lower_diamond.north_vertex.y - z_offset_diff),
+                    south_vertex=Point.intern(lower_diamond.south_vertex.x, lower_diamond.south_vertex.y - z_offset_diff),
+                    east_vertex=Point.intern(lower_diamond.east_vertex.x, lower_diamond.east_vertex.y - z_offset_diff),
+                    west_vertex=Point.intern(lower_diamond.west_vertex.x, lower_diamond.west_vertex.y - z_offset_diff),
+                    center=Point.intern(lower_diamond.center.x, lower_diamond.center.y - z_offset_diff),
                     z_offset=source_diamond_data.z_offset,
-                    north_east_midpoint=Point(x=lower_diamond.north_east_midpoint.x, y=lower_diamond.north_east_midpoint.y - z_offset_diff),
-                    east_south_midpoint=Point(x=lower_diamond.east_south_midpoint.x, y=lower_diamond.east_south_midpoint.y - z_offset_diff),
-                    south_west_midpoint=Point(x=lower_diamond.south_west_midpoint.x, y=lower_diamond.south_west_midpoint.y - z_offset_diff),
-                    west_north_midpoint=Point(x=lower_diamond.west_north_midpoint.x, y=lower_diamond.west_north_midpoint.y - z_offset_diff)
+                    north_east_midpoint=Point.intern(lower_diamond.north_east_midpoint.x, lower_diamond.north_east_midpoint.y - z_offset_diff),
+                    east_south_midpoint=Point.intern(lower_diamond.east_south_midpoint.x, lower_diamond.east_south_midpoint.y - z_offset_diff),
+                    south_west_midpoint=Point.intern(lower_diamond.south_west_midpoint.x, lower_diamond.south_west_midpoint.y - z_offset_diff),
+                    west_north_midpoint=Point.intern(lower_diamond.west_north_midpoint.x, lower_diamond.west_north_midpoint.y - z_offset_diff)
                 )
                 # Ensure sub-diamonds are initialized for the new custom diamond
                 target_sprite.diamond_info.extra_diamonds[source_layer].ensure_sub_diamonds_initialized()
@@ -3349,10 +3275,7 @@ class InputHandlers:
             
             print(f"    {source_direction} → {target_direction}")
             
-            # Copy surface properties
-            target_sub_diamond.is_walkable = source_sub_diamond.is_walkable
-            
-            # Copy edge properties with rotation
+            # Share surface and edge properties with rotation (edges are immutable, so nothing is copied)
             self._copy_edge_properties_with_rotation(source_sub_diamond, target_sub_diamond, rotation_steps)
         
         # Update shared edges to maintain consistency
@@ -3362,7 +3285,7 @@ class InputHandlers:
         return True
     
     def _copy_edge_properties_with_rotation(self, source_sub_diamond, target_sub_diamond, rotation_steps):
-        """Copy edge properties with proper edge rotation mapping"""
+        """Share walkability and edge properties with proper edge rotation mapping"""
         # Define edge rotation mapping: edges rotate with the sub-diamond
         # Each edge rotates 45° counter-clockwise with each step
         edge_rotation = {
@@ -3372,28 +3295,11 @@ class InputHandlers:
             'south_east_edge': ['south_east_edge', 'north_east_edge', 'north_west_edge', 'south_west_edge']
         }
         
-        # Copy each edge with rotation
-        for source_edge_name in ['north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge']:
-            source_edge = getattr(source_sub_diamond, source_edge_name, None)
-            if not source_edge:
-                continue
-            
-            # Calculate target edge after rotation
-            if source_edge_name not in edge_rotation:
-                continue
-            
-            rotation_sequence = edge_rotation[source_edge_name]
-            target_edge_name = rotation_sequence[rotation_steps % 4]
-            
-            target_edge = getattr(target_sub_diamond, target_edge_name, None)
-            if not target_edge:
-                continue
-            
-            # Copy properties
-            target_edge.blocks_line_of_sight = source_edge.blocks_line_of_sight
-            target_edge.blocks_movement = source_edge.blocks_movement
-            target_edge.z_portal = source_edge.z_portal
-            
+        # Edges are interned and immutable, so the target just references the source's rotated edges
+        edge_mapping = {source_edge: sequence[rotation_steps % 4] for source_edge, sequence in edge_rotation.items()}
+        target_sub_diamond.copy_properties_from(source_sub_diamond, edge_mapping)
+        
+        for source_edge_name, target_edge_name in edge_mapping.items():
             print(f"      {source_edge_name} → {target_edge_name}")
     
     def handle_propagate_direct(self):
@@ -3493,6 +3399,7 @@ class InputHandlers:
                     if self._apply_rotation_mapping(target_sprite, layer_name, source_diamond_data, rotation_steps):
                         successful_propagations += 1
                         frame_success_count += 1
+                        self.ui.model.mark_sprite_dirty(target_frame_index, layer_name)
                         print(f"  ✓ {layer_name} layer propagated")
                     else:
                         print(f"  ✗ Failed to apply direct mapping to {layer_name} layer")
@@ -3501,8 +3408,7 @@ class InputHandlers:
             
             print(f"Frame {target_frame_index}: {frame_success_count}/{len(source_layers)} layers successful")
         
-        # Clear cache and update display
-        self.ui.renderer._clear_sprite_display_cache()
+        # Update display
         self.ui.update_sprite_info()
         
         print(f"\n=== DIRECT PROPAGATION COMPLETE ===")
@@ -3604,6 +3510,9 @@ class InputHandlers:
         
         # Check first 5 sprites for detailed info
         for i, sprite in enumerate(self.ui.model.sprites[:5]):
+            if not sprite.is_diamond_info_loaded():
+                print(f"Sprite {i}: diamond_info deferred (loads on first view)")
+                continue
             if not sprite.diamond_info:
                 print(f"Sprite {i}: No diamond_info")
                 continue
@@ -3662,24 +3571,8 @@ class InputHandlers:
         # Quick count for all sprites
         total_sprites_with_data = 0
         for sprite in self.ui.model.sprites:
-            if sprite.diamond_info:
-                has_subdiamonds = False
-                if (sprite.diamond_info.lower_diamond and
-                    hasattr(sprite.diamond_info.lower_diamond, 'sub_diamonds') and
-                    sprite.diamond_info.lower_diamond.sub_diamonds):
-                    has_subdiamonds = True
-                if (sprite.diamond_info.upper_diamond and
-                    hasattr(sprite.diamond_info.upper_diamond, 'sub_diamonds') and
-                    sprite.diamond_info.upper_diamond.sub_diamonds):
-                    has_subdiamonds = True
-                if sprite.diamond_info.extra_diamonds:
-                    for custom_diamond in sprite.diamond_info.extra_diamonds.values():
-                        if (hasattr(custom_diamond, 'sub_diamonds') and
-                            custom_diamond.sub_diamonds):
-                            has_subdiamonds = True
-                            break
-                if has_subdiamonds:
-                    total_sprites_with_data += 1
+            if sprite.has_sub_diamond_data():
+                total_sprites_with_data += 1
         
         print(f"\nSUMMARY:")
         print(f"  Total sprites: {len(self.ui.model.sprites)}")
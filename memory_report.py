@@ -0,0 +1,95 @@
+import argparse
+import sys
+from typing import List, Dict, Optional, Tuple, Any
+from pydantic import BaseModel
+from spritesheet_model import SpritesheetModel, GameplayDiamondData, Point
+
+
+def point_footprint() -> int:
+    """Bytes held by one Point instance (object, field dict and fields-set bookkeeping)"""
+    point = Point(x=1000, y=1000)
+    return (sys.getsizeof(point) + sys.getsizeof(point.__dict__) +
+            sys.getsizeof(point.__pydantic_fields_set__) + sys.getsizeof(point.x) + sys.getsizeof(point.y))
+
+
+def _collect_points(value: Any, points: List[Point], seen: set):
+    """Append every Point reference reachable from a model, list or dict"""
+    if isinstance(value, Point):
+        points.append(value)
+    elif isinstance(value, BaseModel):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        for name in type(value).model_fields:
+            _collect_points(getattr(value, name), points, seen)
+        if isinstance(value, GameplayDiamondData) and value.sub_diamonds:
+            # Derived sub-diamond corners are held in the diamond's geometry cache once computed
+            for quadrant in value.sub_diamonds:
+                points.extend(value.get_sub_diamond_geometry(quadrant).values())
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_points(item, points, seen)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_points(item, points, seen)
+
+
+def point_memory_report(model: SpritesheetModel) -> Dict[str, Any]:
+    """
+    Count Point references in a loaded model against the instances actually allocated.
+    Without interning every reference would be its own instance.
+    """
+    points: List[Point] = []
+    seen: set = set()
+    for sprite in model.sprites:
+        _collect_points(sprite, points, seen)
+
+    footprint = point_footprint()
+    references = len(points)
+    instances = len({id(point) for point in points})
+    return {
+        'references': references,
+        'instances': instances,
+        'distinct_coordinates': len({(point.x, point.y) for point in points}),
+        'bytes_per_point': footprint,
+        'bytes_without_interning': references * footprint,
+        'bytes_with_interning': instances * footprint,
+        'bytes_saved': (references - instances) * footprint,
+    }
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: report Point interning savings for analysis files"""
+    parser = argparse.ArgumentParser(description="Report memory saved by Point interning on loaded analysis files")
+    parser.add_argument('analysis', nargs='+', help="Analysis files saved by the sprite cleaner")
+    args = parser.parse_args(argv)
+
+    totals = {'references': 0, 'instances': 0, 'bytes_without_interning': 0, 'bytes_with_interning': 0}
+    for path in args.analysis:
+        model = SpritesheetModel.load_from_json(path)
+        if model is None:
+            print(f"Error loading {path}")
+            continue
+        report = point_memory_report(model)
+        for key in totals:
+            totals[key] += report[key]
+        print(f"{path}: {report['references']} point references, {report['instances']} instances "
+              f"({report['distinct_coordinates']} distinct coordinates), "
+              f"{_format_bytes(report['bytes_without_interning'])} -> {_format_bytes(report['bytes_with_interning'])}")
+
+    if len(args.analysis) > 1 and totals['references']:
+        saved = totals['bytes_without_interning'] - totals['bytes_with_interning']
+        print(f"Total: {totals['references']} references, {totals['instances']} instances, "
+              f"{_format_bytes(saved)} saved ({saved / totals['bytes_without_interning']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
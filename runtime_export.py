@@ -0,0 +1,185 @@
+import struct
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Any
+from gameplay_encoding import (
+    QUADRANTS, EDGES, TRI_TRUE, TRI_UNSET, PORTAL_SHIFT, PORTAL_MASK, get_layer_diamond
+)
+
+# File layout (all little-endian):
+#   header   <4sHHIII  magic, version, layer_count, sprite_count, portal_count, section_count
+#   sections <4sII     section tag, byte offset from file start, byte length   (section_count entries)
+#   payload  each section starts on a 16-byte boundary
+#
+# Sections (shapes use S sprites, L layers):
+#   LNAM  layer names, each as <H byte length + utf-8 bytes
+#   LMSK  uint32[S]          bit l set when the sprite has layer l
+#   VERT  int32[S, L, 4, 2]  N/S/E/W vertex x,y in original sprite coordinates (manual overrides applied)
+#   ZOFF  float32[S, L]      z_offset of each layer
+#   WALK  uint8[S, L]        bits 0-3 walkable per quadrant, bits 4-7 walkability set per quadrant
+#   EDGE  uint16[S, L, 4, 4] bits 0-1 line of sight, bits 2-3 movement (tri-state), bits 4-15 portal index
+#   PORT  float32[P]         z target of portal index i+1 (index 0 means no portal)
+RUNTIME_MAGIC = b'ISOT'
+RUNTIME_VERSION = 1
+HEADER_FORMAT = '<4sHHIII'
+SECTION_FORMAT = '<4sII'
+SECTION_ALIGNMENT = 16
+MAX_RUNTIME_LAYERS = 32
+VERTEX_ORDER = ('north', 'south', 'east', 'west')
+
+
+def collect_layer_names(model) -> List[str]:
+    """Diamond layer names used anywhere in the tileset: lower, upper, then custom names in first-seen order"""
+    layer_names = ['lower', 'upper']
+    for sprite in model.sprites:
+        if not sprite.has_diamond_info():
+            continue
+        for name in sprite.diamond_info.extra_diamonds:
+            if name not in layer_names:
+                layer_names.append(name)
+    return layer_names
+
+
+def build_runtime_tables(model) -> Dict[str, Any]:
+    """Build the fixed-stride runtime tables for every sprite and diamond layer"""
+    layer_names = collect_layer_names(model)
+    if len(layer_names) > MAX_RUNTIME_LAYERS:
+        raise ValueError(f"Runtime export supports at most {MAX_RUNTIME_LAYERS} diamond layers, found {len(layer_names)}")
+
+    sprite_count = len(model.sprites)
+    layer_count = len(layer_names)
+    layer_mask = np.zeros(sprite_count, dtype=np.uint32)
+    vertices = np.zeros((sprite_count, layer_count, len(VERTEX_ORDER), 2), dtype=np.int32)
+    z_offsets = np.zeros((sprite_count, layer_count), dtype=np.float32)
+    walkability = np.zeros((sprite_count, layer_count), dtype=np.uint8)
+    edges = np.zeros((sprite_count, layer_count, len(QUADRANTS), len(EDGES)), dtype=np.uint16)
+    portal_table: List[float] = []
+    portal_lookup: Dict[float, int] = {}
+
+    for l, layer in enumerate(layer_names):
+        # Geometry, with manual vertex overrides applied the same way as the JSON export
+        for sprite in model.sprites:
+            if not sprite.has_diamond_info():
+                continue
+            diamond = get_layer_diamond(sprite, layer)
+            if diamond is None:
+                continue
+            row = sprite.sprite_index
+            layer_mask[row] |= np.uint32(1 << l)
+            coords = model._get_export_vertex_coords(diamond, row, layer)
+            for v, vertex_name in enumerate(VERTEX_ORDER):
+                vertices[row, l, v] = coords[vertex_name]
+            # Same z_offset as the JSON export: height of the north vertex above the lower diamond's
+            # (lower is always layer 0, so its override-aware north y is already in the table)
+            z_offsets[row, l] = 0.0 if layer == 'lower' else float(vertices[row, 0, 0, 1] - coords['north'][1])
+
+        # Gameplay properties come from the bit-packed layer tables
+        packed = model.get_packed_gameplay(layer)
+        walkable_bits = (packed.walkability == TRI_TRUE).astype(np.uint8)
+        set_bits = (packed.walkability != TRI_UNSET).astype(np.uint8)
+        for q in range(len(QUADRANTS)):
+            walkability[:, l] |= (walkable_bits[:, q] << q) | (set_bits[:, q] << (q + len(QUADRANTS)))
+
+        # Remap the layer's local portal indices onto one tileset-wide portal table
+        remap = np.zeros(len(packed.portal_table) + 1, dtype=np.uint16)
+        for local_index, z_target in enumerate(packed.portal_table, start=1):
+            if z_target not in portal_lookup:
+                portal_table.append(z_target)
+                portal_lookup[z_target] = len(portal_table)
+            remap[local_index] = portal_lookup[z_target]
+        local_portals = (packed.edges >> PORTAL_SHIFT) & PORTAL_MASK
+        edges[:, l] = (packed.edges & ((1 << PORTAL_SHIFT) - 1)) | (remap[local_portals] << PORTAL_SHIFT)
+
+    if len(portal_table) > PORTAL_MASK:
+        raise ValueError(f"Runtime export supports at most {PORTAL_MASK} distinct z-portal targets")
+
+    return {
+        'layer_names': layer_names,
+        'layer_mask': layer_mask,
+        'vertices': vertices,
+        'z_offsets': z_offsets,
+        'walkability': walkability,
+        'edges': edges,
+        'portals': np.array(portal_table, dtype=np.float32),
+    }
+
+
+def _encode_layer_names(layer_names: List[str]) -> bytes:
+    parts = []
+    for name in layer_names:
+        encoded = name.encode('utf-8')
+        parts.append(struct.pack('<H', len(encoded)) + encoded)
+    return b''.join(parts)
+
+
+def write_runtime_tables(model, path: str) -> Dict[str, Any]:
+    """Write the runtime tables as one flat binary file, returns the tables that were written"""
+    tables = build_runtime_tables(model)
+    sections = [
+        (b'LNAM', _encode_layer_names(tables['layer_names'])),
+        (b'LMSK', tables['layer_mask'].astype('<u4').tobytes()),
+        (b'VERT', tables['vertices'].astype('<i4').tobytes()),
+        (b'ZOFF', tables['z_offsets'].astype('<f4').tobytes()),
+        (b'WALK', tables['walkability'].tobytes()),
+        (b'EDGE', tables['edges'].astype('<u2').tobytes()),
+        (b'PORT', tables['portals'].astype('<f4').tobytes()),
+    ]
+
+    header = struct.pack(HEADER_FORMAT, RUNTIME_MAGIC, RUNTIME_VERSION, len(tables['layer_names']),
+                         len(model.sprites), len(tables['portals']), len(sections))
+    offset = len(header) + struct.calcsize(SECTION_FORMAT) * len(sections)
+    section_table = []
+    payload = []
+    for tag, data in sections:
+        padding = -offset % SECTION_ALIGNMENT
+        payload.append(b'\0' * padding)
+        offset += padding
+        section_table.append(struct.pack(SECTION_FORMAT, tag, offset, len(data)))
+        payload.append(data)
+        offset += len(data)
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(b''.join(section_table))
+        f.write(b''.join(payload))
+
+    print(f"Runtime tables saved to: {path} ({len(model.sprites)} sprites, {len(tables['layer_names'])} layers, "
+          f"{len(tables['portals'])} portals, {offset} bytes)")
+    return tables
+
+
+def read_runtime_tables(path: str) -> Dict[str, Any]:
+    """Load runtime tables with a single read, mapping each section as a numpy view"""
+    with open(path, 'rb') as f:
+        buffer = f.read()
+
+    magic, version, layer_count, sprite_count, portal_count, section_count = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+    if magic != RUNTIME_MAGIC or version != RUNTIME_VERSION:
+        raise ValueError(f"{path} is not a version {RUNTIME_VERSION} runtime table file")
+
+    sections = {}
+    table_offset = struct.calcsize(HEADER_FORMAT)
+    for i in range(section_count):
+        tag, offset, length = struct.unpack_from(SECTION_FORMAT, buffer, table_offset + i * struct.calcsize(SECTION_FORMAT))
+        sections[tag] = (offset, length)
+
+    def view(tag: bytes, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+        offset, length = sections[tag]
+        return np.frombuffer(buffer, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset).reshape(shape)
+
+    layer_names = []
+    offset, length = sections[b'LNAM']
+    end = offset + length
+    while offset < end:
+        (name_length,) = struct.unpack_from('<H', buffer, offset)
+        layer_names.append(buffer[offset + 2:offset + 2 + name_length].decode('utf-8'))
+        offset += 2 + name_length
+
+    return {
+        'layer_names': layer_names,
+        'layer_mask': view(b'LMSK', '<u4', (sprite_count,)),
+        'vertices': view(b'VERT', '<i4', (sprite_count, layer_count, len(VERTEX_ORDER), 2)),
+        'z_offsets': view(b'ZOFF', '<f4', (sprite_count, layer_count)),
+        'walkability': view(b'WALK', 'u1', (sprite_count, layer_count)),
+        'edges': view(b'EDGE', '<u2', (sprite_count, layer_count, len(QUADRANTS), len(EDGES))),
+        'portals': view(b'PORT', '<f4', (portal_count,)),
+    }
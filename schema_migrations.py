@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any, Callable
+
+# Version written by save_to_json. Files without a schema_version field predate versioning and are version 1.
+CURRENT_SCHEMA_VERSION = 2
+UNVERSIONED_SCHEMA_VERSION = 1
+
+# Sheet header fields of every analysis export; other JSON (frame sidecars, atlas manifests) lacks them
+ANALYSIS_HEADER_FIELDS = ('rows', 'cols', 'sprite_width', 'sprite_height')
+
+# from_version -> migration that upgrades data from from_version to from_version + 1 (in place)
+_SPRITE_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], None]] = {}
+_HEADER_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], None]] = {}
+
+
+class NotAnalysisFileError(ValueError):
+    """A JSON file that is not an analysis export and must be left untouched"""
+
+
+def is_analysis_data(data: Any) -> bool:
+    """Check that loaded JSON is an analysis export: a sheet header and sprite entries carrying asset_type"""
+    if not isinstance(data, dict) or any(field not in data for field in ANALYSIS_HEADER_FIELDS):
+        return False
+    sprites = data.get('sprites')
+    return isinstance(sprites, list) and all(isinstance(sprite, dict) and 'asset_type' in sprite for sprite in sprites)
+
+
+def is_analysis_file(path) -> bool:
+    """is_analysis_data for a file on disk, answered from its sprite index when that is current"""
+    from spritesheet_model import SpritesheetModel, read_sprite_index
+
+    index = read_sprite_index(path)
+    if index is not None:
+        return is_analysis_data({**index['header'], 'sprites': [entry['summary'] for entry in index['sprites']]})
+    compression = SpritesheetModel._detect_compression(str(path)) or 'none'
+    with SpritesheetModel._open_export_stream(str(path), compression, mode='rt') as f:
+        return is_analysis_data(json.load(f))
+
+
+def register_migration(from_version: int, scope: str = 'sprite'):
+    """
+    Register a migration from from_version to from_version + 1.
+
+    Sprite migrations receive one exported sprite dict and are applied lazily, sprite by sprite,
+    as sprites are loaded. Header migrations receive the header fields of the file.
+    """
+    if scope not in ('sprite', 'header'):
+        raise ValueError(f"Unknown migration scope: {scope}")
+    registry = _SPRITE_MIGRATIONS if scope == 'sprite' else _HEADER_MIGRATIONS
+
+    def decorator(func: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+        if from_version in registry:
+            raise ValueError(f"A {scope} migration from schema version {from_version} is already registered")
+        registry[from_version] = func
+        return func
+    return decorator
+
+
+def get_schema_version(data: Dict[str, Any]) -> int:
+    """Schema version of export data (or a sprite index header)"""
+    version = data.get('schema_version', UNVERSIONED_SCHEMA_VERSION)
+    if version > CURRENT_SCHEMA_VERSION:
+        raise ValueError(f"Analysis file uses schema version {version}, newer than supported version {CURRENT_SCHEMA_VERSION}")
+    return version
+
+
+def _run_chain(registry: Dict[int, Callable[[Dict[str, Any]], None]], data: Dict[str, Any], from_version: int):
+    for version in range(from_version, CURRENT_SCHEMA_VERSION):
+        migration = registry.get(version)
+        if migration:
+            migration(data)
+
+
+def migrate_header(header: Dict[str, Any]) -> Dict[str, Any]:
+    """Upgrade header fields to the current schema in place"""
+    _run_chain(_HEADER_MIGRATIONS, header, get_schema_version(header))
+    header['schema_version'] = CURRENT_SCHEMA_VERSION
+    return header
+
+
+def migrate_sprite(sprite_data: Dict[str, Any], from_version: int) -> Dict[str, Any]:
+    """Upgrade one exported sprite dict to the current schema in place"""
+    # Sprites replayed from an autosave journal carry their own (current) version
+    from_version = sprite_data.pop('schema_version', from_version)
+    _run_chain(_SPRITE_MIGRATIONS, sprite_data, from_version)
+    return sprite_data
+
+
+def migrate_diamond_info(diamond_info: Dict[str, Any], from_version: int) -> Dict[str, Any]:
+    """Upgrade a deferred sprite's diamond_info dict read on its own"""
+    if from_version >= CURRENT_SCHEMA_VERSION:
+        return diamond_info
+    return migrate_sprite({'diamond_info': diamond_info}, from_version)['diamond_info']
+
+
+def migrate_export_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Upgrade a whole loaded analysis file in place"""
+    version = get_schema_version(data)
+    sprites = data.get('sprites', [])
+    migrate_header(data)
+    for sprite_data in sprites:
+        migrate_sprite(sprite_data, version)
+    return data
+
+
+def _iter_sprite_diamonds(sprite_data: Dict[str, Any]):
+    diamond_info = sprite_data.get('diamond_info') or {}
+    for key in ('lower_diamond', 'upper_diamond'):
+        if diamond_info.get(key):
+            yield diamond_info[key]
+    for diamond in (diamond_info.get('extra_diamonds') or {}).values():
+        if diamond:
+            yield diamond
+
+
+@register_migration(1)
+def _drop_derived_sub_diamond_geometry(sprite_data: Dict[str, Any]):
+    """v1 -> v2: sub-diamond geometry is derived from the diamond vertices, and detailed_analysis is never loaded"""
+    for diamond in _iter_sprite_diamonds(sprite_data):
+        for sub_data in (diamond.get('sub_diamonds') or {}).values():
+            for key in ('north_vertex', 'south_vertex', 'east_vertex', 'west_vertex', 'center',
+                        'main_vertex', 'midpoint_a', 'midpoint_b'):
+                sub_data.pop(key, None)
+    # Full model dumps stored compressed line data here; the clean format has no use for it
+    sprite_data.pop('detailed_analysis', None)
+
+
+def migrate_file(path: str, output_path: Optional[str] = None) -> Tuple[str, int, bool]:
+    """
+    Rewrite one analysis file in the current schema, keeping its compression and sprite index.
+    Returns (path, original version, rewritten). Raises NotAnalysisFileError for other JSON files.
+    """
+    from spritesheet_model import SpritesheetModel, write_clean_export, write_sprite_index, get_sprite_index_path
+
+    compression = SpritesheetModel._detect_compression(path) or 'none'
+    with SpritesheetModel._open_export_stream(path, compression, mode='rt') as f:
+        data = json.load(f)
+    if not is_analysis_data(data):
+        raise NotAnalysisFileError(f"{path} is not an analysis file")
+    version = get_schema_version(data)
+    target = Path(output_path or path)
+    if version == CURRENT_SCHEMA_VERSION and target == Path(path):
+        return str(path), version, False
+
+    migrate_export_data(data)
+    sprites = data.pop('sprites', [])
+    # schema_version leads the header, as in files written by save_to_json
+    header = {'schema_version': data.pop('schema_version'), **data}
+    index = {} if compression == 'none' else None
+    temp_path = target.with_name(target.name + '.tmp')
+    with SpritesheetModel._open_export_stream(temp_path, compression) as f:
+        write_clean_export(f, header, sprites, index=index)
+    os.replace(temp_path, target)
+
+    if index is not None:
+        write_sprite_index(target, index)
+    elif get_sprite_index_path(target).exists():
+        get_sprite_index_path(target).unlink()
+    return str(path), version, True
+
+
+def bulk_migrate(paths: List[str], max_workers: Optional[int] = None) -> Dict[str, int]:
+    """Rewrite many analysis files in the current schema in parallel worker processes"""
+    files: List[str] = []
+    for path in paths:
+        path_obj = Path(path)
+        if path_obj.is_dir():
+            files.extend(str(p) for p in sorted(path_obj.rglob('*'))
+                         if p.is_file() and p.name.lower().endswith(('.json', '.json.gz', '.json.xz', '.json.lzma')))
+        else:
+            files.append(str(path_obj))
+
+    counts = {'migrated': 0, 'current': 0, 'skipped': 0, 'failed': 0}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {path: executor.submit(migrate_file, path) for path in files}
+        for path, future in futures.items():
+            try:
+                _, version, rewritten = future.result()
+            except NotAnalysisFileError:
+                counts['skipped'] += 1
+                print(f"Skipping {path}: not an analysis file")
+                continue
+            except (OSError, ValueError, KeyError, json.JSONDecodeError) as e:
+                counts['failed'] += 1
+                print(f"Error migrating {path}: {e}")
+                continue
+            if rewritten:
+                counts['migrated'] += 1
+                print(f"Migrated {path}: schema v{version} -> v{CURRENT_SCHEMA_VERSION}")
+            else:
+                counts['current'] += 1
+
+    print(f"Bulk migrate: {counts['migrated']} migrated, {counts['current']} already current, "
+          f"{counts['skipped']} not analysis files, {counts['failed']} failed")
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: rewrite an archive of analysis files in the current schema"""
+    parser = argparse.ArgumentParser(description=f"Migrate analysis files to schema version {CURRENT_SCHEMA_VERSION}")
+    parser.add_argument('paths', nargs='+', help="Analysis files or directories")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    bulk_migrate(args.paths, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
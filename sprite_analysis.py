@@ -1,12 +1,17 @@
+import itertools
 import pygame
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any
+from diamond_geometry import MIDPOINT_ORDER, compute_diamond_geometry
 from spritesheet_model import (
     SpritesheetModel, SpriteData, BoundingBox, DiamondInfo, SingleDiamondData, GameplayDiamondData,
     EdgeContactPoints, IsometricAnalysis, DetailedAnalysis, Point, AssetType,
     point_from_tuple, points_from_list, bbox_from_pygame_rect
 )
 
+# Source of SpriteAnalyzer.pixel_version values
+_pixel_versions = itertools.count(1)
+
 class SpriteAnalyzer:
     """Main class for analyzing sprites using the Pydantic model"""
     
@@ -14,10 +19,13 @@ class SpriteAnalyzer:
         self.model = model
         self._spritesheet_surface: Optional[pygame.Surface] = None
         self._sprite_surfaces: List[pygame.Surface] = []
+        # Changes whenever sprite surfaces are (re-)extracted, so display caches never show stale pixels
+        self.pixel_version = 0
     
     def load_spritesheet_surface(self, surface: pygame.Surface):
         """Load the pygame surface for the spritesheet"""
         self._spritesheet_surface = surface
+        self.pixel_version = next(_pixel_versions)
         self._extract_sprite_surfaces()
     
     def _extract_sprite_surfaces(self):
@@ -32,6 +40,15 @@ class SpriteAnalyzer:
             sprite_surface.blit(self._spritesheet_surface, (0, 0), (x, y, width, height))
             self._sprite_surfaces.append(sprite_surface)
     
+    def release_sprite_surfaces(self):
+        """Drop decoded pixel data; analysis results stay in the model"""
+        self._spritesheet_surface = None
+        self._sprite_surfaces = []
+    
+    def has_sprite_surfaces(self) -> bool:
+        """Check whether sprite surfaces are currently extracted"""
+        return bool(self._sprite_surfaces)
+    
     def get_sprite_surface(self, sprite_index: int) -> Optional[pygame.Surface]:
         """Get the pygame surface for a specific sprite"""
         if 0 <= sprite_index < len(self._sprite_surfaces):
@@ -65,6 +82,7 @@ class SpriteAnalyzer:
                 sprite_data.bbox, sprite_index, sprite_data.detailed_analysis
             )
         
+        self.model.mark_sprite_dirty(sprite_index)
         return sprite_data
     
     def analyze_all_sprites(self):
@@ -178,20 +196,29 @@ class SpriteAnalyzer:
         lower_center_x = bbox.x + bbox.width // 2
         lower_center_y = bbox.y + bbox.height // 2
         
+        # Midpoints of the lower diamond and the upper diamond (shifted up by diamond_height) in one kernel call
+        upper_shift = int(diamond_height)
+        lower_vertices = [(north_x, north_y), (south_x, south_y), (east_x, east_y), (west_x, west_y)]
+        geometry = compute_diamond_geometry([lower_vertices, [(x, y - upper_shift) for x, y in lower_vertices]])
+        lower_midpoints, upper_midpoints = [
+            {name: Point.intern(x, y) for name, (x, y) in zip(MIDPOINT_ORDER, midpoints)}
+            for midpoints in geometry['midpoints'].tolist()
+        ]
+        
         # Create lower diamond data using the extracted/computed vertices (midpoints computed at save time)
         # Lower diamond always has z_offset=0 as it's the reference point
         lower_diamond_single = SingleDiamondData(
-            north_vertex=Point(x=north_x, y=north_y),
-            south_vertex=Point(x=south_x, y=south_y),
-            east_vertex=Point(x=east_x, y=east_y),
-            west_vertex=Point(x=west_x, y=west_y),
-            center=Point(x=lower_center_x, y=lower_center_y),
+            north_vertex=Point.intern(north_x, north_y),
+            south_vertex=Point.intern(south_x, south_y),
+            east_vertex=Point.intern(east_x, east_y),
+            west_vertex=Point.intern(west_x, west_y),
+            center=Point.intern(lower_center_x, lower_center_y),
             z_offset=0.0,
             # Add computed midpoints for sub-diamond initialization
-            north_east_midpoint=Point(x=(north_x + east_x) // 2, y=(north_y + east_y) // 2),
-            east_south_midpoint=Point(x=(east_x + south_x) // 2, y=(east_y + south_y) // 2),
-            south_west_midpoint=Point(x=(south_x + west_x) // 2, y=(south_y + west_y) // 2),
-            west_north_midpoint=Point(x=(west_x + north_x) // 2, y=(west_y + north_y) // 2)
+            north_east_midpoint=lower_midpoints['north_east'],
+            east_south_midpoint=lower_midpoints['east_south'],
+            south_west_midpoint=lower_midpoints['south_west'],
+            west_north_midpoint=lower_midpoints['west_north']
         )
         
         # Convert to GameplayDiamondData with sub-diamonds and edges
@@ -217,17 +244,17 @@ class SpriteAnalyzer:
             upper_center_y = lower_center_y - int(diamond_height)
             
             upper_diamond_single = SingleDiamondData(
-                north_vertex=Point(x=upper_north_x, y=upper_north_y),
-                south_vertex=Point(x=upper_south_x, y=upper_south_y),
-                east_vertex=Point(x=upper_east_x, y=upper_east_y),
-                west_vertex=Point(x=upper_west_x, y=upper_west_y),
-                center=Point(x=upper_center_x, y=upper_center_y),
+                north_vertex=Point.intern(upper_north_x, upper_north_y),
+                south_vertex=Point.intern(upper_south_x, upper_south_y),
+                east_vertex=Point.intern(upper_east_x, upper_east_y),
+                west_vertex=Point.intern(upper_west_x, upper_west_y),
+                center=Point.intern(upper_center_x, upper_center_y),
                 z_offset=float(diamond_height),  # Z-offset from lower diamond (negative Y direction)
                 # Add computed midpoints for sub-diamond initialization
-                north_east_midpoint=Point(x=(upper_north_x + upper_east_x) // 2, y=(upper_north_y + upper_east_y) // 2),
-                east_south_midpoint=Point(x=(upper_east_x + upper_south_x) // 2, y=(upper_east_y + upper_south_y) // 2),
-                south_west_midpoint=Point(x=(upper_south_x + upper_west_x) // 2, y=(upper_south_y + upper_west_y) // 2),
-                west_north_midpoint=Point(x=(upper_west_x + upper_north_x) // 2, y=(upper_west_y + upper_north_y) // 2)
+                north_east_midpoint=upper_midpoints['north_east'],
+                east_south_midpoint=upper_midpoints['east_south'],
+                south_west_midpoint=upper_midpoints['south_west'],
+                west_north_midpoint=upper_midpoints['west_north']
             )
             
             # Convert to GameplayDiamondData with sub-diamonds and edges
@@ -267,10 +294,10 @@ class SpriteAnalyzer:
         # Calculate bbox edge midpoints (bbox-relative)
         effective_top_y = effective_upper_z
         midpoints = {
-            'top': Point(x=bbox.width // 2, y=effective_top_y),
-            'bottom': Point(x=bbox.width // 2, y=bbox.height - 1),
-            'left': Point(x=0, y=bbox.height // 2),
-            'right': Point(x=bbox.width - 1, y=bbox.height // 2)
+            'top': Point.intern(bbox.width // 2, effective_top_y),
+            'bottom': Point.intern(bbox.width // 2, bbox.height - 1),
+            'left': Point.intern(0, bbox.height // 2),
+            'right': Point.intern(bbox.width - 1, bbox.height // 2)
         }
         
         # Find edge contact points
@@ -306,7 +333,7 @@ class SpriteAnalyzer:
                         x, y = outer_coord, inner_coord
                     
                     if x >= 0 and x < w and y >= 0 and y < h and mask[x, y]:
-                        return Point(x=x - bbox.x, y=y - bbox.y)
+                        return Point.intern(x - bbox.x, y - bbox.y)
             return None
         
         # TOP EDGE: scan from effective top
@@ -314,7 +341,7 @@ class SpriteAnalyzer:
         for y in range(effective_top_y, bbox.y + bbox.height):
             for x in range(bbox.x, bbox.x + bbox.width):
                 if mask[x, y]:
-                    top_from_left = Point(x=x - bbox.x, y=y - bbox.y)
+                    top_from_left = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if top_from_left:
                 break
@@ -323,7 +350,7 @@ class SpriteAnalyzer:
         for y in range(effective_top_y, bbox.y + bbox.height):
             for x in range(bbox.x + bbox.width - 1, bbox.x - 1, -1):
                 if mask[x, y]:
-                    top_from_right = Point(x=x - bbox.x, y=y - bbox.y)
+                    top_from_right = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if top_from_right:
                 break
@@ -333,7 +360,7 @@ class SpriteAnalyzer:
         for y in range(bbox.y + bbox.height - 1, bbox.y - 1, -1):
             for x in range(bbox.x, bbox.x + bbox.width):
                 if mask[x, y]:
-                    bottom_from_left = Point(x=x - bbox.x, y=y - bbox.y)
+                    bottom_from_left = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if bottom_from_left:
                 break
@@ -342,7 +369,7 @@ class SpriteAnalyzer:
         for y in range(bbox.y + bbox.height - 1, bbox.y - 1, -1):
             for x in range(bbox.x + bbox.width - 1, bbox.x - 1, -1):
                 if mask[x, y]:
-                    bottom_from_right = Point(x=x - bbox.x, y=y - bbox.y)
+                    bottom_from_right = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if bottom_from_right:
                 break
@@ -352,7 +379,7 @@ class SpriteAnalyzer:
         for x in range(bbox.x, bbox.x + bbox.width):
             for y in range(bbox.y, bbox.y + bbox.height):
                 if mask[x, y]:
-                    left_from_top = Point(x=x - bbox.x, y=y - bbox.y)
+                    left_from_top = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if left_from_top:
                 break
@@ -361,7 +388,7 @@ class SpriteAnalyzer:
         for x in range(bbox.x, bbox.x + bbox.width):
             for y in range(bbox.y + bbox.height - 1, bbox.y - 1, -1):
                 if mask[x, y]:
-                    left_from_bottom = Point(x=x - bbox.x, y=y - bbox.y)
+                    left_from_bottom = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if left_from_bottom:
                 break
@@ -371,7 +398,7 @@ class SpriteAnalyzer:
         for x in range(bbox.x + bbox.width - 1, bbox.x - 1, -1):
             for y in range(bbox.y, bbox.y + bbox.height):
                 if mask[x, y]:
-                    right_from_top = Point(x=x - bbox.x, y=y - bbox.y)
+                    right_from_top = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if right_from_top:
                 break
@@ -380,7 +407,7 @@ class SpriteAnalyzer:
         for x in range(bbox.x + bbox.width - 1, bbox.x - 1, -1):
             for y in range(bbox.y + bbox.height - 1, bbox.y - 1, -1):
                 if mask[x, y]:
-                    right_from_bottom = Point(x=x - bbox.x, y=y - bbox.y)
+                    right_from_bottom = Point.intern(x - bbox.x, y - bbox.y)
                     break
             if right_from_bottom:
                 break
@@ -573,7 +600,7 @@ class SpriteAnalyzer:
         # Convert edge contact points to original image space
         def convert_to_original(point: Optional[Point]) -> Optional[Point]:
             if point:
-                return Point(x=bbox.x + point.x, y=bbox.y + point.y)
+                return Point.intern(bbox.x + point.x, bbox.y + point.y)
             return None
         
         edge_contacts_original = OriginalEdgeContactPoints(
@@ -590,10 +617,10 @@ class SpriteAnalyzer:
         # Convert midpoints to original image space
         effective_upper_z = self.model.get_effective_upper_z_offset(sprite_index)
         midpoints_original = {
-            'top': Point(x=bbox.x + bbox.width // 2, y=bbox.y + effective_upper_z),
-            'bottom': Point(x=bbox.x + bbox.width // 2, y=bbox.y + bbox.height - 1),
-            'left': Point(x=bbox.x, y=bbox.y + bbox.height // 2),
-            'right': Point(x=bbox.x + bbox.width - 1, y=bbox.y + bbox.height // 2)
+            'top': Point.intern(bbox.x + bbox.width // 2, bbox.y + effective_upper_z),
+            'bottom': Point.intern(bbox.x + bbox.width // 2, bbox.y + bbox.height - 1),
+            'left': Point.intern(bbox.x, bbox.y + bbox.height // 2),
+            'right': Point.intern(bbox.x + bbox.width - 1, bbox.y + bbox.height // 2)
         }
         
         # Calculate line data for both modes
@@ -603,7 +630,7 @@ class SpriteAnalyzer:
         # Convert current lines to original space
         current_mode = "midpoint_mode" if self.model.upper_lines_midpoint_mode else "contact_points_mode"
         for direction, line_points in isometric_analysis.lines.items():
-            converted_points = [Point(x=bbox.x + p.x, y=bbox.y + p.y) for p in line_points]
+            converted_points = [Point.intern(bbox.x + p.x, bbox.y + p.y) for p in line_points]
             if direction in ['SW', 'SE']:  # Upper lines
                 setattr(upper_line_data, current_mode, {**getattr(upper_line_data, current_mode), direction: converted_points})
             else:  # Lower lines (NW, NE)
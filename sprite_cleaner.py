@@ -14,6 +14,7 @@ from ui_components import (
     BoundingBoxInfoPanel, ViewControlsPanel, SubDiamondControlsPanel
 )
 from input_handlers import InputHandlers
+from workspace import Workspace
 
 # Initialize Pygame
 pygame.init()
@@ -26,6 +27,16 @@ RIGHT_PANEL_WIDTH = 350
 DRAWING_AREA_WIDTH = WINDOW_WIDTH - LEFT_PANEL_WIDTH - RIGHT_PANEL_WIDTH
 DRAWING_AREA_HEIGHT = WINDOW_HEIGHT
 
+# Screen regions redrawn and presented independently
+LEFT_PANEL_RECT = pygame.Rect(0, 0, LEFT_PANEL_WIDTH, WINDOW_HEIGHT)
+RIGHT_PANEL_RECT = pygame.Rect(LEFT_PANEL_WIDTH + DRAWING_AREA_WIDTH, 0, RIGHT_PANEL_WIDTH, WINDOW_HEIGHT)
+DRAWING_AREA_RECT = pygame.Rect(LEFT_PANEL_WIDTH, 0, DRAWING_AREA_WIDTH, DRAWING_AREA_HEIGHT)
+
+# Frame pacing: full rate while panning, otherwise block on input and wake for UI animations and autosave
+FRAME_RATE = 60
+IDLE_WAIT_MS = 250
+PAN_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
 DEFAULT_SPRITESHEET_DIR = r"C:\Users\Tommaso\Documents\Dev\IsoSpriter\isometric_tiles"
 DEFAULT_SAVE_DIR = r"C:\Users\Tommaso\Documents\Dev\IsoSpriter\analysis_data"
 
@@ -45,6 +56,9 @@ class AdvancedSpritesheetUI:
         self.analyzer: Optional[SpriteAnalyzer] = None
         self.spritesheet_surface: Optional[pygame.Surface] = None
         
+        # Open sheets with their models, analyzers and shared pixel cache
+        self.workspace = Workspace()
+        
         # Initialize the renderer module
         self.renderer = SpriteRenderer(DRAWING_AREA_WIDTH, DRAWING_AREA_HEIGHT, LEFT_PANEL_WIDTH)
         
@@ -61,8 +75,16 @@ class AdvancedSpritesheetUI:
         self.sprite_pixel_y = 0
         self.mouse_in_drawing_area = False
         
-        # Create UI panels
+        # What the drawing area showed when last presented, to redraw it only on change
+        self._display_key = None
+        self._mouse_display_key = None
+        self._ui_over_drawing_area = False
+        self._full_redraw = True
+        
+        # Create UI panels and route their events; the panel components never change after this
         self.setup_ui_panels()
+        self.ui_elements = self.get_all_ui_elements()
+        self.input_handlers.build_ui_routes(self.ui_elements)
         
         # Ensure save directory exists
         Path(DEFAULT_SAVE_DIR).mkdir(parents=True, exist_ok=True)
@@ -113,14 +135,11 @@ class AdvancedSpritesheetUI:
     def load_spritesheet(self, path: str):
         """Load a spritesheet from file"""
         try:
-            surface = pygame.image.load(path).convert_alpha()
+            # Decoded once per workspace; re-opening a sheet reuses the cached pixels
+            surface = self.workspace.get_surface(path)
             self.spritesheet_surface = surface
             
-            # Clear cache when new spritesheet is loaded
-            self.renderer._clear_sprite_display_cache()
-            
-            # Reset manual vertex state for new image
-            self.renderer.manual_vertices = {}
+            # Reset manual vertex mode for new image (vertex overrides live in each sheet's model)
             self.renderer.manual_vertex_mode = False
             self.analysis_controls_panel.components['manual_vertex_button'].set_text('Manual Vertex Mode: OFF')
             self.analysis_controls_panel.components['vertex_info_label'].visible = False
@@ -155,6 +174,8 @@ class AdvancedSpritesheetUI:
             total_width = self.spritesheet_surface.get_width()
             total_height = self.spritesheet_surface.get_height()
             
+            # A fresh model has no analysis file yet, so stop journaling against the old one
+            self.input_handlers.shutdown_autosave()
             self.model = SpritesheetModel.create_from_image(
                 image_path, rows, cols, total_width, total_height
             )
@@ -165,9 +186,9 @@ class AdvancedSpritesheetUI:
             self.model.show_overlay = True
             self.model.show_diamond_height = True
             
-            # Create analyzer and load surface
-            self.analyzer = SpriteAnalyzer(self.model)
-            self.analyzer.load_spritesheet_surface(self.spritesheet_surface)
+            # Register the sheet in the workspace, which creates its analyzer over the cached pixels
+            entry = self.workspace.open_sheet(image_path)
+            self.analyzer = self.workspace.attach_model(entry, self.model)
             
             # Reset UI state
             self.model.current_sprite_index = 0
@@ -189,6 +210,42 @@ class AdvancedSpritesheetUI:
             print(f"Error creating model: {e}")
             return False
     
+    def switch_sheet(self, step: int):
+        """Switch to the next/previous open sheet without re-decoding or re-analysing it"""
+        if len(self.workspace.sheets) < 2:
+            print("No other sheets open in the workspace")
+            return
+        
+        # Keep the leaving sheet's keypoints and autosave journal up to date
+        if self.model:
+            self.input_handlers._sync_custom_keypoints_to_model()
+        self.input_handlers.shutdown_autosave()
+        
+        entry = self.workspace.cycle(step)
+        if not entry:
+            return
+        self.model = entry.model
+        self.analyzer = entry.analyzer
+        self.spritesheet_surface = self.workspace.get_surface(entry.image_path)
+        if entry.analysis_path:
+            self.input_handlers._attach_journal(entry.analysis_path)
+        
+        # Restore the sheet's controls and per-sheet renderer state
+        self.file_ops_panel.components['rows_input'].set_text(str(self.model.rows))
+        self.file_ops_panel.components['cols_input'].set_text(str(self.model.cols))
+        self.analysis_controls_panel.components['threshold_slider'].set_current_value(self.model.alpha_threshold)
+        self.analysis_controls_panel.components['global_z_input'].set_text(str(self.model.upper_z_offset))
+        self.input_handlers._sync_custom_keypoints_from_model()
+        
+        # Diamond selections named the leaving sheet's layers; start again from this sheet's lower diamond
+        self.renderer.selected_diamond = 'lower'
+        self.renderer.selected_custom_diamond_index = -1
+        self.renderer.selected_sub_diamond_layer = 'lower'
+        self.input_handlers._update_custom_diamonds_list()
+        
+        print(f"Switched to sheet: {entry.name} ({len(self.workspace.sheets)} open)")
+        self.update_sprite_info()
+    
     def update_sprite_info(self):
         """Update sprite information displays"""
         if not self.model or not self.analyzer:
@@ -200,6 +257,9 @@ class AdvancedSpritesheetUI:
             self.clear_sprite_info()
             return
         
+        # Sprites opened lazily from a sprite index get their vertices on first view
+        self.model.transfer_deferred_vertices_to_manual(self.model.current_sprite_index)
+        
         # Update sprite counter
         self.navigation_panel.components['sprite_info_label'].set_text(
             f'Sprite: {self.model.current_sprite_index + 1}/{len(self.model.sprites)}'
@@ -320,24 +380,76 @@ class AdvancedSpritesheetUI:
         self.bbox_info_panel.components['bbox_label'].set_text('Bounding Box:\nN/A')
         self.bbox_info_panel.components['size_info_label'].set_text('Original: N/A\nCropped: N/A\nSavings: N/A')
     
+    def is_idle(self) -> bool:
+        """Check whether the loop can block on input: nothing animates without it unless a pan key is held"""
+        return not (self.model and self.keys_pressed.intersection(PAN_KEYS))
+    
+    def present_frame(self):
+        """Redraw the regions that changed and present only those"""
+        display_key = self.renderer.get_display_key(self.model, self.analyzer)
+        mouse_display_key = (self.model is not None and self.mouse_in_drawing_area,
+                             int(self.sprite_pixel_x), int(self.sprite_pixel_y))
+        # UI elements drawn over the drawing area (e.g. tooltips) need the scene redrawn beneath them;
+        # the area drawn is the image size, the root container's rect spans the screen with an empty image
+        ui_over_drawing_area = DRAWING_AREA_RECT.collidelist([
+            pygame.Rect(blit_data[1].topleft, blit_data[0].get_size()) for blit_data in self.manager.ui_group.visible
+        ]) != -1
+        
+        scene_changed = (self._full_redraw or display_key != self._display_key or mouse_display_key != self._mouse_display_key or
+                         ui_over_drawing_area or self._ui_over_drawing_area)
+        self._display_key = display_key
+        self._mouse_display_key = mouse_display_key
+        self._ui_over_drawing_area = ui_over_drawing_area
+        self._full_redraw = False
+        
+        if scene_changed:
+            self.screen.set_clip(DRAWING_AREA_RECT)
+            self.screen.fill((40, 40, 40))
+            self.renderer.draw_sprite_display(self.screen, self.model, self.analyzer, LEFT_PANEL_WIDTH)
+            self.renderer.draw_mouse_position_display(self.screen, self.model, self.mouse_in_drawing_area,
+                                                    self.sprite_pixel_x, self.sprite_pixel_y, WINDOW_WIDTH)
+            self.screen.set_clip(None)
+        
+        # Side panels are redrawn every frame: pygame_gui animates them (hover, text cursor) without telling us
+        for panel_rect in (LEFT_PANEL_RECT, RIGHT_PANEL_RECT):
+            self.screen.fill((60, 60, 60), panel_rect)
+        if display_key is not None:
+            self.renderer.draw_drawing_area_border(self.screen, LEFT_PANEL_WIDTH)
+        
+        if scene_changed:
+            self.manager.draw_ui(self.screen)
+            pygame.display.update(self.screen.get_rect())
+        else:
+            for panel_rect in (LEFT_PANEL_RECT, RIGHT_PANEL_RECT):
+                self.screen.set_clip(panel_rect)
+                self.manager.draw_ui(self.screen)
+            self.screen.set_clip(None)
+            pygame.display.update([LEFT_PANEL_RECT, RIGHT_PANEL_RECT])
+    
     def run(self):
         """Main game loop - clean and simple"""
         running = True
         
         while running:
-            time_delta = self.clock.tick(60) / 1000.0  # Convert to seconds as pygame_gui expects
-            ui_elements = self.get_all_ui_elements()
+            # Sleep until input arrives when idle; the timeout keeps UI animations and autosave ticking
+            waited_event = pygame.event.wait(IDLE_WAIT_MS) if self.is_idle() else None
+            time_delta = self.clock.tick(FRAME_RATE) / 1000.0  # Convert to seconds as pygame_gui expects
+            events = pygame.event.get()
+            if waited_event is not None and waited_event.type != pygame.NOEVENT:
+                events.insert(0, waited_event)
             
             # Process events
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self._full_redraw = True
                 elif event.type == pygame_gui.UI_BUTTON_PRESSED:
-                    self.input_handlers.handle_button_press(event, ui_elements)
+                    self.input_handlers.handle_button_press(event)
                 elif event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
-                    self.input_handlers.handle_slider_move(event, ui_elements)
+                    self.input_handlers.handle_slider_move(event)
                 elif event.type == pygame_gui.UI_TEXT_ENTRY_FINISHED:
-                    self.input_handlers.handle_text_change(event, ui_elements)
+                    self.input_handlers.handle_text_change(event)
                 elif event.type == pygame.MOUSEWHEEL:
                     self.input_handlers.handle_mouse_wheel(event)
                 elif event.type == pygame.MOUSEMOTION:
@@ -349,6 +461,14 @@ class AdvancedSpritesheetUI:
                         self.input_handlers.handle_right_click(event)
                 elif event.type == pygame.KEYDOWN:
                     self.keys_pressed.add(event.key)
+                    # F7/F8 switch between open sheets in the workspace
+                    if event.key == pygame.K_F7:
+                        self.switch_sheet(-1)
+                    elif event.key == pygame.K_F8:
+                        self.switch_sheet(1)
+                    # F9 dumps render cache statistics
+                    elif event.key == pygame.K_F9:
+                        self.renderer.print_render_cache_stats()
                     # Handle manual vertex mode and sub-diamond key commands
                     self.input_handlers.handle_manual_vertex_keys(event.key)
                 elif event.type == pygame.KEYUP:
@@ -359,6 +479,7 @@ class AdvancedSpritesheetUI:
             # Update systems
             self.manager.update(time_delta)
             self.input_handlers.update_panning(self.keys_pressed)
+            self.input_handlers.autosave_tick()
             
             # Update sub-diamond panel status
             if hasattr(self, 'sub_diamond_panel'):
@@ -368,18 +489,10 @@ class AdvancedSpritesheetUI:
                     self.renderer.sub_diamond_editing_mode
                 )
             
-            # Draw everything
-            self.screen.fill((40, 40, 40))
-            pygame.draw.rect(self.screen, (60, 60, 60), (0, 0, LEFT_PANEL_WIDTH, WINDOW_HEIGHT))
-            pygame.draw.rect(self.screen, (60, 60, 60), (LEFT_PANEL_WIDTH + DRAWING_AREA_WIDTH, 0, RIGHT_PANEL_WIDTH, WINDOW_HEIGHT))
-            
-            # Use renderer for sprite display
-            self.renderer.draw_sprite_display(self.screen, self.model, self.analyzer, LEFT_PANEL_WIDTH)
-            self.renderer.draw_mouse_position_display(self.screen, self.model, self.mouse_in_drawing_area,
-                                                    self.sprite_pixel_x, self.sprite_pixel_y, WINDOW_WIDTH)
-            self.manager.draw_ui(self.screen)
-            pygame.display.flip()
+            # Draw and present what changed
+            self.present_frame()
         
+        self.input_handlers.shutdown_autosave()
         pygame.quit()
         sys.exit()
 
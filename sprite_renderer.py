@@ -1,25 +1,72 @@
+import numpy as np
 import pygame
 import pygame_gui
-from typing import Optional, Tuple, Set
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Set
 from spritesheet_model import SpritesheetModel, SpriteData
 
+# Never produced by the heat-map overlay (its blue channel is always 0), so it marks pixels left uncovered
+OVERLAY_COLORKEY = (255, 0, 255)
+
+# Checkerboard backdrop cell colors
+CHECKER_LIGHT = (200, 200, 200)
+CHECKER_DARK = (150, 150, 150)
+
+# Display layers, bottom to top. Each is cached under its own dependency key (see _get_layer_keys).
+DISPLAY_LAYERS = ('backdrop', 'sprite', 'heat_overlay', 'bounds', 'diamond_lines',
+                  'raycast_analysis', 'diamond_vertices', 'keypoints', 'sub_diamonds')
+
+# Memory budget of the display layer cache
+DEFAULT_RENDER_CACHE_BUDGET_BYTES = 128 * 1024 * 1024
+
+# Pixels rendered beyond each side of the viewport when the content is too large to render whole
+RENDER_WINDOW_MARGIN = 256
+# Room around the padded sprite for vertex and keypoint labels
+LABEL_MARGIN = 64
+
+# Rendered text surfaces kept for reuse, least recently used evicted first
+TEXT_CACHE_LIMIT = 1024
+# Font size of the pixeloid position readout
+HUD_FONT_SIZE = 24
+
 
 class SpriteRenderer:
     """Handles all sprite rendering and fancy calculations - extracted from AdvancedSpritesheetUI"""
     
-    def __init__(self, drawing_area_width: int, drawing_area_height: int, left_panel_width: int):
+    def __init__(self, drawing_area_width: int, drawing_area_height: int, left_panel_width: int,
+                 render_cache_budget_bytes: int = DEFAULT_RENDER_CACHE_BUDGET_BYTES):
         self.DRAWING_AREA_WIDTH = drawing_area_width
         self.DRAWING_AREA_HEIGHT = drawing_area_height
         self.LEFT_PANEL_WIDTH = left_panel_width
         
-        # Rendering cache for draw_sprite_display computations
-        self._sprite_display_cache = {}
-        self._cache_size_limit = 50  # Limit cache size to prevent memory issues
-        
-        # Initialize fonts for rendering
+        # Display layer cache: (sprite_index, layer, layer key) -> (layer surface, offset, bytes held),
+        # least recently used first and bounded by render_cache_budget_bytes
+        self.render_cache_budget_bytes = render_cache_budget_bytes
+        self._sprite_display_cache: 'OrderedDict[tuple, Tuple[Optional[pygame.Surface], Tuple[int, int], int]]' = OrderedDict()
+        self._render_cache_bytes = 0
+        self._render_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Last composited render window: (sprite index, window and layer keys, surface)
+        self._composite = None
+        # Unpanned drawing-area rect the layers are rendered into (see _get_render_window)
+        self._render_window = None
+        
+        # Alpha heat-map overlays at 1x, keyed by (model cache token, sprite index, alpha threshold).
+        # They depend only on sprite pixels, so they survive display cache clears.
+        self._overlay_cache = {}
+        self._overlay_cache_limit = 256
+        
+        # Hull and isometric line points as (N, 2) arrays for culling, keyed by (model cache token, sprite index, render version)
+        self._analysis_point_arrays = {}
+        self._analysis_point_arrays_limit = 64
+        
+        # Checkerboard backdrop textures keyed by pixeloid multiplier (current and previous zoom only)
+        self._checkerboard_textures = {}
+        self._checkerboard_texture_limit = 2
+        
+        # Fonts are created on first use per (name, size); rendered text is cached by (name, size, text, color)
         pygame.font.init()
-        self._font = pygame.font.Font(None, 24)  # Default font, size 24
-        self._vertex_font = None  # Will be initialized when needed
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self._text_cache: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
         
         # Diamond visualization modes (these will be set by the main UI)
         self.show_diamond_lines = False  # Show blue diamond outline
@@ -31,7 +78,6 @@ class SpriteRenderer:
         self.selected_diamond = 'lower'  # 'lower', 'upper', or custom diamond name
         self.custom_diamonds = []  # List of custom diamond names for current sprite
         self.selected_custom_diamond_index = -1  # Index in custom_diamonds list (-1 means not using custom)
-        self.manual_vertices = {}  # Dictionary to store manual vertex overrides per sprite
         
         # Custom keypoints mode (F3 mode)
         self.custom_keypoints_mode = False
@@ -44,71 +90,122 @@ class SpriteRenderer:
         self.show_sub_diamonds = False  # Whether to visualize sub-diamonds
     
     def _clear_sprite_display_cache(self):
-        """Clear the entire sprite display cache"""
+        """Clear every cached display layer"""
         self._sprite_display_cache.clear()
+        self._render_cache_bytes = 0
+        self._composite = None
     
-    def _clear_sprite_cache(self, sprite_index: int):
-        """Clear cache entries for a specific sprite"""
-        keys_to_remove = [key for key in self._sprite_display_cache.keys() if key[0] == sprite_index]
-        for key in keys_to_remove:
-            del self._sprite_display_cache[key]
+    def _get_font(self, size: int, font_name: Optional[str] = None) -> pygame.font.Font:
+        """Font of the given size, created on first use"""
+        font = self._fonts.get((font_name, size))
+        if font is None:
+            font = pygame.font.Font(font_name, size)
+            self._fonts[(font_name, size)] = font
+        return font
     
-    def _get_cache_key(self, sprite_index: int, pixeloid_mult: int, alpha_threshold: int,
-                       show_overlay: bool, show_diamond: bool, upper_lines_mode: bool,
-                       show_diamond_vertices: bool, effective_upper_z: int, pan_x: int, pan_y: int, model: Optional[SpritesheetModel] = None) -> tuple:
-        """Generate a cache key for the sprite display parameters"""
-        # Include manual vertex mode and manual vertex data in cache key
-        manual_vertices_key = None
-        if self.manual_vertex_mode and sprite_index in self.manual_vertices:
-            # Convert manual vertices dict to fully hashable tuple
-            manual_data = self.manual_vertices[sprite_index]
-            if manual_data:
-                # Convert nested dicts to tuples: {'lower': {'north': (x,y)}} -> (('lower', (('north', (x,y)),)),)
-                manual_vertices_key = tuple(
-                    (diamond, tuple(sorted(vertices.items())))
-                    for diamond, vertices in sorted(manual_data.items())
-                )
+    def _render_text(self, text: str, size: int, color: Tuple[int, int, int], font_name: Optional[str] = None) -> pygame.Surface:
+        """Antialiased text surface, rendered once per (font, size, text, color) and reused while cached"""
+        key = (font_name, size, text, color)
+        text_surface = self._text_cache.get(key)
+        if text_surface is not None:
+            self._text_cache.move_to_end(key)
+            return text_surface
+        
+        text_surface = self._get_font(size, font_name).render(text, True, color)
+        self._text_cache[key] = text_surface
+        if len(self._text_cache) > TEXT_CACHE_LIMIT:
+            self._text_cache.popitem(last=False)
+        return text_surface
+    
+    def _label_font_size(self, pixeloid_mult: int) -> int:
+        """Font size of vertex and keypoint labels, growing with the zoom"""
+        return max(12, pixeloid_mult + 2)
+    
+    def get_render_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and memory use of the display layer cache"""
+        lookups = self._render_cache_stats['hits'] + self._render_cache_stats['misses']
+        return {
+            **self._render_cache_stats,
+            'hit_rate': self._render_cache_stats['hits'] / lookups if lookups else 0.0,
+            'entries': len(self._sprite_display_cache),
+            'bytes': self._render_cache_bytes,
+            'budget_bytes': self.render_cache_budget_bytes,
+        }
+    
+    def print_render_cache_stats(self):
+        """Debug dump of the display layer cache"""
+        stats = self.get_render_cache_stats()
+        print(f"[DEBUG] Render cache: {stats['entries']} layers, {stats['bytes'] / (1024 * 1024):.1f} MB "
+              f"of {stats['budget_bytes'] / (1024 * 1024):.1f} MB, {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions")
+    
+    def _get_layer_keys(self, current_sprite, model: SpritesheetModel, sprite_rect: pygame.Rect,
+                        sprite_x: int, sprite_y: int, window_size: Tuple[int, int], pixel_version: int) -> Dict[str, tuple]:
+        """
+        Dependency key of every visible display layer, bottom to top (see DISPLAY_LAYERS).
+        
+        A layer is re-rendered only when its own key changes, so e.g. editing a sub-diamond edge leaves
+        the backdrop, sprite and overlay layers cached. Model edits are picked up through the sprite's
+        render version and the sheet's settings version, so stale entries miss instead of being cleared.
+        """
+        sprite_index = model.current_sprite_index
+        # Sheets share this cache, so every layer is also keyed by the model and the decoded pixels it was rendered from
+        # Positions are relative to the render window, so pan steps inside the window reuse every layer
+        placement = (model.cache_token, pixel_version, model.pixeloid_multiplier, sprite_x, sprite_y, window_size, sprite_rect.width, sprite_rect.height)
+        keys = {
+            'backdrop': placement,
+            'sprite': (placement, model.alpha_threshold),
+        }
         
-        # Include custom keypoints in cache key
-        custom_keypoints_key = None
-        if self.custom_keypoints_mode and sprite_index in self.custom_keypoints:
-            custom_data = self.custom_keypoints[sprite_index]
-            if custom_data:
-                custom_keypoints_key = tuple(sorted(custom_data.items()))
-        
-        # Include manual diamond width in cache key since it affects rendering
-        manual_diamond_width_key = None
-        if model:
-            current_sprite = model.get_current_sprite()
-            if current_sprite and current_sprite.manual_diamond_width is not None:
-                manual_diamond_width_key = current_sprite.manual_diamond_width
-            elif model.manual_diamond_width is not None:
-                manual_diamond_width_key = ('global', model.manual_diamond_width)
-        
-        # Include custom diamonds in cache key since they affect rendering
-        custom_diamonds_key = None
-        if model:
-            current_sprite = model.get_current_sprite()
-            if current_sprite and current_sprite.diamond_info and current_sprite.diamond_info.extra_diamonds:
-                # Create a hashable representation of custom diamonds
-                custom_diamonds_key = tuple(sorted(current_sprite.diamond_info.extra_diamonds.keys()))
-        
-        return (sprite_index, pixeloid_mult, alpha_threshold, show_overlay,
-                show_diamond, upper_lines_mode, show_diamond_vertices, effective_upper_z,
-                pan_x, pan_y, self.manual_vertex_mode, manual_vertices_key,
-                self.show_diamond_lines, self.show_raycast_analysis,
-                self.custom_keypoints_mode, custom_keypoints_key, manual_diamond_width_key,
-                custom_diamonds_key, self.selected_diamond, self.sub_diamond_mode,
-                self.show_sub_diamonds, self.selected_sub_diamond_layer,
-                self.sub_diamond_editing_mode)
+        if model.show_overlay:
+            keys['heat_overlay'] = (placement, model.alpha_threshold)
+        
+        # Analysis, edits and manual vertices of this sprite plus sheet-wide settings; the sprite
+        # pixels drawn by the layers above depend only on the alpha threshold
+        sprite_state = (model.settings_version, current_sprite.render_version, model.manual_vertices.sprite_version(sprite_index))
+        
+        if model.show_overlay and current_sprite.bbox:
+            effective_upper_z = model.get_effective_upper_z_offset(sprite_index)
+            keys['bounds'] = (placement, sprite_state, model.show_diamond_height, effective_upper_z)
+            
+            has_diamonds = current_sprite.diamond_info is not None
+            if self.show_diamond_lines and has_diamonds:
+                keys['diamond_lines'] = (placement, sprite_state, self.manual_vertex_mode)
+            
+            if current_sprite.detailed_analysis and self.show_raycast_analysis:
+                keys['raycast_analysis'] = (placement, sprite_state, model.upper_lines_midpoint_mode, effective_upper_z)
+                if (model.show_diamond_vertices or self.manual_vertex_mode) and has_diamonds:
+                    keys['diamond_vertices'] = (placement, sprite_state, self.manual_vertex_mode,
+                                                self.selected_diamond, self.selected_vertex)
+                if self.custom_keypoints_mode:
+                    keys['keypoints'] = (placement, sprite_state, self._get_keypoints_key(current_sprite, sprite_index))
+        
+        if self.show_sub_diamonds and current_sprite.diamond_info and current_sprite.bbox:
+            keys['sub_diamonds'] = (placement, sprite_state, self.selected_sub_diamond_layer, self.sub_diamond_editing_mode)
+        
+        return keys
     
-    def _limit_cache_size(self):
-        """Remove oldest cache entries if cache size exceeds limit"""
-        if len(self._sprite_display_cache) > self._cache_size_limit:
-            # Remove oldest entries (simple FIFO approach)
-            keys_to_remove = list(self._sprite_display_cache.keys())[:-self._cache_size_limit]
-            for key in keys_to_remove:
-                del self._sprite_display_cache[key]
+    def _get_keypoints_key(self, current_sprite, sprite_index: int) -> tuple:
+        """Hashable snapshot of the keypoints drawn for a sprite"""
+        model_keypoints = tuple(sorted((name, point.x, point.y) for name, point in current_sprite.custom_keypoints.items()))
+        manual_keypoints = tuple(sorted(self.custom_keypoints.get(sprite_index, {}).items()))
+        return model_keypoints, manual_keypoints
+    
+    def _store_layer(self, cache_key: tuple, layer_surface: Optional[pygame.Surface], offset: Tuple[int, int]):
+        """Cache a rendered layer with the bytes its pixels hold, then evict down to the budget"""
+        size = 0
+        if layer_surface is not None:
+            size = layer_surface.get_width() * layer_surface.get_height() * layer_surface.get_bytesize()
+        self._sprite_display_cache[cache_key] = (layer_surface, offset, size)
+        self._render_cache_bytes += size
+        self._evict_layers()
+    
+    def _evict_layers(self):
+        """Drop least recently used layers until the cache fits its budget (the newest layer is always kept)"""
+        while self._render_cache_bytes > self.render_cache_budget_bytes and len(self._sprite_display_cache) > 1:
+            _, (_, _, size) = self._sprite_display_cache.popitem(last=False)
+            self._render_cache_bytes -= size
+            self._render_cache_stats['evictions'] += 1
     
     def _calculate_expanded_bounds(self, current_sprite, model):
         """Calculate expanded bounds to fit manual diamond width visualization and manual vertex positions"""
@@ -131,7 +228,7 @@ class SpriteRenderer:
         
         # Check manual vertex positions to extend bounds further if needed
         sprite_key = model.current_sprite_index
-        manual_overrides = self.manual_vertices.get(sprite_key, {})
+        manual_overrides = model.manual_vertices.get_sprite(sprite_key)
         
         # Check all diamond levels including custom diamonds
         all_diamond_levels = ['lower', 'upper']
@@ -162,84 +259,130 @@ class SpriteRenderer:
         
         return expanded_bounds
     
-    def draw_sprite_display(self, screen: pygame.Surface, model: Optional[SpritesheetModel], analyzer, left_panel_width: int):
-        """Draw the current sprite with pixeloid rendering in the center area (cached)"""
+    def _prepare_display(self, model: Optional[SpritesheetModel], analyzer):
+        """Resolve what the sprite display would show: sprite data, render window and layer keys, or None if nothing"""
         if not model or not analyzer:
-            return
+            return None
         
         current_sprite = model.get_current_sprite()
         if not current_sprite:
-            return
+            return None
             
         sprite_surface = analyzer.get_sprite_surface(model.current_sprite_index)
         if not sprite_surface:
-            return
+            return None
         
         sprite_rect = sprite_surface.get_rect()
         if sprite_rect.width <= 0 or sprite_rect.height <= 0:
-            return
+            return None
         
         # Calculate expanded bounds for manual diamond width visualization
         expanded_bounds = self._calculate_expanded_bounds(current_sprite, model)
-        
-        # Generate cache key for current rendering parameters
-        effective_upper_z = model.get_effective_upper_z_offset(model.current_sprite_index)
-        cache_key = self._get_cache_key(
-            model.current_sprite_index,
-            model.pixeloid_multiplier,
-            model.alpha_threshold,
-            model.show_overlay,
-            model.show_diamond_height,
-            model.upper_lines_midpoint_mode,
-            model.show_diamond_vertices,
-            effective_upper_z,
-            model.pan_x,
-            model.pan_y,
-            model
-        )
-        
-        # Check if we have a cached surface for these parameters
-        if cache_key in self._sprite_display_cache:
-            cached_surface, cached_clip_rect = self._sprite_display_cache[cache_key]
-            # Blit the cached surface to the screen
-            screen.set_clip(cached_clip_rect)
-            screen.blit(cached_surface, (left_panel_width, 0))
-            screen.set_clip(None)
-        else:
-            # Determine rendering dimensions based on expanded bounds
-            render_width = self.DRAWING_AREA_WIDTH
-            render_height = self.DRAWING_AREA_HEIGHT
-            
-            # If diamond extends beyond bbox, we might need larger rendering area
-            if expanded_bounds and expanded_bounds['diamond_extends']:
-                # For now, keep the same drawing area but adjust sprite positioning
-                pass
-            
-            # Create a new surface to render to for caching
-            cache_surface = pygame.Surface((render_width, render_height))
-            cache_surface.fill((40, 40, 40))  # Match background color
-            
-            # Render to the cache surface with expanded bounds information
-            self._render_sprite_to_surface(cache_surface, sprite_surface, sprite_rect, current_sprite, model, expanded_bounds)
-            
-            # Calculate clipping rectangle
-            drawing_x = left_panel_width
-            drawing_y = 0
-            clip_rect = pygame.Rect(drawing_x, drawing_y, self.DRAWING_AREA_WIDTH, self.DRAWING_AREA_HEIGHT)
-            
-            # Store in cache
-            self._sprite_display_cache[cache_key] = (cache_surface.copy(), clip_rect)
-            self._limit_cache_size()
-            
-            # Blit to screen
-            screen.set_clip(clip_rect)
-            screen.blit(cache_surface, (left_panel_width, 0))
-            screen.set_clip(None)
-        
-        # Draw border around drawing area (not cached as it's always the same)
+        sprite_x, sprite_y = self._get_sprite_origin(sprite_rect, model, expanded_bounds)
+        
+        # Layers are rendered in content space (unpanned) inside a render window, so panning only moves the composite
+        content_rect = self._get_content_rect(sprite_x, sprite_y, sprite_rect, current_sprite, expanded_bounds, model.pixeloid_multiplier)
+        window = self._get_render_window(content_rect, model.pan_x, model.pan_y)
+        window_sprite_x, window_sprite_y = sprite_x - window.x, sprite_y - window.y
+        layer_keys = self._get_layer_keys(current_sprite, model, sprite_rect, window_sprite_x, window_sprite_y, window.size,
+                                          analyzer.pixel_version)
+        return current_sprite, sprite_surface, window, window_sprite_x, window_sprite_y, layer_keys
+    
+    def get_display_key(self, model: Optional[SpritesheetModel], analyzer) -> Optional[tuple]:
+        """Key of everything the sprite display draws (layers, render window and pan), None if it draws nothing"""
+        display = self._prepare_display(model, analyzer)
+        if display is None:
+            return None
+        window, layer_keys = display[2], display[5]
+        return model.current_sprite_index, tuple(window), tuple(layer_keys.items()), model.pan_x, model.pan_y
+    
+    def draw_sprite_display(self, screen: pygame.Surface, model: Optional[SpritesheetModel], analyzer, left_panel_width: int):
+        """Draw the current sprite with pixeloid rendering in the center area (cached per layer)"""
+        display = self._prepare_display(model, analyzer)
+        if display is None:
+            return
+        current_sprite, sprite_surface, window, window_sprite_x, window_sprite_y, layer_keys = display
+        
+        # Composite again only when a visible layer changed; unchanged layers come from the cache
+        composite_key = (model.current_sprite_index, tuple(window), tuple(layer_keys.items()))
+        if self._composite is None or self._composite[0] != composite_key:
+            composite = pygame.Surface(window.size)
+            composite.fill((40, 40, 40))  # Match background color
+            for layer, layer_key in layer_keys.items():
+                layer_surface, offset = self._get_layer(layer, layer_key, sprite_surface, current_sprite, model,
+                                                        window_sprite_x, window_sprite_y, window.size, analyzer.pixel_version)
+                if layer_surface:
+                    composite.blit(layer_surface, offset)
+            self._composite = (composite_key, composite)
+        
+        # Blit the composited layers to the screen at the current pan offset, within any clip the caller set
+        previous_clip = screen.get_clip()
+        clip_rect = pygame.Rect(left_panel_width, 0, self.DRAWING_AREA_WIDTH, self.DRAWING_AREA_HEIGHT).clip(previous_clip)
+        screen.set_clip(clip_rect)
+        screen.fill((40, 40, 40), clip_rect)
+        screen.blit(self._composite[1], (left_panel_width + window.x + model.pan_x, window.y + model.pan_y))
+        screen.set_clip(previous_clip)
+        
+        self.draw_drawing_area_border(screen, left_panel_width)
+    
+    def draw_drawing_area_border(self, screen: pygame.Surface, left_panel_width: int):
+        """Draw the border around the drawing area (not cached as it's always the same)"""
         pygame.draw.rect(screen, (100, 100, 100),
                         (left_panel_width - 1, -1, self.DRAWING_AREA_WIDTH + 2, self.DRAWING_AREA_HEIGHT + 2), 1)
     
+    def _get_layer(self, layer: str, layer_key: tuple, sprite_surface: pygame.Surface, current_sprite,
+                   model: SpritesheetModel, sprite_x: int, sprite_y: int, window_size: Tuple[int, int],
+                   pixel_version: int) -> Tuple[Optional[pygame.Surface], Tuple[int, int]]:
+        """Get a display layer and its offset in the render window, rendering it only when its dependency key changed"""
+        cache_key = (model.current_sprite_index, layer, layer_key)
+        entry = self._sprite_display_cache.get(cache_key)
+        if entry is not None:
+            self._sprite_display_cache.move_to_end(cache_key)
+            self._render_cache_stats['hits'] += 1
+            return entry[0], entry[1]
+        
+        self._render_cache_stats['misses'] += 1
+        layer_surface, offset = self._render_layer(layer, sprite_surface, current_sprite, model, sprite_x, sprite_y, window_size,
+                                                   pixel_version)
+        self._store_layer(cache_key, layer_surface, offset)
+        return layer_surface, offset
+    
+    def _get_content_rect(self, sprite_x: int, sprite_y: int, sprite_rect: pygame.Rect, current_sprite,
+                          expanded_bounds, pixeloid_mult: int) -> pygame.Rect:
+        """Unpanned drawing-area rect holding everything the layers draw: the padded sprite, expanded bounds and labels"""
+        padding = 10 * pixeloid_mult
+        content = pygame.Rect(sprite_x - padding, sprite_y - padding,
+                              sprite_rect.width * pixeloid_mult + padding * 2, sprite_rect.height * pixeloid_mult + padding * 2)
+        if expanded_bounds:
+            # Absolute sprite coordinates map to sprite_x + x * pixeloid_mult, like vertices do
+            content.union_ip(pygame.Rect(sprite_x + expanded_bounds['x'] * pixeloid_mult, sprite_y + expanded_bounds['y'] * pixeloid_mult,
+                                         (expanded_bounds['width'] + 1) * pixeloid_mult, (expanded_bounds['height'] + 1) * pixeloid_mult))
+        return content.inflate(LABEL_MARGIN * 2, LABEL_MARGIN * 2)
+    
+    def _get_render_window(self, content_rect: pygame.Rect, pan_x: int, pan_y: int) -> pygame.Rect:
+        """Unpanned area the layers are rendered into: all of the content if it fits, else a margin around the viewport"""
+        previous = self._render_window
+        window_x, window_width = self._get_window_span(content_rect.x, content_rect.width, -pan_x, self.DRAWING_AREA_WIDTH,
+                                                       (previous.x, previous.width) if previous else None)
+        window_y, window_height = self._get_window_span(content_rect.y, content_rect.height, -pan_y, self.DRAWING_AREA_HEIGHT,
+                                                        (previous.y, previous.height) if previous else None)
+        self._render_window = pygame.Rect(window_x, window_y, window_width, window_height)
+        return self._render_window
+    
+    def _get_window_span(self, content_start: int, content_length: int, view_start: int, view_length: int,
+                         previous: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+        """Render window (start, length) on one axis, kept while it still covers the visible content"""
+        span = view_length + 2 * RENDER_WINDOW_MARGIN
+        if content_length <= span:
+            return content_start, content_length
+        
+        visible_start = max(view_start, content_start)
+        visible_end = min(view_start + view_length, content_start + content_length)
+        if previous and previous[1] == span and (visible_start >= visible_end or
+                                                 (previous[0] <= visible_start and visible_end <= previous[0] + span)):
+            return previous
+        return min(max(view_start - RENDER_WINDOW_MARGIN, content_start), content_start + content_length - span), span
+    
     def draw_mouse_position_display(self, screen: pygame.Surface, model: Optional[SpritesheetModel],
                                    mouse_in_drawing_area: bool, sprite_pixel_x: float, sprite_pixel_y: float,
                                    window_width: int):
@@ -252,8 +395,8 @@ class SpriteRenderer:
         pixel_y_int = int(sprite_pixel_y)
         position_text = f"Pixeloid Position: ({pixel_x_int}, {pixel_y_int})"
         
-        # Render the text
-        text_surface = self._font.render(position_text, True, (255, 255, 255))  # White text
+        # Render the text (cached, so an unchanged position is not re-rendered)
+        text_surface = self._render_text(position_text, HUD_FONT_SIZE, (255, 255, 255))  # White text
         text_rect = text_surface.get_rect()
         
         # Position at top center of screen
@@ -268,12 +411,8 @@ class SpriteRenderer:
         # Draw the text
         screen.blit(text_surface, (text_x, text_y))
     
-    def _render_sprite_to_surface(self, surface: pygame.Surface, sprite_surface: pygame.Surface,
-                                 sprite_rect: pygame.Rect, current_sprite, model: Optional[SpritesheetModel], expanded_bounds=None):
-        """Render sprite content to the given surface (used for caching)"""
-        if not model:
-            return
-        
+    def _get_sprite_origin(self, sprite_rect: pygame.Rect, model: SpritesheetModel, expanded_bounds=None) -> Tuple[int, int]:
+        """Top-left of the sprite in the drawing area before panning, centered on the expanded bounds if any"""
         # Calculate sprite display size using pixeloid multiplier
         display_width = sprite_rect.width * model.pixeloid_multiplier
         display_height = sprite_rect.height * model.pixeloid_multiplier
@@ -292,199 +431,235 @@ class SpriteRenderer:
             bbox_offset_x = (expanded_bounds['original_bbox'].x - expanded_bounds['x']) * model.pixeloid_multiplier
             bbox_offset_y = (expanded_bounds['original_bbox'].y - expanded_bounds['y']) * model.pixeloid_multiplier
             
-            sprite_x = base_expanded_x + bbox_offset_x + model.pan_x
-            sprite_y = base_expanded_y + bbox_offset_y + model.pan_y
-        else:
-            # Center the sprite in the surface, apply panning (original logic)
-            base_sprite_x = (self.DRAWING_AREA_WIDTH - display_width) // 2
-            base_sprite_y = (self.DRAWING_AREA_HEIGHT - display_height) // 2
-            sprite_x = base_sprite_x + model.pan_x
-            sprite_y = base_sprite_y + model.pan_y
-        
-        # Calculate padding in pixeloids
-        padding_pixeloids = 10 * model.pixeloid_multiplier
-        actual_display_width = display_width + (padding_pixeloids * 2)
-        actual_display_height = display_height + (padding_pixeloids * 2)
-        
-        # Calculate the top-left of the padded area
-        padded_x = sprite_x - padding_pixeloids
-        padded_y = sprite_y - padding_pixeloids
-        
-        # Draw checkerboard background aligned with pixeloid boundaries
-        pixeloid_size = model.pixeloid_multiplier
-        
-        # Find the grid starting position that covers the padded area
-        grid_start_x = sprite_x
-        while grid_start_x > padded_x:
-            grid_start_x -= pixeloid_size
-        
-        grid_start_y = sprite_y
-        while grid_start_y > padded_y:
-            grid_start_y -= pixeloid_size
-        
-        # Draw checkerboard grid
-        y = grid_start_y
-        row = 0
-        while y < padded_y + actual_display_height:
-            x = grid_start_x
-            col = 0
-            while x < padded_x + actual_display_width:
-                # Checkerboard pattern
-                color = (200, 200, 200) if (row + col) % 2 == 0 else (150, 150, 150)
-                
-                # Draw the checker square, clipped to visible area
-                rect_x = max(x, padded_x)
-                rect_y = max(y, padded_y)
-                rect_w = min(x + pixeloid_size, padded_x + actual_display_width) - rect_x
-                rect_h = min(y + pixeloid_size, padded_y + actual_display_height) - rect_y
-                
-                if rect_w > 0 and rect_h > 0 and rect_x >= 0 and rect_y >= 0 and rect_x < self.DRAWING_AREA_WIDTH and rect_y < self.DRAWING_AREA_HEIGHT:
-                    pygame.draw.rect(surface, color, (rect_x, rect_y, rect_w, rect_h))
-                
-                x += pixeloid_size
-                col += 1
-            y += pixeloid_size
-            row += 1
-        
-        # Draw sprite pixel by pixel as pixeloids
-        for y in range(sprite_rect.height):
-            for x in range(sprite_rect.width):
-                pixel_color = sprite_surface.get_at((x, y))
-                if pixel_color.a > model.alpha_threshold:  # Only draw visible pixels
-                    pixel_x = sprite_x + x * model.pixeloid_multiplier
-                    pixel_y = sprite_y + y * model.pixeloid_multiplier
-                    if (pixel_x >= 0 and pixel_y >= 0 and
-                        pixel_x < self.DRAWING_AREA_WIDTH and pixel_y < self.DRAWING_AREA_HEIGHT):
-                        pixel_rect = pygame.Rect(
-                            pixel_x, pixel_y,
-                            model.pixeloid_multiplier,
-                            model.pixeloid_multiplier
-                        )
-                        pygame.draw.rect(surface, pixel_color[:3], pixel_rect)
-        
-        # Calculate scaled bbox for both overlay and sub-diamonds (moved outside overlay check)
+            return base_expanded_x + bbox_offset_x, base_expanded_y + bbox_offset_y
+        
+        # Center the sprite in the surface (original logic)
+        base_sprite_x = (self.DRAWING_AREA_WIDTH - display_width) // 2
+        base_sprite_y = (self.DRAWING_AREA_HEIGHT - display_height) // 2
+        return base_sprite_x, base_sprite_y
+    
+    def _render_layer(self, layer: str, sprite_surface: pygame.Surface, current_sprite, model: SpritesheetModel,
+                      sprite_x: int, sprite_y: int, window_size: Tuple[int, int],
+                      pixel_version: int) -> Tuple[Optional[pygame.Surface], Tuple[int, int]]:
+        """
+        Render one display layer into the render window (sprite_x, sprite_y are window coordinates).
+        Returns the layer cropped to what it drew and its offset in the window, or None if it drew nothing.
+        """
+        surface = pygame.Surface(window_size, pygame.SRCALPHA, 32)
+        pixeloid_mult = model.pixeloid_multiplier
+        sprite_rect = sprite_surface.get_rect()
         scaled_bbox = None
         if current_sprite.bbox:
             bbox = current_sprite.bbox
-            scaled_bbox = pygame.Rect(
-                bbox.x * model.pixeloid_multiplier,
-                bbox.y * model.pixeloid_multiplier,
-                bbox.width * model.pixeloid_multiplier,
-                bbox.height * model.pixeloid_multiplier
-            )
+            scaled_bbox = pygame.Rect(bbox.x * pixeloid_mult, bbox.y * pixeloid_mult,
+                                      bbox.width * pixeloid_mult, bbox.height * pixeloid_mult)
+        
+        if layer == 'backdrop':
+            # Checkerboard aligned with pixeloid boundaries, padded by 10 pixeloids around the sprite
+            padding_pixeloids = 10 * pixeloid_mult
+            self._blit_checkerboard(surface, sprite_x - padding_pixeloids, sprite_y - padding_pixeloids,
+                                    sprite_rect.width * pixeloid_mult + padding_pixeloids * 2,
+                                    sprite_rect.height * pixeloid_mult + padding_pixeloids * 2, pixeloid_mult)
+        elif layer == 'sprite':
+            self._blit_sprite_pixeloids(surface, sprite_surface, sprite_x, sprite_y, pixeloid_mult, model.alpha_threshold)
+        elif layer == 'heat_overlay':
+            self._blit_alpha_overlay(surface, sprite_surface, sprite_x, sprite_y, model, pixel_version)
+        elif layer == 'bounds':
+            self._draw_bounds_to_surface(surface, sprite_x, sprite_y, sprite_rect, scaled_bbox, current_sprite, model)
+        elif layer == 'diamond_lines':
+            self._draw_diamond_lines_to_surface(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model)
+        elif layer == 'raycast_analysis':
+            self._draw_analysis_points_to_surface(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, model)
+        elif layer == 'diamond_vertices':
+            self._draw_unified_diamond_vertices(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model)
+        elif layer == 'keypoints':
+            self._draw_custom_keypoints(surface, sprite_x, sprite_y, current_sprite, pixeloid_mult, model)
+        elif layer == 'sub_diamonds':
+            self._draw_sub_diamonds(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model)
+        
+        # Keep only the part the layer drew on, so sparse layers (vertices, keypoints) stay small
+        drawn = surface.get_bounding_rect()
+        if drawn.width == 0 or drawn.height == 0:
+            return None, (0, 0)
+        cropped = surface.subsurface(drawn).copy()
+        if layer == 'heat_overlay':
+            # The overlay is copied in opaque and blended at half opacity when composited
+            cropped.set_alpha(128)
+        return cropped, drawn.topleft
+    
+    def _draw_bounds_to_surface(self, surface: pygame.Surface, sprite_x, sprite_y, sprite_rect: pygame.Rect, scaled_bbox,
+                                current_sprite, model: SpritesheetModel):
+        """Draw the sprite frame (blue), content bounding box (yellow) and diamond height lines (cyan)"""
+        area_width, area_height = surface.get_size()
+        bbox = current_sprite.bbox
         
-        # Draw overlay if enabled
-        if model.show_overlay:
-            # Draw overlay pixel by pixel as pixeloids
-            for y in range(sprite_rect.height):
-                for x in range(sprite_rect.width):
-                    pixel_color = sprite_surface.get_at((x, y))
-                    if pixel_color.a > model.alpha_threshold:
-                        # Create overlay color (green to red gradient)
-                        alpha_val = pixel_color.a
-                        intensity = (alpha_val - model.alpha_threshold) / (255 - model.alpha_threshold) if model.alpha_threshold < 255 else 1
-                        overlay_color = (int(255 * intensity), int(255 * (1 - intensity)), 0)
-                        
-                        pixel_x = sprite_x + x * model.pixeloid_multiplier
-                        pixel_y = sprite_y + y * model.pixeloid_multiplier
-                        if (pixel_x >= 0 and pixel_y >= 0 and
-                            pixel_x < self.DRAWING_AREA_WIDTH and pixel_y < self.DRAWING_AREA_HEIGHT):
-                            overlay_rect = pygame.Rect(
-                                pixel_x, pixel_y,
-                                model.pixeloid_multiplier,
-                                model.pixeloid_multiplier
-                            )
-                            # Draw semi-transparent overlay
-                            overlay_surface = pygame.Surface((model.pixeloid_multiplier, model.pixeloid_multiplier))
-                            overlay_surface.set_alpha(128)
-                            overlay_surface.fill(overlay_color)
-                            surface.blit(overlay_surface, overlay_rect)
+        # Draw original sprite boundary (blue lines)
+        original_width_scaled = sprite_rect.width * model.pixeloid_multiplier
+        original_height_scaled = sprite_rect.height * model.pixeloid_multiplier
+        
+        line_width = max(1, min(model.pixeloid_multiplier, 8))  # Cap line width to prevent issues
+        
+        # Draw solid blue rectangle for original boundaries - check if any part is visible
+        original_rect = pygame.Rect(sprite_x, sprite_y, original_width_scaled, original_height_scaled)
+        drawing_area_rect = pygame.Rect(0, 0, area_width, area_height)
+        if original_rect.colliderect(drawing_area_rect):
+            # Clip the rectangle to the visible area
+            clipped_rect = original_rect.clip(drawing_area_rect)
+            pygame.draw.rect(surface, (0, 150, 255), clipped_rect, line_width)
+        
+        # Draw tight content bounding box (yellow lines)
+        bbox_start_x = sprite_x + scaled_bbox.x
+        bbox_start_y = sprite_y + scaled_bbox.y
+        
+        # Draw solid yellow rectangle for content boundaries - check if any part is visible
+        bbox_rect = pygame.Rect(bbox_start_x, bbox_start_y, scaled_bbox.width, scaled_bbox.height)
+        if bbox_rect.colliderect(drawing_area_rect):
+            # Clip the rectangle to the visible area
+            clipped_bbox = bbox_rect.clip(drawing_area_rect)
+            pygame.draw.rect(surface, (255, 255, 0), clipped_bbox, line_width)
+        
+        # Draw diamond height line if enabled
+        if model.show_diamond_height and current_sprite.diamond_info:
+            diamond_info = current_sprite.diamond_info
             
-            # Draw bounding box and analysis if sprite has analysis data
-            if scaled_bbox:
-                
-                # Draw original sprite boundary (blue lines)
-                original_width_scaled = sprite_rect.width * model.pixeloid_multiplier
-                original_height_scaled = sprite_rect.height * model.pixeloid_multiplier
-                
-                line_width = max(1, min(model.pixeloid_multiplier, 8))  # Cap line width to prevent issues
-                
-                # Draw solid blue rectangle for original boundaries - check if any part is visible
-                original_rect = pygame.Rect(sprite_x, sprite_y, original_width_scaled, original_height_scaled)
-                drawing_area_rect = pygame.Rect(0, 0, self.DRAWING_AREA_WIDTH, self.DRAWING_AREA_HEIGHT)
-                if original_rect.colliderect(drawing_area_rect):
-                    # Clip the rectangle to the visible area
-                    clipped_rect = original_rect.clip(drawing_area_rect)
-                    pygame.draw.rect(surface, (0, 150, 255), clipped_rect, line_width)
-                
-                # Draw tight content bounding box (yellow lines)
-                bbox_start_x = sprite_x + scaled_bbox.x
-                bbox_start_y = sprite_y + scaled_bbox.y
-                
-                # Draw solid yellow rectangle for content boundaries - check if any part is visible
-                bbox_rect = pygame.Rect(bbox_start_x, bbox_start_y, scaled_bbox.width, scaled_bbox.height)
-                if bbox_rect.colliderect(drawing_area_rect):
-                    # Clip the rectangle to the visible area
-                    clipped_bbox = bbox_rect.clip(drawing_area_rect)
-                    pygame.draw.rect(surface, (255, 255, 0), clipped_bbox, line_width)
-                
-                # Draw diamond height line if enabled
-                if model.show_diamond_height and current_sprite.diamond_info:
-                    diamond_info = current_sprite.diamond_info
-                    
-                    # Get effective upper Z offset for this frame
-                    effective_upper_z = model.get_effective_upper_z_offset(model.current_sprite_index)
-                    
-                    # Draw upper Z offset line if present (cyan)
-                    if effective_upper_z > 0:
-                        upper_line_y_scaled = effective_upper_z * model.pixeloid_multiplier
-                        upper_line_start_x = sprite_x + scaled_bbox.x
-                        upper_line_end_x = sprite_x + scaled_bbox.x + scaled_bbox.width
-                        upper_line_y_pos = sprite_y + scaled_bbox.y + upper_line_y_scaled
-                        
-                        # Draw horizontal line as cyan line - check if line is visible
-                        if (upper_line_y_pos >= 0 and upper_line_y_pos < self.DRAWING_AREA_HEIGHT and
-                            not (upper_line_end_x < 0 or upper_line_start_x >= self.DRAWING_AREA_WIDTH)):
-                            # Clip line to visible area
-                            clipped_start_x = max(0, upper_line_start_x)
-                            clipped_end_x = min(self.DRAWING_AREA_WIDTH - 1, upper_line_end_x)
-                            pygame.draw.line(surface, (0, 255, 255),
-                                           (clipped_start_x, upper_line_y_pos), (clipped_end_x, upper_line_y_pos), line_width)
-                    
-                    # Draw the diamond height line (cyan)
-                    if diamond_info.line_y and diamond_info.line_y >= bbox.y and diamond_info.line_y <= bbox.y + bbox.height:
-                        # Scale the line position
-                        line_y_scaled = (diamond_info.line_y - bbox.y) * model.pixeloid_multiplier
-                        line_start_x = sprite_x + scaled_bbox.x
-                        line_end_x = sprite_x + scaled_bbox.x + scaled_bbox.width
-                        line_y_pos = sprite_y + scaled_bbox.y + line_y_scaled
-                        
-                        # Draw horizontal line as cyan line - check if line is visible
-                        if (line_y_pos >= 0 and line_y_pos < self.DRAWING_AREA_HEIGHT and
-                            not (line_end_x < 0 or line_start_x >= self.DRAWING_AREA_WIDTH)):
-                            # Clip line to visible area
-                            clipped_start_x = max(0, line_start_x)
-                            clipped_end_x = min(self.DRAWING_AREA_WIDTH - 1, line_end_x)
-                            pygame.draw.line(surface, (0, 255, 255),
-                                           (clipped_start_x, line_y_pos), (clipped_end_x, line_y_pos), line_width)
-                
-                # Draw analysis points if available
-                # Draw diamond lines if enabled (BEHIND analysis points)
-                if self.show_diamond_lines and current_sprite.diamond_info:
-                    pixeloid_mult = model.pixeloid_multiplier
-                    self._draw_diamond_lines_to_surface(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model)
+            # Get effective upper Z offset for this frame
+            effective_upper_z = model.get_effective_upper_z_offset(model.current_sprite_index)
+            
+            # Draw upper Z offset line if present (cyan)
+            if effective_upper_z > 0:
+                upper_line_y_scaled = effective_upper_z * model.pixeloid_multiplier
+                upper_line_start_x = sprite_x + scaled_bbox.x
+                upper_line_end_x = sprite_x + scaled_bbox.x + scaled_bbox.width
+                upper_line_y_pos = sprite_y + scaled_bbox.y + upper_line_y_scaled
                 
-                # Draw analysis points only if raycast analysis is enabled
-                if current_sprite.detailed_analysis and self.show_raycast_analysis:
-                    self._draw_analysis_points_to_surface(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, model)
+                # Draw horizontal line as cyan line - check if line is visible
+                if (upper_line_y_pos >= 0 and upper_line_y_pos < area_height and
+                    not (upper_line_end_x < 0 or upper_line_start_x >= area_width)):
+                    # Clip line to visible area
+                    clipped_start_x = max(0, upper_line_start_x)
+                    clipped_end_x = min(area_width - 1, upper_line_end_x)
+                    pygame.draw.line(surface, (0, 255, 255),
+                                   (clipped_start_x, upper_line_y_pos), (clipped_end_x, upper_line_y_pos), line_width)
+            
+            # Draw the diamond height line (cyan)
+            if diamond_info.line_y and diamond_info.line_y >= bbox.y and diamond_info.line_y <= bbox.y + bbox.height:
+                # Scale the line position
+                line_y_scaled = (diamond_info.line_y - bbox.y) * model.pixeloid_multiplier
+                line_start_x = sprite_x + scaled_bbox.x
+                line_end_x = sprite_x + scaled_bbox.x + scaled_bbox.width
+                line_y_pos = sprite_y + scaled_bbox.y + line_y_scaled
                 
-
-        # Draw sub-diamonds INDEPENDENTLY of overlay toggle and raycast analysis
-        if self.show_sub_diamonds and current_sprite.diamond_info and scaled_bbox:
-            self._draw_sub_diamonds(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, model.pixeloid_multiplier, model)
-
+                # Draw horizontal line as cyan line - check if line is visible
+                if (line_y_pos >= 0 and line_y_pos < area_height and
+                    not (line_end_x < 0 or line_start_x >= area_width)):
+                    # Clip line to visible area
+                    clipped_start_x = max(0, line_start_x)
+                    clipped_end_x = min(area_width - 1, line_end_x)
+                    pygame.draw.line(surface, (0, 255, 255),
+                                   (clipped_start_x, line_y_pos), (clipped_end_x, line_y_pos), line_width)
+    
+    def _visible_pixeloid_range(self, origin: int, count: int, pixeloid_mult: int, limit: int) -> Tuple[int, int]:
+        """Range of pixeloid indices whose top-left corner lies inside [0, limit) on one axis"""
+        first = max(0, (pixeloid_mult - 1 - origin) // pixeloid_mult)
+        last = min(count, (limit - origin + pixeloid_mult - 1) // pixeloid_mult)
+        return first, max(first, last)
+    
+    def _get_checkerboard_texture(self, pixeloid_mult: int) -> pygame.Surface:
+        """Checkerboard of pixeloid-sized cells big enough to cover the largest render window from either parity"""
+        texture = self._checkerboard_textures.get(pixeloid_mult)
+        if texture is None:
+            cols = -(-(self.DRAWING_AREA_WIDTH + 2 * RENDER_WINDOW_MARGIN) // pixeloid_mult) + 2
+            rows = -(-(self.DRAWING_AREA_HEIGHT + 2 * RENDER_WINDOW_MARGIN) // pixeloid_mult) + 1
+            cells = (np.add.outer(np.arange(cols), np.arange(rows)) % 2).repeat(pixeloid_mult, 0).repeat(pixeloid_mult, 1)
+            texture = pygame.Surface(cells.shape)
+            pygame.surfarray.blit_array(texture, np.where(cells[..., None] == 0, CHECKER_LIGHT, CHECKER_DARK).astype(np.uint8))
+            self._checkerboard_textures[pixeloid_mult] = texture
+            if len(self._checkerboard_textures) > self._checkerboard_texture_limit:
+                del self._checkerboard_textures[next(iter(self._checkerboard_textures))]
+        return texture
+    
+    def _blit_checkerboard(self, surface: pygame.Surface, origin_x: int, origin_y: int, width: int, height: int, pixeloid_mult: int):
+        """Fill a pixeloid-aligned area with the checkerboard, its top-left cell light"""
+        area_width, area_height = surface.get_size()
+        first_col, last_col = self._visible_pixeloid_range(origin_x, width // pixeloid_mult, pixeloid_mult, area_width)
+        first_row, last_row = self._visible_pixeloid_range(origin_y, height // pixeloid_mult, pixeloid_mult, area_height)
+        if first_col >= last_col or first_row >= last_row:
+            return
+        
+        # Start one cell into the texture when the first visible cell is a dark one
+        parity = (first_col + first_row) % 2
+        area = pygame.Rect(parity * pixeloid_mult, 0, (last_col - first_col) * pixeloid_mult, (last_row - first_row) * pixeloid_mult)
+        surface.blit(self._get_checkerboard_texture(pixeloid_mult),
+                     (origin_x + first_col * pixeloid_mult, origin_y + first_row * pixeloid_mult), area)
+    
+    def _threshold_sprite_surface(self, sprite_surface: pygame.Surface, alpha_threshold: int) -> pygame.Surface:
+        """Copy of a sprite with alpha forced to 255 above the threshold and to 0 at or below it"""
+        opaque = pygame.Surface(sprite_surface.get_size(), pygame.SRCALPHA, 32)
+        pygame.surfarray.pixels3d(opaque)[...] = pygame.surfarray.array3d(sprite_surface)
+        pygame.surfarray.pixels_alpha(opaque)[...] = np.where(pygame.surfarray.array_alpha(sprite_surface) > alpha_threshold, 255, 0)
+        return opaque
+    
+    def _blit_sprite_pixeloids(self, surface: pygame.Surface, sprite_surface: pygame.Surface, sprite_x: int, sprite_y: int,
+                               pixeloid_mult: int, alpha_threshold: int):
+        """Draw every visible sprite pixel above the alpha threshold as a solid pixeloid square"""
+        area_width, area_height = surface.get_size()
+        width, height = sprite_surface.get_size()
+        first_x, last_x = self._visible_pixeloid_range(sprite_x, width, pixeloid_mult, area_width)
+        first_y, last_y = self._visible_pixeloid_range(sprite_y, height, pixeloid_mult, area_height)
+        if first_x >= last_x or first_y >= last_y:
+            return
+        
+        visible = sprite_surface.subsurface((first_x, first_y, last_x - first_x, last_y - first_y))
+        opaque = self._threshold_sprite_surface(visible, alpha_threshold)
+        scaled = pygame.transform.scale(opaque, ((last_x - first_x) * pixeloid_mult, (last_y - first_y) * pixeloid_mult))
+        surface.blit(scaled, (sprite_x + first_x * pixeloid_mult, sprite_y + first_y * pixeloid_mult))
+    
+    def _get_alpha_overlay(self, sprite_surface: pygame.Surface, model: SpritesheetModel, pixel_version: int) -> pygame.Surface:
+        """Get the current sprite's heat-map overlay at 1x, building it only on a cache miss"""
+        key = (model.cache_token, pixel_version, model.current_sprite_index, model.alpha_threshold)
+        overlay = self._overlay_cache.get(key)
+        if overlay is None:
+            overlay = self._build_alpha_overlay(sprite_surface, model.alpha_threshold)
+            self._overlay_cache[key] = overlay
+            if len(self._overlay_cache) > self._overlay_cache_limit:
+                del self._overlay_cache[next(iter(self._overlay_cache))]
+        return overlay
+    
+    def _build_alpha_overlay(self, sprite_surface: pygame.Surface, alpha_threshold: int) -> pygame.Surface:
+        """Green (just above the threshold) to red (opaque) intensity per pixel; pixels at or below the threshold get OVERLAY_COLORKEY"""
+        alpha = pygame.surfarray.array_alpha(sprite_surface)
+        visible = alpha > alpha_threshold
+        if alpha_threshold < 255:
+            intensity = np.where(visible, (alpha - alpha_threshold) / (255 - alpha_threshold), 0.0)
+        else:
+            intensity = np.ones(alpha.shape)
+        
+        rgb = np.zeros(alpha.shape + (3,), dtype=np.uint8)
+        rgb[..., 0] = (255 * intensity).astype(np.uint8)
+        rgb[..., 1] = (255 * (1 - intensity)).astype(np.uint8)
+        rgb[~visible] = OVERLAY_COLORKEY
+        return pygame.surfarray.make_surface(rgb)
+    
+    def _blit_alpha_overlay(self, surface: pygame.Surface, sprite_surface: pygame.Surface, sprite_x: int, sprite_y: int,
+                            model: SpritesheetModel, pixel_version: int):
+        """Copy the heat-map overlay onto the visible pixeloids (the overlay layer is blended at half opacity)"""
+        area_width, area_height = surface.get_size()
+        pixeloid_mult = model.pixeloid_multiplier
+        width, height = sprite_surface.get_size()
+        first_x, last_x = self._visible_pixeloid_range(sprite_x, width, pixeloid_mult, area_width)
+        first_y, last_y = self._visible_pixeloid_range(sprite_y, height, pixeloid_mult, area_height)
+        if first_x >= last_x or first_y >= last_y:
+            return
+        
+        overlay = self._get_alpha_overlay(sprite_surface, model, pixel_version)
+        visible = overlay.subsurface((first_x, first_y, last_x - first_x, last_y - first_y))
+        scaled = pygame.transform.scale(visible, ((last_x - first_x) * pixeloid_mult, (last_y - first_y) * pixeloid_mult))
+        scaled.set_colorkey(OVERLAY_COLORKEY)
+        surface.blit(scaled, (sprite_x + first_x * pixeloid_mult, sprite_y + first_y * pixeloid_mult))
+    
     def _draw_analysis_points_to_surface(self, surface: pygame.Surface, sprite_x, sprite_y, scaled_bbox, current_sprite, model: Optional[SpritesheetModel]):
         """Draw analysis points to the cached surface"""
+        area_width, area_height = surface.get_size()
         if not current_sprite.detailed_analysis or not model:
             return
         
@@ -494,31 +669,13 @@ class SpriteRenderer:
         # Collect all occupied positions to avoid overlaps
         occupied_positions = set()
         
-        # Draw convex hull areas first (GREEN) - directly from Pydantic model
-        if detailed_analysis.isometric_analysis and detailed_analysis.isometric_analysis.convex_hulls:
-            for direction, hull_points in detailed_analysis.isometric_analysis.convex_hulls.items():
-                for hull_point in hull_points:
-                    if (hull_point.x, hull_point.y) not in occupied_positions:
-                        screen_x = sprite_x + scaled_bbox.x + hull_point.x * pixeloid_mult
-                        screen_y = sprite_y + scaled_bbox.y + hull_point.y * pixeloid_mult
-                        # Only draw if within proper bounds
-                        if screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
-                            hull_surface = pygame.Surface((pixeloid_mult, pixeloid_mult))
-                            hull_surface.set_alpha(100)  # Semi-transparent
-                            hull_surface.fill((0, 255, 0))  # Green for all hulls
-                            surface.blit(hull_surface, (screen_x, screen_y))
-        
-        # Draw isometric lines (PINK) - directly from Pydantic model
-        if detailed_analysis.isometric_analysis and detailed_analysis.isometric_analysis.lines:
-            for direction, line_points in detailed_analysis.isometric_analysis.lines.items():
-                for line_point in line_points:
-                    if (line_point.x, line_point.y) not in occupied_positions:
-                        screen_x = sprite_x + scaled_bbox.x + line_point.x * pixeloid_mult
-                        screen_y = sprite_y + scaled_bbox.y + line_point.y * pixeloid_mult
-                        # Only draw if within proper bounds
-                        if screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
-                            pygame.draw.rect(surface, (255, 0, 255),  # Pink for all lines
-                                           (screen_x, screen_y, pixeloid_mult, pixeloid_mult))
+        # Hulls and isometric lines hold most of the points, so only the visible ones are drawn
+        point_arrays = self._get_analysis_point_arrays(current_sprite, model)
+        origin_x, origin_y = sprite_x + scaled_bbox.x, sprite_y + scaled_bbox.y
+        # Semi-transparent green for all hulls, blended when the layer is composited
+        self._fill_visible_pixeloids(surface, point_arrays['hulls'], origin_x, origin_y, pixeloid_mult, (0, 255, 0, 100))
+        # Pink for all lines
+        self._fill_visible_pixeloids(surface, point_arrays['lines'], origin_x, origin_y, pixeloid_mult, (255, 0, 255))
         
         # Draw midpoints (GREEN) - directly from Pydantic model
         for midpoint_name, midpoint in detailed_analysis.midpoints.items():
@@ -526,7 +683,7 @@ class SpriteRenderer:
                 screen_x = sprite_x + scaled_bbox.x + midpoint.x * pixeloid_mult
                 screen_y = sprite_y + scaled_bbox.y + midpoint.y * pixeloid_mult
                 # Only draw if within proper bounds
-                if screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
+                if screen_x >= 0 and screen_x < area_width and screen_y >= 0 and screen_y < area_height:
                     pygame.draw.rect(surface, (0, 255, 0),
                                    (screen_x, screen_y, pixeloid_mult, pixeloid_mult))
                     occupied_positions.add((midpoint.x, midpoint.y))
@@ -540,7 +697,7 @@ class SpriteRenderer:
                 screen_x = sprite_x + scaled_bbox.x + contact_point.x * pixeloid_mult
                 screen_y = sprite_y + scaled_bbox.y + contact_point.y * pixeloid_mult
                 # Only draw if within proper bounds
-                if screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
+                if screen_x >= 0 and screen_x < area_width and screen_y >= 0 and screen_y < area_height:
                     pygame.draw.rect(surface, (0, 0, 0),
                                    (screen_x, screen_y, pixeloid_mult, pixeloid_mult))
         
@@ -558,7 +715,7 @@ class SpriteRenderer:
             screen_x_sw = sprite_x + scaled_bbox.x + sw_x * pixeloid_mult
             screen_y = sprite_y + scaled_bbox.y + mid_y * pixeloid_mult
             
-            if screen_x_sw >= 0 and screen_x_sw < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
+            if screen_x_sw >= 0 and screen_x_sw < area_width and screen_y >= 0 and screen_y < area_height:
                 # Draw SW indicator in cyan with diagonal line
                 dot_size = max(pixeloid_mult * 2, 6)
                 center_x = screen_x_sw + pixeloid_mult // 2
@@ -575,7 +732,7 @@ class SpriteRenderer:
                 se_x = min(bbox.width - 1, mid_x + 1)
                 screen_x_se = sprite_x + scaled_bbox.x + se_x * pixeloid_mult
                 
-                if screen_x_se >= 0 and screen_x_se < self.DRAWING_AREA_WIDTH and screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT:
+                if screen_x_se >= 0 and screen_x_se < area_width and screen_y >= 0 and screen_y < area_height:
                     # Draw SE indicator in cyan with diagonal line
                     dot_size = max(pixeloid_mult * 2, 6)
                     center_x = screen_x_se + pixeloid_mult // 2
@@ -585,14 +742,48 @@ class SpriteRenderer:
                     pygame.draw.line(surface, (0, 255, 255),
                                    (center_x - dot_size//2, center_y + dot_size//2),
                                    (center_x + dot_size//2, center_y - dot_size//2), 2)
-        
-        # Draw diamond vertices if enabled OR if in manual vertex mode (independent of diamond lines)
-        if (model.show_diamond_vertices or self.manual_vertex_mode) and current_sprite.diamond_info:
-            self._draw_unified_diamond_vertices(surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model)
-        
-        # Draw custom keypoints if in custom keypoints mode
-        if self.custom_keypoints_mode:
-            self._draw_custom_keypoints(surface, sprite_x, sprite_y, current_sprite, pixeloid_mult, model)
+    
+    def _get_analysis_point_arrays(self, current_sprite, model: SpritesheetModel) -> Dict[str, np.ndarray]:
+        """Convex hull and isometric line points of the current sprite as (N, 2) bbox-relative arrays"""
+        key = (model.cache_token, model.current_sprite_index, current_sprite.render_version)
+        arrays = self._analysis_point_arrays.get(key)
+        if arrays is None:
+            isometric_analysis = current_sprite.detailed_analysis.isometric_analysis
+            hulls = isometric_analysis.convex_hulls if isometric_analysis else {}
+            lines = isometric_analysis.lines if isometric_analysis else {}
+            # Hulls of different directions overlap; fills replace pixels, so each cell is drawn once
+            arrays = {
+                'hulls': np.unique(np.array([(point.x, point.y) for points in hulls.values() for point in points],
+                                            dtype=np.int64).reshape(-1, 2), axis=0),
+                'lines': np.unique(np.array([(point.x, point.y) for points in lines.values() for point in points],
+                                            dtype=np.int64).reshape(-1, 2), axis=0),
+            }
+            self._analysis_point_arrays[key] = arrays
+            if len(self._analysis_point_arrays) > self._analysis_point_arrays_limit:
+                del self._analysis_point_arrays[next(iter(self._analysis_point_arrays))]
+        return arrays
+    
+    def _visible_point_bounds(self, origin_x: int, origin_y: int, pixeloid_mult: int,
+                              area_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Point-space (x0, y0, x1, y1), end exclusive, of the pixeloids whose top-left lies inside the area"""
+        area_width, area_height = area_size
+        return (-(origin_x // pixeloid_mult), -(origin_y // pixeloid_mult),
+                -((origin_x - area_width) // pixeloid_mult), -((origin_y - area_height) // pixeloid_mult))
+    
+    def _segment_visible(self, start: Tuple[int, int], end: Tuple[int, int], bounds: Tuple[int, int, int, int]) -> bool:
+        """Whether the point-space box spanned by a line segment overlaps the visible bounds"""
+        x0, y0, x1, y1 = bounds
+        return (min(start[0], end[0]) < x1 and max(start[0], end[0]) >= x0 and
+                min(start[1], end[1]) < y1 and max(start[1], end[1]) >= y0)
+    
+    def _fill_visible_pixeloids(self, surface: pygame.Surface, points, origin_x: int, origin_y: int,
+                                pixeloid_mult: int, color):
+        """Fill a pixeloid square at origin + point * pixeloid_mult for every point inside the surface"""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        x0, y0, x1, y1 = self._visible_point_bounds(origin_x, origin_y, pixeloid_mult, surface.get_size())
+        visible = points[(points[:, 0] >= x0) & (points[:, 0] < x1) & (points[:, 1] >= y0) & (points[:, 1] < y1)]
+        for x, y in visible.tolist():
+            surface.fill(color, (origin_x + x * pixeloid_mult, origin_y + y * pixeloid_mult, pixeloid_mult, pixeloid_mult))
     
     def _draw_unified_diamond_vertices(self, surface: pygame.Surface, sprite_x, sprite_y, scaled_bbox, current_sprite, pixeloid_mult, model: SpritesheetModel):
         """Single unified function to draw diamond vertices (both algorithmic and manual)"""
@@ -604,13 +795,9 @@ class SpriteRenderer:
         if not bbox:
             return
             
-        # Initialize font for vertex labels if not already done
-        if not self._vertex_font:
-            self._vertex_font = pygame.font.Font(None, max(12, pixeloid_mult + 2))
-        
         # Get manual vertex overrides for current sprite
         sprite_key = model.current_sprite_index
-        manual_overrides = self.manual_vertices.get(sprite_key, {})
+        manual_overrides = model.manual_vertices.get_sprite(sprite_key)
         
         # Draw lower diamond vertices
         if diamond_info.lower_diamond:
@@ -640,6 +827,7 @@ class SpriteRenderer:
     def _draw_diamond_level_vertices(self, surface, sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult,
                                    diamond_level, diamond_data, manual_overrides, is_upper, model: SpritesheetModel):
         """Draw vertices for a single diamond level (lower or upper)"""
+        area_width, area_height = surface.get_size()
         vertex_size = max(pixeloid_mult, 4)
         
         for vertex_name, vertex in [
@@ -660,7 +848,7 @@ class SpriteRenderer:
             screen_y = sprite_y + scaled_bbox.y + rel_y * pixeloid_mult
             
             # Check bounds
-            if not (0 <= screen_x < self.DRAWING_AREA_WIDTH and 0 <= screen_y < self.DRAWING_AREA_HEIGHT):
+            if not (0 <= screen_x < area_width and 0 <= screen_y < area_height):
                 continue
                 
             # Choose color
@@ -736,11 +924,10 @@ class SpriteRenderer:
     def _draw_vertex_label(self, surface: pygame.Surface, label: str, vertex_x: int, vertex_y: int,
                           vertex_size: int, pixeloid_mult: int):
         """Draw a text label next to a diamond vertex with proper positioning"""
-        if not self._vertex_font:
-            return
+        area_width, area_height = surface.get_size()
         
         # Render the text
-        text_surface = self._vertex_font.render(label, True, (255, 255, 0))  # Yellow text for good visibility
+        text_surface = self._render_text(label, self._label_font_size(pixeloid_mult), (255, 255, 0))  # Yellow text for good visibility
         text_rect = text_surface.get_rect()
         
         # Calculate label offset based on vertex direction
@@ -764,12 +951,12 @@ class SpriteRenderer:
             label_y = vertex_y
         
         # Ensure label stays within drawing area bounds
-        label_x = max(0, min(label_x, self.DRAWING_AREA_WIDTH - text_rect.width))
-        label_y = max(0, min(label_y, self.DRAWING_AREA_HEIGHT - text_rect.height))
+        label_x = max(0, min(label_x, area_width - text_rect.width))
+        label_y = max(0, min(label_y, area_height - text_rect.height))
         
         # Draw background rectangle for better text visibility
         bg_rect = pygame.Rect(label_x - 1, label_y - 1, text_rect.width + 2, text_rect.height + 2)
-        pygame.draw.rect(surface, (0, 0, 0, 180), bg_rect)  # Semi-transparent black background
+        pygame.draw.rect(surface, (0, 0, 0), bg_rect)  # Opaque black background for readability
         pygame.draw.rect(surface, (100, 100, 100), bg_rect, 1)  # Gray border
         
         # Draw the text
@@ -787,7 +974,7 @@ class SpriteRenderer:
         
         # Get manual vertex overrides for current sprite
         sprite_key = model.current_sprite_index
-        manual_overrides = self.manual_vertices.get(sprite_key, {})
+        manual_overrides = model.manual_vertices.get_sprite(sprite_key)
         
         line_width = max(2, pixeloid_mult // 2)  # Scale line width with zoom
         
@@ -823,6 +1010,8 @@ class SpriteRenderer:
     def _draw_diamond_outline(self, surface, sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult,
                              diamond_data, manual_overrides, color, line_width):
         """Draw outline connecting diamond vertices using pixeloid squares"""
+        origin_x, origin_y = sprite_x + scaled_bbox.x, sprite_y + scaled_bbox.y
+        bounds = self._visible_point_bounds(origin_x, origin_y, pixeloid_mult, surface.get_size())
         # Get all vertex coordinates in bbox-relative space
         vertices = {}
         vertex_data = [
@@ -853,21 +1042,14 @@ class SpriteRenderer:
                     
                     # Apply directional offset based on edge direction (mimic raycast behavior)
                     offset_start_pos = self._apply_directional_offset(start_pos, start_vertex, end_vertex)
+                    if not self._segment_visible(offset_start_pos, end_pos, bounds):
+                        continue
                     
                     # Trace pixeloid line between vertices
                     line_points = self._trace_pixeloid_line(offset_start_pos[0], offset_start_pos[1], end_pos[0], end_pos[1])
                     
-                    # Draw each point as a pixeloid square with same offset as raycast analysis
-                    for rel_x, rel_y in line_points:
-                        # Apply the same coordinate system as raycast analysis (bbox-relative with proper offset)
-                        screen_x = sprite_x + scaled_bbox.x + rel_x * pixeloid_mult
-                        screen_y = sprite_y + scaled_bbox.y + rel_y * pixeloid_mult
-                        
-                        # Only draw if within drawing area bounds
-                        if (screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and
-                            screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT):
-                            # Use blue color like requested originally
-                            pygame.draw.rect(surface, color, (screen_x, screen_y, pixeloid_mult, pixeloid_mult))
+                    # Draw each point as a pixeloid square with same offset as raycast analysis (bbox-relative)
+                    self._fill_visible_pixeloids(surface, line_points, origin_x, origin_y, pixeloid_mult, color)
     
     def _apply_directional_offset(self, start_pos, start_vertex, end_vertex):
         """Apply directional starting offset based on edge direction to mimic raycast behavior"""
@@ -1057,6 +1239,7 @@ class SpriteRenderer:
     
     def _draw_custom_keypoints(self, surface: pygame.Surface, sprite_x, sprite_y, current_sprite, pixeloid_mult, model: SpritesheetModel):
         """Draw custom keypoints with distinctive appearance and labels"""
+        area_width, area_height = surface.get_size()
         # Get keypoints from the model's sprite data (loaded from file) or renderer's dictionary (manual entry)
         sprite_key = model.current_sprite_index
         keypoints = {}
@@ -1072,10 +1255,6 @@ class SpriteRenderer:
         if not keypoints:
             return
         
-        # Initialize font for keypoint labels if not already done
-        if not self._vertex_font:
-            self._vertex_font = pygame.font.Font(None, max(12, pixeloid_mult + 2))
-        
         keypoint_size = max(pixeloid_mult + 2, 6)  # Slightly larger than vertices
         
         for keypoint_name, (abs_x, abs_y) in keypoints.items():
@@ -1084,14 +1263,14 @@ class SpriteRenderer:
             screen_y = sprite_y + abs_y * pixeloid_mult
             
             # Check if within drawing area bounds
-            if not (0 <= screen_x < self.DRAWING_AREA_WIDTH and 0 <= screen_y < self.DRAWING_AREA_HEIGHT):
+            if not (0 <= screen_x < area_width and 0 <= screen_y < area_height):
                 continue
             
             # Draw keypoint as a distinctive star shape in magenta
             self._draw_star_shape(surface, screen_x, screen_y, keypoint_size, (255, 0, 255))
             
             # Draw keypoint label
-            self._draw_keypoint_label(surface, keypoint_name, screen_x, screen_y, keypoint_size)
+            self._draw_keypoint_label(surface, keypoint_name, screen_x, screen_y, keypoint_size, pixeloid_mult)
     
     def _draw_star_shape(self, surface, x, y, size, color):
         """Draw a star shape for custom keypoints"""
@@ -1118,13 +1297,13 @@ class SpriteRenderer:
                         (center_x - diagonal_offset, center_y + diagonal_offset),
                         (center_x + diagonal_offset, center_y - diagonal_offset), 2)
     
-    def _draw_keypoint_label(self, surface: pygame.Surface, label: str, keypoint_x: int, keypoint_y: int, keypoint_size: int):
+    def _draw_keypoint_label(self, surface: pygame.Surface, label: str, keypoint_x: int, keypoint_y: int, keypoint_size: int,
+                             pixeloid_mult: int):
         """Draw a text label for a custom keypoint"""
-        if not self._vertex_font:
-            return
+        area_width, area_height = surface.get_size()
         
         # Render the text
-        text_surface = self._vertex_font.render(label, True, (255, 255, 255))  # White text
+        text_surface = self._render_text(label, self._label_font_size(pixeloid_mult), (255, 255, 255))  # White text
         text_rect = text_surface.get_rect()
         
         # Position label to the right and slightly below the keypoint
@@ -1132,12 +1311,12 @@ class SpriteRenderer:
         label_y = keypoint_y + keypoint_size // 2 - text_rect.height // 2
         
         # Ensure label stays within drawing area bounds
-        label_x = max(0, min(label_x, self.DRAWING_AREA_WIDTH - text_rect.width))
-        label_y = max(0, min(label_y, self.DRAWING_AREA_HEIGHT - text_rect.height))
+        label_x = max(0, min(label_x, area_width - text_rect.width))
+        label_y = max(0, min(label_y, area_height - text_rect.height))
         
         # Draw background rectangle for better text visibility
         bg_rect = pygame.Rect(label_x - 1, label_y - 1, text_rect.width + 2, text_rect.height + 2)
-        pygame.draw.rect(surface, (0, 0, 0, 200), bg_rect)  # Semi-transparent black background
+        pygame.draw.rect(surface, (0, 0, 0), bg_rect)  # Opaque black background for readability
         pygame.draw.rect(surface, (255, 0, 255), bg_rect, 1)  # Magenta border to match star
         
         # Draw the text
@@ -1171,21 +1350,22 @@ class SpriteRenderer:
         if not diamond_data.sub_diamonds:
             return
         
-        # Get manual vertex overrides for positioning
-        sprite_key = model.current_sprite_index
-        manual_overrides = self.manual_vertices.get(sprite_key, {}).get(self.selected_sub_diamond_layer, {})
+        screen_vertices = {
+            direction: self._get_sub_diamond_screen_vertices(sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult, sub_diamond)
+            for direction, sub_diamond in diamond_data.sub_diamonds.items()
+        }
         
-        # Draw each sub-diamond
+        # Draw walkability surfaces first, so a translucent fill never covers a neighbour's edges
+        if self.sub_diamond_editing_mode == 'surface':
+            for direction, sub_diamond in diamond_data.sub_diamonds.items():
+                self._draw_sub_diamond_surface(surface, screen_vertices[direction], sub_diamond.is_walkable, pixeloid_mult)
+        
+        # Draw edges with properties
         for direction, sub_diamond in diamond_data.sub_diamonds.items():
-            self._draw_single_sub_diamond(
-                surface, sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult,
-                sub_diamond, direction, manual_overrides
-            )
+            self._draw_sub_diamond_edges(surface, screen_vertices[direction], sub_diamond, pixeloid_mult, sprite_x, sprite_y, scaled_bbox)
     
-    def _draw_single_sub_diamond(self, surface, sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult,
-                                sub_diamond, direction, manual_overrides):
-        """Draw a single sub-diamond with walkability surface and edge properties visualization"""
-        
+    def _get_sub_diamond_screen_vertices(self, sprite_x, sprite_y, scaled_bbox, bbox, pixeloid_mult, sub_diamond) -> Dict[str, Tuple[int, int]]:
+        """Screen positions of a sub-diamond's N/S/E/W vertices"""
         # Convert absolute coordinates to bbox-relative coordinates (same as diamond lines)
         vertices = {}
         for vertex_name, vertex_point in [
@@ -1205,16 +1385,11 @@ class SpriteRenderer:
             screen_x = sprite_x + scaled_bbox.x + rel_x * pixeloid_mult
             screen_y = sprite_y + scaled_bbox.y + rel_y * pixeloid_mult
             screen_vertices[vertex_name] = (screen_x, screen_y)
-        
-        # Draw walkability surface if in surface mode
-        if self.sub_diamond_editing_mode == 'surface':
-            self._draw_sub_diamond_surface(surface, screen_vertices, sub_diamond.is_walkable, pixeloid_mult)
-        
-        # Draw edges with properties
-        self._draw_sub_diamond_edges(surface, screen_vertices, sub_diamond, pixeloid_mult, sprite_x, sprite_y, scaled_bbox)
+        return screen_vertices
     
     def _draw_sub_diamond_surface(self, surface, screen_vertices, is_walkable, pixeloid_mult):
         """Fill the sub-diamond surface based on walkability"""
+        area_width, area_height = surface.get_size()
         if is_walkable is None:
             return  # No fill for None state
         
@@ -1226,30 +1401,25 @@ class SpriteRenderer:
             screen_vertices['W']   # West
         ]
         
-        # Filter points that are within drawing area
-        valid_points = []
-        for x, y in points:
-            if 0 <= x < self.DRAWING_AREA_WIDTH and 0 <= y < self.DRAWING_AREA_HEIGHT:
-                valid_points.append((x, y))
+        # Skip polygons entirely outside the surface; partly visible ones are clipped by pygame
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        if max(xs) < 0 or min(xs) >= area_width or max(ys) < 0 or min(ys) >= area_height:
+            return
         
-        if len(valid_points) >= 3:  # Need at least 3 points for a polygon
-            # Choose color based on walkability
-            if is_walkable:
-                color = (0, 255, 0, 100)  # Green with transparency
-            else:
-                color = (255, 0, 0, 100)  # Red with transparency
-            
-            # Create a temporary surface for alpha blending
-            temp_surface = pygame.Surface((self.DRAWING_AREA_WIDTH, self.DRAWING_AREA_HEIGHT))
-            temp_surface.set_alpha(100)
-            temp_surface.fill((0, 0, 0))
-            temp_surface.set_colorkey((0, 0, 0))
-            
-            pygame.draw.polygon(temp_surface, color[:3], valid_points)
-            surface.blit(temp_surface, (0, 0))
+        # Choose color based on walkability
+        if is_walkable:
+            color = (0, 255, 0, 100)  # Green with transparency
+        else:
+            color = (255, 0, 0, 100)  # Red with transparency
+        
+        # Drawn with its alpha straight into the layer, blended when the layer is composited
+        pygame.draw.polygon(surface, color, points)
     
     def _draw_sub_diamond_edges(self, surface, screen_vertices, sub_diamond, pixeloid_mult, sprite_x, sprite_y, scaled_bbox):
         """Draw sub-diamond edges with pixeloid-perfect rendering using the same approach as diamond lines"""
+        origin_x, origin_y = sprite_x + scaled_bbox.x, sprite_y + scaled_bbox.y
+        bounds = self._visible_point_bounds(origin_x, origin_y, pixeloid_mult, surface.get_size())
         
         # Define edge connections and their property names
         edges = [
@@ -1288,19 +1458,14 @@ class SpriteRenderer:
             # Get bbox-relative coordinates
             start_pos = bbox_rel_vertices[start_vertex]
             end_pos = bbox_rel_vertices[end_vertex]
+            if not self._segment_visible(start_pos, end_pos, bounds):
+                continue
             
             # Trace pixeloid line between vertices (same as diamond lines)
             line_points = self._trace_pixeloid_line(start_pos[0], start_pos[1], end_pos[0], end_pos[1])
             
             # Draw each point as a pixeloid square (same coordinate system as diamond lines)
-            for rel_x, rel_y in line_points:
-                screen_x = sprite_x + scaled_bbox.x + rel_x * pixeloid_mult
-                screen_y = sprite_y + scaled_bbox.y + rel_y * pixeloid_mult
-                
-                # Only draw if within drawing area bounds
-                if (screen_x >= 0 and screen_x < self.DRAWING_AREA_WIDTH and
-                    screen_y >= 0 and screen_y < self.DRAWING_AREA_HEIGHT):
-                    pygame.draw.rect(surface, color, (screen_x, screen_y, pixeloid_mult, pixeloid_mult))
+            self._fill_visible_pixeloids(surface, line_points, origin_x, origin_y, pixeloid_mult, color)
     
     def _get_los_color(self, blocks_line_of_sight):
         """Get color for line of sight property"""
@@ -1,8 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from typing import List, Dict, Optional, Tuple, Any
 from enum import Enum
+import itertools
 import json
+import os
+import weakref
 from pathlib import Path
+from diamond_geometry import diamond_geometry_points
+from schema_migrations import CURRENT_SCHEMA_VERSION, get_schema_version, migrate_sprite, migrate_diamond_info
 
 class AssetType(str, Enum):
     """
@@ -34,6 +39,9 @@ class EdgeProperty(str, Enum):
     TRANSPARENT = "transparent"
     PASSABLE = "passable"
 
+# Interned EdgeProperties instances keyed by (blocks_line_of_sight, blocks_movement, z_portal)
+_edge_properties_pool: Dict[Tuple[Optional[bool], Optional[bool], Optional[float]], 'EdgeProperties'] = {}
+
 class EdgeProperties(BaseModel):
     """
     Properties for an edge defining its interaction with game mechanics.
@@ -41,7 +49,13 @@ class EdgeProperties(BaseModel):
     Each edge can independently control line of sight, movement blocking,
     and z-level teleportation for fine-grained control over game mechanics
     like walls, windows, stairs, and elevators.
+    
+    Instances are immutable and interned, so every edge with the same settings (across all
+    sub-diamonds and frames) shares one instance. Edits go through SubDiamondData.update_edge,
+    which swaps in the interned instance for the new settings (copy-on-write).
     """
+    model_config = ConfigDict(frozen=True)
+    
     blocks_line_of_sight: Optional[bool] = Field(
         default=None,
         description="Whether this edge blocks line of sight (None=unset, True=blocks, False=transparent)"
@@ -73,12 +87,36 @@ class EdgeProperties(BaseModel):
         """Check if this edge has a z-portal"""
         return self.z_portal is not None
     
+    @classmethod
+    def intern(cls, blocks_line_of_sight: Optional[bool] = None, blocks_movement: Optional[bool] = None,
+               z_portal: Optional[float] = None) -> 'EdgeProperties':
+        """Get the shared instance for these settings"""
+        key = (blocks_line_of_sight, blocks_movement, z_portal)
+        edge = _edge_properties_pool.get(key)
+        if edge is None:
+            edge = cls(blocks_line_of_sight=blocks_line_of_sight, blocks_movement=blocks_movement, z_portal=z_portal)
+            _edge_properties_pool[key] = edge
+        return edge
+    
+    def with_changes(self, **changes: Any) -> 'EdgeProperties':
+        """Get the shared instance for these settings with some of them changed"""
+        values = {
+            'blocks_line_of_sight': self.blocks_line_of_sight,
+            'blocks_movement': self.blocks_movement,
+            'z_portal': self.z_portal,
+        }
+        values.update(changes)
+        return EdgeProperties.intern(**values)
+    
     def get_portal_info(self) -> str:
         """Get human-readable portal information"""
         if self.z_portal is None:
             return "No Portal"
         return f"Portal → Z:{self.z_portal:.1f}"
 
+# Interned Point instances keyed by (x, y); entries drop out once nothing references them
+_point_pool: 'weakref.WeakValueDictionary[Tuple[int, int], Point]' = weakref.WeakValueDictionary()
+
 class Point(BaseModel):
     """
     A 2D point representing a pixel coordinate in the sprite analysis.
@@ -86,7 +124,12 @@ class Point(BaseModel):
     Used throughout the diamond tile analysis to mark significant geometric features
     such as contact points where the diamond touches edges, vertices of isometric lines,
     and boundaries of convex hull regions.
+    
+    Points are immutable. Loaded and analyzed geometry goes through Point.intern, so equal
+    coordinates (sub-diamond corners, shared midpoints, line and hull points) share one instance.
     """
+    model_config = ConfigDict(frozen=True)
+    
     x: int = Field(..., description="Horizontal pixel coordinate (0-based, left to right)")
     y: int = Field(..., description="Vertical pixel coordinate (0-based, top to bottom)")
     
@@ -99,6 +142,16 @@ class Point(BaseModel):
         if not isinstance(other, Point):
             return False
         return self.x == other.x and self.y == other.y
+    
+    @classmethod
+    def intern(cls, x: int, y: int) -> 'Point':
+        """Get the shared instance for these coordinates"""
+        key = (int(x), int(y))
+        point = _point_pool.get(key)
+        if point is None:
+            point = cls(x=key[0], y=key[1])
+            _point_pool[key] = point
+        return point
 
 class SubDiamondData(BaseModel):
     """
@@ -109,16 +162,12 @@ class SubDiamondData(BaseModel):
     
     Sub-diamonds are proper diamond shapes with 4 vertices, just like the main diamond.
     Each has its own edge properties for the 4 edges of the diamond.
+    
+    Only gameplay properties are stored. The vertices and center are derived on demand
+    from the parent GameplayDiamondData, so they always follow the parent's current vertices.
     """
     quadrant: str = Field(..., description="Quadrant name: 'north', 'south', 'east', or 'west'")
     
-    # Vertices defining this sub-diamond (proper diamond shape with 4 corners)
-    north_vertex: Point = Field(..., description="North corner of this sub-diamond")
-    south_vertex: Point = Field(..., description="South corner of this sub-diamond")
-    east_vertex: Point = Field(..., description="East corner of this sub-diamond")
-    west_vertex: Point = Field(..., description="West corner of this sub-diamond")
-    center: Point = Field(..., description="Center point of this sub-diamond")
-    
     # Gameplay properties
     is_walkable: Optional[bool] = Field(
         default=None,
@@ -127,21 +176,64 @@ class SubDiamondData(BaseModel):
     
     # Edge properties for this sub-diamond's 4 edges
     north_west_edge: EdgeProperties = Field(
-        default_factory=EdgeProperties,
+        default_factory=EdgeProperties.intern,
         description="Properties for the north-west edge of this sub-diamond"
     )
     north_east_edge: EdgeProperties = Field(
-        default_factory=EdgeProperties,
+        default_factory=EdgeProperties.intern,
         description="Properties for the north-east edge of this sub-diamond"
     )
     south_west_edge: EdgeProperties = Field(
-        default_factory=EdgeProperties,
+        default_factory=EdgeProperties.intern,
         description="Properties for the south-west edge of this sub-diamond"
     )
     south_east_edge: EdgeProperties = Field(
-        default_factory=EdgeProperties,
+        default_factory=EdgeProperties.intern,
         description="Properties for the south-east edge of this sub-diamond"
     )
+    
+    # Weak reference to the owning GameplayDiamondData (set by the parent, never serialized)
+    _parent_ref: Optional[weakref.ref] = PrivateAttr(default=None)
+    
+    def _geometry(self) -> Dict[str, Point]:
+        """Derived vertices and center of this quadrant from the parent diamond"""
+        parent = self._parent_ref() if self._parent_ref is not None else None
+        if parent is None:
+            raise ValueError(f"Sub-diamond '{self.quadrant}' is not attached to a parent diamond")
+        return parent.get_sub_diamond_geometry(self.quadrant)
+    
+    @property
+    def north_vertex(self) -> Point:
+        return self._geometry()['north']
+    
+    @property
+    def south_vertex(self) -> Point:
+        return self._geometry()['south']
+    
+    @property
+    def east_vertex(self) -> Point:
+        return self._geometry()['east']
+    
+    @property
+    def west_vertex(self) -> Point:
+        return self._geometry()['west']
+    
+    @property
+    def center(self) -> Point:
+        return self._geometry()['center']
+    
+    def update_edge(self, edge_attr: str, **changes: Any) -> EdgeProperties:
+        """Change one edge (e.g. 'north_east_edge'), leaving the shared instance other frames use untouched"""
+        edge = getattr(self, edge_attr).with_changes(**changes)
+        setattr(self, edge_attr, edge)
+        return edge
+    
+    def copy_properties_from(self, source: 'SubDiamondData', edge_mapping: Optional[Dict[str, str]] = None):
+        """Share another sub-diamond's walkability and edges, edge_mapping maps source to target edge names"""
+        self.is_walkable = source.is_walkable
+        for edge_attr in ('north_west_edge', 'north_east_edge', 'south_west_edge', 'south_east_edge'):
+            target_attr = edge_mapping.get(edge_attr, edge_attr) if edge_mapping else edge_attr
+            setattr(self, target_attr, getattr(source, edge_attr))
 
 class BoundingBox(BaseModel):
     """
@@ -206,6 +298,62 @@ class GameplayDiamondData(BaseModel):
         description="4 sub-diamond quadrants (north, south, east, west) for granular game mechanics"
     )
     
+    # Derived sub-diamond geometry, keyed by the vertex coordinates it was computed from
+    _sub_diamond_geometry: Optional[Tuple[Tuple[int, ...], Dict[str, Dict[str, Point]]]] = PrivateAttr(default=None)
+    
+    def model_post_init(self, __context: Any):
+        self._link_sub_diamonds()
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == 'sub_diamonds':
+            self._link_sub_diamonds()
+    
+    def __copy__(self):
+        # Give the copy its own sub-diamonds so each diamond derives geometry from its own vertices
+        copied = super().__copy__()
+        copied.sub_diamonds = {quadrant: sub.model_copy() for quadrant, sub in self.sub_diamonds.items()}
+        return copied
+    
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None):
+        copied = super().__deepcopy__(memo)
+        copied._link_sub_diamonds()
+        return copied
+    
+    def _link_sub_diamonds(self):
+        """Point every sub-diamond back at this diamond for geometry lookups"""
+        parent_ref = weakref.ref(self)
+        for sub_diamond in self.sub_diamonds.values():
+            sub_diamond._parent_ref = parent_ref
+    
+    def add_sub_diamond(self, sub_diamond: SubDiamondData):
+        """Attach a sub-diamond under its quadrant name"""
+        sub_diamond._parent_ref = weakref.ref(self)
+        self.sub_diamonds[sub_diamond.quadrant] = sub_diamond
+    
+    def get_sub_diamond_geometry(self, quadrant: str) -> Dict[str, Point]:
+        """Get the north/south/east/west vertices and center of a quadrant, recomputed only when vertices move"""
+        key = (self.north_vertex.x, self.north_vertex.y, self.south_vertex.x, self.south_vertex.y,
+               self.east_vertex.x, self.east_vertex.y, self.west_vertex.x, self.west_vertex.y)
+        cached = self._sub_diamond_geometry
+        if cached is None or cached[0] != key:
+            cached = (key, self._compute_sub_diamond_geometry())
+            self._sub_diamond_geometry = cached
+        return cached[1][quadrant]
+    
+    def _compute_sub_diamond_geometry(self) -> Dict[str, Dict[str, Point]]:
+        """Derive all 4 quadrant diamonds from the current main vertices"""
+        # Midpoints always follow the current vertices, so manual vertex moves never leave them stale
+        geometry = diamond_geometry_points(*self._vertex_tuples())
+        return {
+            quadrant: {name: Point.intern(x, y) for name, (x, y) in corners.items()}
+            for quadrant, corners in geometry['sub_diamonds'].items()
+        }
+    
+    def _vertex_tuples(self) -> Tuple[Tuple[int, int], ...]:
+        """Main vertices as (x, y) tuples in north, south, east, west order"""
+        return tuple((vertex.x, vertex.y) for vertex in (self.north_vertex, self.south_vertex, self.east_vertex, self.west_vertex))
+    
     @classmethod
     def from_single_diamond(cls, single_diamond: SingleDiamondData) -> 'GameplayDiamondData':
         """Create gameplay diamond from existing SingleDiamondData"""
@@ -238,96 +386,20 @@ class GameplayDiamondData(BaseModel):
         # Calculate midpoints if they don't exist
         self._ensure_midpoints_calculated()
         
-        if not all([self.north_east_midpoint, self.east_south_midpoint,
-                   self.south_west_midpoint, self.west_north_midpoint]):
-            return
-        
-        # Type assertions - we know these are not None due to the check above
-        assert self.north_east_midpoint is not None
-        assert self.east_south_midpoint is not None
-        assert self.south_west_midpoint is not None
-        assert self.west_north_midpoint is not None
-            
-        # Calculate the true geometric center of the main diamond (intersection of diagonals)
-        true_center = Point(
-            x=(self.north_vertex.x + self.south_vertex.x) // 2,
-            y=(self.north_vertex.y + self.south_vertex.y) // 2
-        )
-        
-        # Create sub-diamonds for each quadrant - each is a proper diamond with 4 vertices
+        # Geometry is derived from the main vertices, so only the gameplay properties are created here
         self.sub_diamonds = {
-            'north': SubDiamondData(
-                quadrant='north',
-                north_vertex=self.north_vertex,          # Main vertex (tip of the quadrant)
-                south_vertex=true_center,                # True center of main diamond
-                east_vertex=self.north_east_midpoint,    # Midpoint to east
-                west_vertex=self.west_north_midpoint,    # Midpoint to west
-                center=Point(  # Center of this sub-diamond
-                    x=(self.north_vertex.x + true_center.x) // 2,
-                    y=(self.north_vertex.y + true_center.y) // 2
-                )
-            ),
-            'south': SubDiamondData(
-                quadrant='south',
-                north_vertex=true_center,               # True center of main diamond
-                south_vertex=self.south_vertex,         # Main vertex (tip of the quadrant)
-                east_vertex=self.east_south_midpoint,   # Midpoint to east
-                west_vertex=self.south_west_midpoint,   # Midpoint to west
-                center=Point(  # Center of this sub-diamond
-                    x=(self.south_vertex.x + true_center.x) // 2,
-                    y=(self.south_vertex.y + true_center.y) // 2
-                )
-            ),
-            'east': SubDiamondData(
-                quadrant='east',
-                north_vertex=self.north_east_midpoint,  # Midpoint to north
-                south_vertex=self.east_south_midpoint,  # Midpoint to south
-                east_vertex=self.east_vertex,           # Main vertex (tip of the quadrant)
-                west_vertex=true_center,                # True center of main diamond
-                center=Point(  # Center of this sub-diamond
-                    x=(self.east_vertex.x + true_center.x) // 2,
-                    y=(self.east_vertex.y + true_center.y) // 2
-                )
-            ),
-            'west': SubDiamondData(
-                quadrant='west',
-                north_vertex=self.west_north_midpoint,  # Midpoint to north
-                south_vertex=self.south_west_midpoint,  # Midpoint to south
-                east_vertex=true_center,                # True center of main diamond
-                west_vertex=self.west_vertex,           # Main vertex (tip of the quadrant)
-                center=Point(  # Center of this sub-diamond
-                    x=(self.west_vertex.x + true_center.x) // 2,
-                    y=(self.west_vertex.y + true_center.y) // 2
-                )
-            )
+            quadrant: SubDiamondData(quadrant=quadrant)
+            for quadrant in ('north', 'south', 'east', 'west')
         }
     
     def _ensure_midpoints_calculated(self):
         """Ensure midpoints are calculated between diamond vertices"""
-        # Calculate midpoints if they don't exist
-        if not self.north_east_midpoint:
-            self.north_east_midpoint = Point(
-                x=(self.north_vertex.x + self.east_vertex.x) // 2,
-                y=(self.north_vertex.y + self.east_vertex.y) // 2
-            )
-        
-        if not self.east_south_midpoint:
-            self.east_south_midpoint = Point(
-                x=(self.east_vertex.x + self.south_vertex.x) // 2,
-                y=(self.east_vertex.y + self.south_vertex.y) // 2
-            )
-        
-        if not self.south_west_midpoint:
-            self.south_west_midpoint = Point(
-                x=(self.south_vertex.x + self.west_vertex.x) // 2,
-                y=(self.south_vertex.y + self.west_vertex.y) // 2
-            )
-        
-        if not self.west_north_midpoint:
-            self.west_north_midpoint = Point(
-                x=(self.west_vertex.x + self.north_vertex.x) // 2,
-                y=(self.west_vertex.y + self.north_vertex.y) // 2
-            )
+        if self.north_east_midpoint and self.east_south_midpoint and self.south_west_midpoint and self.west_north_midpoint:
+            return
+        midpoints = diamond_geometry_points(*self._vertex_tuples())['midpoints']
+        for name, (x, y) in midpoints.items():
+            if not getattr(self, f"{name}_midpoint"):
+                setattr(self, f"{name}_midpoint", Point.intern(x, y))
     
     def ensure_sub_diamonds_initialized(self):
         """Public method to ensure sub-diamonds are properly initialized"""
@@ -400,11 +472,12 @@ class GameplayDiamondData(BaseModel):
             sub_diamond = self.sub_diamonds[quadrant]
             edge_attr = f"{edge}_edge"
             if hasattr(sub_diamond, edge_attr):
-                edge_props = getattr(sub_diamond, edge_attr)
+                changes = {}
                 if blocks_line_of_sight is not None:
-                    edge_props.blocks_line_of_sight = blocks_line_of_sight
+                    changes['blocks_line_of_sight'] = blocks_line_of_sight
                 if blocks_movement is not None:
-                    edge_props.blocks_movement = blocks_movement
+                    changes['blocks_movement'] = blocks_movement
+                sub_diamond.update_edge(edge_attr, **changes)
 
 class DiamondInfo(BaseModel):
     """
@@ -586,6 +659,9 @@ class DetailedAnalysis(BaseModel):
         description="Enhanced analysis data in original sprite coordinates, supporting two-diamond structure analysis"
     )
 
+# Source of SpriteData render versions, unique across sprites and models
+_sprite_render_versions = itertools.count(1)
+
 class SpriteData(BaseModel):
     """
     Complete analysis data for a single diamond tile sprite within the spritesheet.
@@ -637,6 +713,84 @@ class SpriteData(BaseModel):
         description="User-defined custom keypoints with arbitrary names for prop attachment, interaction zones, etc."
     )
     
+    # Deferred diamond_info location (path, byte start, byte length, file stamp) when opened from a sprite index
+    _lazy_diamond_info: Optional[Tuple[str, int, int, Tuple[int, int]]] = PrivateAttr(default=None)
+    _lazy_has_sub_diamonds: bool = PrivateAttr(default=False)
+    # Schema version of the file the deferred diamond_info is read from, migrated when it is read
+    _lazy_schema_version: int = PrivateAttr(default=CURRENT_SCHEMA_VERSION)
+    # Changes whenever the sprite's drawn state changes (see touch), so display caches compare it instead of clearing
+    _render_version: int = PrivateAttr(default_factory=lambda: next(_sprite_render_versions))
+    
+    @property
+    def render_version(self) -> int:
+        """Version of the sprite's analysis and edit state for render caches"""
+        return self._render_version
+    
+    def touch(self):
+        """Record a change to the sprite so cached renders of it go stale"""
+        self._render_version = next(_sprite_render_versions)
+    
+    def __getattr__(self, item: str) -> Any:
+        # diamond_info is removed from __dict__ while deferred, so the first access lands here
+        if item == 'diamond_info' and self.__pydantic_private__ and self.__pydantic_private__.get('_lazy_diamond_info'):
+            diamond_data = self.read_deferred_diamond_info()
+            diamond_info = SpritesheetModel._import_diamond_info(diamond_data) if diamond_data else None
+            self.__dict__['diamond_info'] = diamond_info
+            self._lazy_diamond_info = None
+            return diamond_info
+        return super().__getattr__(item)
+    
+    def defer_diamond_info(self, path: str, start: int, length: int, stamp: Tuple[int, int], has_sub_diamonds: bool = False,
+                           schema_version: int = CURRENT_SCHEMA_VERSION):
+        """Leave diamond_info on disk until first access"""
+        self.__dict__.pop('diamond_info', None)
+        self._lazy_diamond_info = (str(path), start, length, tuple(stamp))
+        self._lazy_has_sub_diamonds = has_sub_diamonds
+        self._lazy_schema_version = schema_version
+    
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """Dump the sprite, loading a deferred diamond_info first so it is not left out"""
+        if not self.is_diamond_info_loaded():
+            self.diamond_info
+        return super().model_dump(**kwargs)
+    
+    def model_dump_json(self, **kwargs) -> str:
+        """JSON dump of the sprite, loading a deferred diamond_info first so it is not left out"""
+        if not self.is_diamond_info_loaded():
+            self.diamond_info
+        return super().model_dump_json(**kwargs)
+    
+    def is_diamond_info_loaded(self) -> bool:
+        """Check whether diamond_info is in memory (True for sprites that were never deferred)"""
+        return 'diamond_info' in self.__dict__
+    
+    def read_deferred_diamond_info(self) -> Optional[Dict[str, Any]]:
+        """Read the clean-format diamond_info dict (migrated to the current schema) for a deferred sprite without materializing it"""
+        path, start, length, stamp = self._lazy_diamond_info
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime_ns) != stamp:
+            # The byte range is only valid for the file as it was opened; read the sprite from a full parse instead
+            return _read_reparsed_diamond_info(path, self.sprite_index)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return migrate_diamond_info(json.loads(f.read(length)), self._lazy_schema_version)
+    
+    def has_diamond_info(self) -> bool:
+        """Check for diamond data without forcing a deferred load"""
+        if self.is_diamond_info_loaded():
+            return self.__dict__['diamond_info'] is not None
+        return self._lazy_diamond_info is not None
+    
+    def has_sub_diamond_data(self) -> bool:
+        """Check whether any diamond layer carries sub-diamonds, without forcing a deferred load"""
+        if not self.is_diamond_info_loaded():
+            return self._lazy_diamond_info is not None and self._lazy_has_sub_diamonds
+        diamond_info = self.diamond_info
+        if not diamond_info:
+            return False
+        layers = [diamond_info.lower_diamond, diamond_info.upper_diamond] + list(diamond_info.extra_diamonds.values())
+        return any(layer and layer.sub_diamonds for layer in layers)
+    
     def get_sprite_rect(self, spritesheet_model: 'SpritesheetModel') -> Tuple[int, int, int, int]:
         """Get the rectangle coordinates for this sprite in the spritesheet"""
         row = self.sprite_index // spritesheet_model.cols
@@ -669,6 +823,100 @@ class SpriteData(BaseModel):
             'right': self.original_size[0] - (self.bbox.x + self.bbox.width)
         }
 
+# Source of SpritesheetModel._cache_token values
+_model_cache_tokens = itertools.count(1)
+
+class ManualVertexStore:
+    """
+    Manual vertex overrides indexed by sprite, diamond layer and vertex name.
+    
+    Every change bumps a store-wide version and records it as the sprite's version,
+    so render caches and exports can compare a number instead of rehashing the overrides.
+    Mappings returned by the getters are live views and must not be mutated directly.
+    """
+    
+    def __init__(self):
+        self._vertices: Dict[int, Dict[str, Dict[str, Tuple[int, int]]]] = {}
+        self._sprite_versions: Dict[int, int] = {}
+        self.version = 0
+    
+    def _touch(self, sprite_index: int):
+        self.version += 1
+        self._sprite_versions[sprite_index] = self.version
+    
+    def sprite_version(self, sprite_index: int) -> int:
+        """Version of the last change to a sprite's overrides (0 if never changed)"""
+        return self._sprite_versions.get(sprite_index, 0)
+    
+    def get(self, sprite_index: int, layer: str, vertex: str) -> Optional[Tuple[int, int]]:
+        """Get one override, or None if the vertex uses its algorithmic position"""
+        return self._vertices.get(sprite_index, {}).get(layer, {}).get(vertex)
+    
+    def get_layer(self, sprite_index: int, layer: str) -> Dict[str, Tuple[int, int]]:
+        """Get the overrides of one diamond layer of a sprite"""
+        return self._vertices.get(sprite_index, {}).get(layer, {})
+    
+    def get_sprite(self, sprite_index: int) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        """Get all layer overrides of a sprite"""
+        return self._vertices.get(sprite_index, {})
+    
+    def has_sprite(self, sprite_index: int) -> bool:
+        """Check whether a sprite has any overrides"""
+        return bool(self._vertices.get(sprite_index))
+    
+    def sprite_indices(self) -> List[int]:
+        """Sprites that have overrides"""
+        return list(self._vertices.keys())
+    
+    def items(self):
+        """Iterate (sprite_index, layer overrides) pairs"""
+        return self._vertices.items()
+    
+    def set(self, sprite_index: int, layer: str, vertex: str, position: Tuple[int, int]):
+        """Override one vertex position"""
+        self._vertices.setdefault(sprite_index, {}).setdefault(layer, {})[vertex] = (int(position[0]), int(position[1]))
+        self._touch(sprite_index)
+    
+    def update_layer(self, sprite_index: int, layer: str, vertices: Dict[str, Tuple[int, int]]):
+        """Override several vertices of one diamond layer"""
+        layer_vertices = self._vertices.setdefault(sprite_index, {}).setdefault(layer, {})
+        for vertex, position in vertices.items():
+            layer_vertices[vertex] = (int(position[0]), int(position[1]))
+        self._touch(sprite_index)
+    
+    def remove(self, sprite_index: int, layer: str, vertex: str) -> bool:
+        """Remove one override, dropping empty layers and sprites"""
+        sprite_vertices = self._vertices.get(sprite_index, {})
+        layer_vertices = sprite_vertices.get(layer, {})
+        if vertex not in layer_vertices:
+            return False
+        del layer_vertices[vertex]
+        if not layer_vertices:
+            del sprite_vertices[layer]
+        if not sprite_vertices:
+            del self._vertices[sprite_index]
+        self._touch(sprite_index)
+        return True
+    
+    def clear_sprite(self, sprite_index: int) -> bool:
+        """Remove all overrides of a sprite"""
+        if sprite_index not in self._vertices:
+            return False
+        del self._vertices[sprite_index]
+        self._touch(sprite_index)
+        return True
+    
+    def clear(self):
+        """Remove every override"""
+        for sprite_index in list(self._vertices):
+            self.clear_sprite(sprite_index)
+    
+    def __len__(self) -> int:
+        return len(self._vertices)
+    
+    def __repr__(self) -> str:
+        return f"ManualVertexStore(version={self.version}, vertices={self._vertices})"
+
 class SpritesheetModel(BaseModel):
     """
     Complete model for analyzing diamond tile spritesheets.
@@ -750,6 +998,40 @@ class SpritesheetModel(BaseModel):
         description="Vertical pan offset for UI viewport"
     )
     
+    # Dirty tracking for incremental journal saves: sprite index -> touched layers ('*' = whole sprite)
+    _dirty_sprites: Dict[int, set] = PrivateAttr(default_factory=dict)
+    _header_dirty: bool = PrivateAttr(default=False)
+    # Distinguishes models in display caches shared by several open sheets
+    _cache_token: int = PrivateAttr(default_factory=lambda: next(_model_cache_tokens))
+    # Bumped on sheet-wide changes that affect how every sprite is drawn (see touch_settings)
+    _settings_version: int = PrivateAttr(default=0)
+    # Manual vertex overrides edited in the UI and applied on export
+    _manual_vertices: ManualVertexStore = PrivateAttr(default_factory=ManualVertexStore)
+    # Deferred sprites whose vertices still need copying into the manual vertex store
+    _deferred_vertex_transfer: set = PrivateAttr(default_factory=set)
+    # Bit-packed gameplay tables per diamond layer, and sprite rows changed since each was packed
+    _packed_gameplay: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _packed_gameplay_stale: Dict[str, set] = PrivateAttr(default_factory=dict)
+    
+    @property
+    def cache_token(self) -> int:
+        """Unique id of this model instance for display caches"""
+        return self._cache_token
+    
+    @property
+    def settings_version(self) -> int:
+        """Version of the sheet-wide analysis settings for render caches"""
+        return self._settings_version
+    
+    def touch_settings(self):
+        """Record a sheet-wide settings change so cached renders of every sprite go stale"""
+        self._settings_version += 1
+    
+    @property
+    def manual_vertices(self) -> ManualVertexStore:
+        """Manual vertex overrides per sprite and diamond layer"""
+        return self._manual_vertices
+    
     def initialize_sprites(self):
         """Initialize the sprites list based on grid dimensions"""
         self.sprites = []
@@ -762,6 +1044,95 @@ class SpritesheetModel(BaseModel):
             )
             self.sprites.append(sprite_data)
     
+    def mark_sprite_dirty(self, sprite_index: int, layer: Optional[str] = None):
+        """Record that a sprite (or one of its diamond layers) changed since the last save, staling its cached renders"""
+        if 0 <= sprite_index < len(self.sprites):
+            self.sprites[sprite_index].touch()
+            self._dirty_sprites.setdefault(sprite_index, set()).add(layer or '*')
+            for stale_rows in self._packed_gameplay_stale.values():
+                stale_rows.add(sprite_index)
+    
+    def mark_all_sprites_dirty(self):
+        """Record that every sprite changed, e.g. after a global settings update"""
+        for sprite in self.sprites:
+            self.mark_sprite_dirty(sprite.sprite_index)
+    
+    def mark_header_dirty(self):
+        """Record that spritesheet-level settings changed since the last save"""
+        self._header_dirty = True
+    
+    def has_unsaved_changes(self) -> bool:
+        """Check whether any sprite or header changes are waiting to be saved"""
+        return self._header_dirty or bool(self._dirty_sprites)
+    
+    def get_dirty_layers(self, sprite_index: int) -> set:
+        """Get the layers touched on a sprite since the last save"""
+        return set(self._dirty_sprites.get(sprite_index, set()))
+    
+    def clear_dirty(self):
+        """Forget dirty state after a full save"""
+        self._dirty_sprites = {}
+        self._header_dirty = False
+    
+    def collect_journal_deltas(self) -> List[Dict[str, Any]]:
+        """Export clean-format deltas for dirty sprites only and clear dirty state (see restore_dirty for failed writes)"""
+        records: List[Dict[str, Any]] = []
+        if self._header_dirty:
+            records.append({'header': self._export_header_data()})
+        
+        for sprite_index in sorted(self._dirty_sprites):
+            records.append({
+                'layers': sorted(self._dirty_sprites[sprite_index]),
+                'sprite': self._export_sprite_data(self.sprites[sprite_index])
+            })
+        
+        self.clear_dirty()
+        return records
+    
+    def restore_dirty(self, records: List[Dict[str, Any]]):
+        """Mark the header and sprites of journal records dirty again, for records that failed to be written"""
+        for record in records:
+            if 'header' in record:
+                self._header_dirty = True
+            if 'sprite' in record:
+                sprite_index = record['sprite']['sprite_index']
+                self._dirty_sprites.setdefault(sprite_index, set()).update(record.get('layers') or ['*'])
+    
+    def get_packed_gameplay(self, layer: str = 'lower'):
+        """Get the bit-packed gameplay table for a diamond layer, repacking only sprites changed since last use"""
+        from gameplay_encoding import PackedGameplayLayer
+        
+        packed = self._packed_gameplay.get(layer)
+        if packed is None or packed.sprite_count != len(self.sprites):
+            packed = PackedGameplayLayer.from_sprites(layer, self.sprites)
+        else:
+            for sprite_index in sorted(self._packed_gameplay_stale.get(layer, ())):
+                packed.pack_sprite(self.sprites[sprite_index])
+        
+        self._packed_gameplay[layer] = packed
+        self._packed_gameplay_stale[layer] = set()
+        return packed
+    
+    def has_lazy_sprites(self) -> bool:
+        """Check whether any sprite still has its diamond_info deferred on disk"""
+        return any(not sprite.is_diamond_info_loaded() for sprite in self.sprites)
+    
+    def ensure_all_sprites_loaded(self):
+        """Materialize every deferred diamond_info"""
+        for sprite in self.sprites:
+            if not sprite.is_diamond_info_loaded():
+                sprite.diamond_info
+    
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """Dump the model; nested sprites are serialized directly, so deferred diamond_info is loaded first"""
+        self.ensure_all_sprites_loaded()
+        return super().model_dump(**kwargs)
+    
+    def model_dump_json(self, **kwargs) -> str:
+        """JSON dump of the model, loading deferred diamond_info first like model_dump"""
+        self.ensure_all_sprites_loaded()
+        return super().model_dump_json(**kwargs)
+    
     def get_current_sprite(self) -> Optional[SpriteData]:
         """Get the currently selected sprite data"""
         if 0 <= self.current_sprite_index < len(self.sprites):
@@ -795,6 +1166,7 @@ class SpritesheetModel(BaseModel):
         """Set frame-specific upper Z offset for a sprite"""
         if 0 <= sprite_index < len(self.sprites):
             self.sprites[sprite_index].frame_upper_z_offset = max(0, z_offset)
+            self.mark_sprite_dirty(sprite_index)
             # Clear analysis data for this sprite
             sprite = self.sprites[sprite_index]
             sprite.pixel_count = None
@@ -819,6 +1191,9 @@ class SpritesheetModel(BaseModel):
             sprite.bbox = None
             sprite.diamond_info = None
             sprite.detailed_analysis = None
+        self.touch_settings()
+        self.mark_header_dirty()
+        self.mark_all_sprites_dirty()
     
     def get_analysis_summary(self) -> Dict[str, Any]:
         """Get a summary of analysis results for all sprites"""
@@ -841,18 +1216,88 @@ class SpritesheetModel(BaseModel):
             'upper_lines_midpoint_mode': self.upper_lines_midpoint_mode
         }
     
-    def save_to_json(self, path: str):
-        """Save the model to a JSON file with clean essential data only"""
+    def save_runtime_tables(self, path: str) -> Dict[str, Any]:
+        """Save flat fixed-stride vertex, walkability, edge and portal tables for game engines"""
+        from runtime_export import write_runtime_tables
+        return write_runtime_tables(self, path)
+    
+    def save_to_json(self, path: str, compact: bool = False, compression: Optional[str] = None, write_index: bool = True):
+        """Save the model to a JSON file with clean essential data only, streamed sprite by sprite"""
+        path_obj = Path(path)
+        compression = self._resolve_compression(path, compression)
+        
+        # Uncompressed files get a sidecar index so they can be reopened lazily
+        index = {} if write_index and compression == 'none' else None
+        if index is None:
+            # Deferred sprites cannot be re-pointed at a file without an index
+            self.ensure_all_sprites_loaded()
+        
+        # Write beside the target and swap in, so deferred sprites can still read the old file meanwhile
+        temp_path = path_obj.with_name(path_obj.name + '.tmp')
+        with self._open_export_stream(temp_path, compression) as f:
+            self.write_export_stream(f, compact=compact, index=index)
+        os.replace(temp_path, path_obj)
+        
+        if index is not None:
+            stamp = write_sprite_index(path_obj, index)
+            # Re-point sprites that are still deferred at their new byte ranges
+            for sprite, entry in zip(self.sprites, index['sprites']):
+                if not sprite.is_diamond_info_loaded() and entry.get('diamond_info'):
+                    start, length = entry['diamond_info']
+                    sprite.defer_diamond_info(path_obj, start, length, stamp, entry.get('has_sub_diamonds', False))
+        elif get_sprite_index_path(path_obj).exists():
+            get_sprite_index_path(path_obj).unlink()
+    
+    def write_export_stream(self, f, compact: bool = False, index: Optional[Dict[str, Any]] = None):
+        """Write the clean export schema to an open text handle one sprite at a time"""
+        # Only one sprite dict is alive at a time, so peak memory no longer scales with the sheet
+        sprite_dicts = (self._export_sprite_data(sprite) for sprite in self.sprites)
+        write_clean_export(f, self._export_header_data(), sprite_dicts, compact=compact, index=index)
+    
+    @staticmethod
+    def _resolve_compression(path: str, compression: Optional[str] = None) -> str:
+        """Resolve 'gzip', 'lzma' or 'none', inferring from the file extension when not given"""
+        if compression is None:
+            suffix = Path(path).suffix.lower()
+            if suffix == '.gz':
+                return 'gzip'
+            elif suffix in ('.xz', '.lzma'):
+                return 'lzma'
+            return 'none'
+        return compression
+    
+    @staticmethod
+    def _open_export_stream(path: str, compression: Optional[str] = None, mode: str = 'wt'):
+        """Open a text handle for an analysis file, optionally gzip or lzma compressed"""
         path_obj = Path(path)
-        with open(path_obj, 'w') as f:
-            # Create clean export data with only essential fields
-            data = self._create_clean_export_data()
-            json.dump(data, f, indent=2)
-    
-    def _create_clean_export_data(self) -> Dict[str, Any]:
-        """Create clean export data with only essential fields for procedural generation"""
-        # Start with core spritesheet properties
-        clean_data = {
+        compression = SpritesheetModel._resolve_compression(path, compression)
+        
+        if compression == 'gzip':
+            import gzip
+            return gzip.open(path_obj, mode, encoding='utf-8')
+        elif compression == 'lzma':
+            import lzma
+            return lzma.open(path_obj, mode, encoding='utf-8')
+        elif compression == 'none':
+            # No newline translation, so sprite index byte offsets match the file on every platform
+            return open(path_obj, mode[0], encoding='utf-8', newline='')
+        raise ValueError(f"Unsupported compression: {compression}")
+    
+    @staticmethod
+    def _detect_compression(path: str) -> Optional[str]:
+        """Detect gzip or lzma compression from the file's magic bytes"""
+        with open(path, 'rb') as f:
+            magic = f.read(6)
+        if magic[:2] == b'\x1f\x8b':
+            return 'gzip'
+        if magic == b'\xfd7zXZ\x00' or magic[:3] == b'\x5d\x00\x00':
+            return 'lzma'
+        return None
+    
+    def _export_header_data(self) -> Dict[str, Any]:
+        """Core spritesheet properties written ahead of the sprites list"""
+        return {
+            'schema_version': CURRENT_SCHEMA_VERSION,
             'image_path': self.image_path,
             'total_width': self.total_width,
             'total_height': self.total_height,
@@ -866,39 +1311,41 @@ class SpritesheetModel(BaseModel):
             'show_diamond_height': self.show_diamond_height,
             'show_overlay': self.show_overlay,
             'show_diamond_vertices': self.show_diamond_vertices,
-            'sprites': []
+        }
+    
+    def _export_sprite_data(self, sprite: SpriteData) -> Dict[str, Any]:
+        """Create clean sprite data (essential fields only)"""
+        clean_sprite = {
+            'sprite_index': sprite.sprite_index,
+            'original_size': sprite.original_size,
+            'asset_type': sprite.asset_type,
+            'frame_upper_z_offset': sprite.frame_upper_z_offset,
         }
         
-        # Add clean sprite data (essential fields only)
-        for sprite in self.sprites:
-            clean_sprite = {
-                'sprite_index': sprite.sprite_index,
-                'original_size': sprite.original_size,
-                'asset_type': sprite.asset_type,
-                'frame_upper_z_offset': sprite.frame_upper_z_offset,
-            }
-            
-            # Add essential computed data if available
-            if sprite.bbox:
-                clean_sprite['bbox'] = {
-                    'x': sprite.bbox.x,
-                    'y': sprite.bbox.y,
-                    'width': sprite.bbox.width,
-                    'height': sprite.bbox.height
-                }
-            
-            if sprite.diamond_info:
-                clean_sprite['diamond_info'] = self._export_diamond_info(sprite.diamond_info, sprite.sprite_index)
-            
-            # Always include custom keypoints (empty dict if none)
-            clean_sprite['custom_keypoints'] = {
-                name: {'x': point.x, 'y': point.y}
-                for name, point in sprite.custom_keypoints.items()
+        # Add essential computed data if available
+        if sprite.bbox:
+            clean_sprite['bbox'] = {
+                'x': sprite.bbox.x,
+                'y': sprite.bbox.y,
+                'width': sprite.bbox.width,
+                'height': sprite.bbox.height
             }
-            
-            clean_data['sprites'].append(clean_sprite)
         
-        return clean_data
+        if not sprite.is_diamond_info_loaded() and not self._manual_vertices.has_sprite(sprite.sprite_index):
+            # Untouched deferred sprite: copy its exported diamond_info straight from disk
+            diamond_data = sprite.read_deferred_diamond_info() if sprite.has_diamond_info() else None
+            if diamond_data:
+                clean_sprite['diamond_info'] = diamond_data
+        elif sprite.diamond_info:
+            clean_sprite['diamond_info'] = self._export_diamond_info(sprite.diamond_info, sprite.sprite_index)
+        
+        # Always include custom keypoints (empty dict if none)
+        clean_sprite['custom_keypoints'] = {
+            name: {'x': point.x, 'y': point.y}
+            for name, point in sprite.custom_keypoints.items()
+        }
+        
+        return clean_sprite
     
     def _export_diamond_info(self, diamond_info: DiamondInfo, sprite_index: int) -> Dict[str, Any]:
         """Export clean diamond info with vertices and midpoints"""
@@ -956,35 +1403,18 @@ class SpritesheetModel(BaseModel):
             'z_offset': calculated_z_offset
         }
         
-        # Compute midpoints using the correct vertex coordinates
-        exported['north_east_midpoint'] = {
-            'x': (vertices['north'][0] + vertices['east'][0]) // 2,
-            'y': (vertices['north'][1] + vertices['east'][1]) // 2
-        }
-        exported['east_south_midpoint'] = {
-            'x': (vertices['east'][0] + vertices['south'][0]) // 2,
-            'y': (vertices['east'][1] + vertices['south'][1]) // 2
-        }
-        exported['south_west_midpoint'] = {
-            'x': (vertices['south'][0] + vertices['west'][0]) // 2,
-            'y': (vertices['south'][1] + vertices['west'][1]) // 2
-        }
-        exported['west_north_midpoint'] = {
-            'x': (vertices['west'][0] + vertices['north'][0]) // 2,
-            'y': (vertices['west'][1] + vertices['north'][1]) // 2
-        }
+        # Compute midpoints from the correct vertex coordinates with the shared geometry kernel
+        midpoints = diamond_geometry_points(vertices['north'], vertices['south'], vertices['east'], vertices['west'])['midpoints']
+        for name, (x, y) in midpoints.items():
+            exported[f"{name}_midpoint"] = {'x': x, 'y': y}
         
         # Export sub-diamonds if present
         if diamond.sub_diamonds:
             exported['sub_diamonds'] = {}
             for quadrant, sub_diamond in diamond.sub_diamonds.items():
+                # Sub-diamond geometry is derived from the diamond's vertices, so only gameplay data is written
                 sub_exported = {
                     'quadrant': sub_diamond.quadrant,
-                    'north_vertex': {'x': sub_diamond.north_vertex.x, 'y': sub_diamond.north_vertex.y},
-                    'south_vertex': {'x': sub_diamond.south_vertex.x, 'y': sub_diamond.south_vertex.y},
-                    'east_vertex': {'x': sub_diamond.east_vertex.x, 'y': sub_diamond.east_vertex.y},
-                    'west_vertex': {'x': sub_diamond.west_vertex.x, 'y': sub_diamond.west_vertex.y},
-                    'center': {'x': sub_diamond.center.x, 'y': sub_diamond.center.y},
                     'is_walkable': sub_diamond.is_walkable
                 }
                 
@@ -1009,9 +1439,7 @@ class SpritesheetModel(BaseModel):
     
     def _get_export_vertex_coords(self, diamond: GameplayDiamondData, sprite_index: int, diamond_level: str) -> Dict[str, Tuple[int, int]]:
         """Get vertex coordinates for export, using manual overrides if present"""
-        # Access the renderer's manual vertices if available
-        manual_vertices = getattr(self, '_renderer_manual_vertices', {})
-        manual_overrides = manual_vertices.get(sprite_index, {}).get(diamond_level, {})
+        manual_overrides = self._manual_vertices.get_layer(sprite_index, diamond_level)
         
         # Map vertex names to coordinates
         vertices = {}
@@ -1031,84 +1459,6 @@ class SpritesheetModel(BaseModel):
         
         return vertices
     
-    def _compress_line_data_for_json(self, data: Dict[str, Any]):
-        """Compress line data to compact format for JSON serialization"""
-        if 'sprites' not in data:
-            return
-            
-        for sprite_data in data['sprites']:
-            if 'detailed_analysis' not in sprite_data or not sprite_data['detailed_analysis']:
-                continue
-                
-            detailed = sprite_data['detailed_analysis']
-            
-            # Compress IsometricAnalysis lines
-            if 'isometric_analysis' in detailed and detailed['isometric_analysis']:
-                iso_analysis = detailed['isometric_analysis']
-                
-                # Compress main lines to line_segments
-                if 'lines' in iso_analysis and iso_analysis['lines']:
-                    line_segments = {}
-                    for direction, points in iso_analysis['lines'].items():
-                        if points and len(points) >= 2:
-                            line_segments[direction] = [points[0], points[-1]]  # start, end
-                    iso_analysis['line_segments'] = line_segments
-                    del iso_analysis['lines']  # Remove full lines from JSON
-                
-                # Compress convex hulls to hull_bounds
-                if 'convex_hulls' in iso_analysis and iso_analysis['convex_hulls']:
-                    hull_bounds = {}
-                    for direction, hull_points in iso_analysis['convex_hulls'].items():
-                        if hull_points:
-                            min_x = min(p['x'] for p in hull_points)
-                            max_x = max(p['x'] for p in hull_points)
-                            min_y = min(p['y'] for p in hull_points)
-                            max_y = max(p['y'] for p in hull_points)
-                            hull_bounds[direction] = [
-                                {'x': min_x, 'y': min_y},
-                                {'x': max_x, 'y': max_y}
-                            ]
-                    iso_analysis['hull_bounds'] = hull_bounds
-                    del iso_analysis['convex_hulls']  # Remove full hulls from JSON
-                
-                # Remove legacy fields
-                if 'line_points' in iso_analysis:
-                    del iso_analysis['line_points']
-                if 'convex_hull_area' in iso_analysis:
-                    del iso_analysis['convex_hull_area']
-            
-            # Compress ContactPointsData lines
-            if 'contact_points_data' in detailed and detailed['contact_points_data']:
-                contact_data = detailed['contact_points_data']
-                
-                # Compress upper_line_data
-                if 'upper_line_data' in contact_data:
-                    self._compress_line_data_dict(contact_data['upper_line_data'])
-                
-                # Compress lower_line_data
-                if 'lower_line_data' in contact_data:
-                    self._compress_line_data_dict(contact_data['lower_line_data'])
-    
-    def _compress_line_data_dict(self, line_data: Dict[str, Any]):
-        """Compress a LineData dictionary"""
-        # Compress contact_points_mode
-        if 'contact_points_mode' in line_data and line_data['contact_points_mode']:
-            segments = {}
-            for direction, points in line_data['contact_points_mode'].items():
-                if points and len(points) >= 2:
-                    segments[direction] = [points[0], points[-1]]
-            line_data['contact_points_segments'] = segments
-            del line_data['contact_points_mode']
-        
-        # Compress midpoint_mode
-        if 'midpoint_mode' in line_data and line_data['midpoint_mode']:
-            segments = {}
-            for direction, points in line_data['midpoint_mode'].items():
-                if points and len(points) >= 2:
-                    segments[direction] = [points[0], points[-1]]
-            line_data['midpoint_segments'] = segments
-            del line_data['midpoint_mode']
-    
     def _convert_numpy_types(self, obj):
         """Recursively convert numpy types to Python types for JSON serialization"""
         import numpy as np
@@ -1127,21 +1477,67 @@ class SpritesheetModel(BaseModel):
             return obj
     
     @classmethod
-    def load_from_json(cls, path: str) -> 'SpritesheetModel':
-        """Load the model from a JSON file (new clean format only)"""
-        path_obj = Path(path)
-        with open(path_obj, 'r') as f:
+    def load_from_json(cls, path: str, replay_journal: bool = True, lazy: bool = True) -> 'SpritesheetModel':
+        """Load the model from a JSON file (clean format of any schema version, plain or gzip/lzma compressed)"""
+        from analysis_journal import get_journal_path, replay_journal as replay_journal_records
+        
+        # With a valid sprite index, open from the index alone and defer each diamond_info
+        if lazy and not (replay_journal and get_journal_path(path).exists()):
+            index = read_sprite_index(path)
+            if index is not None:
+                return cls._load_from_sprite_index(path, index)
+        
+        with cls._open_export_stream(path, cls._detect_compression(path) or 'none', mode='rt') as f:
             data = json.load(f)
         
+        # Recover autosaved edits that were not yet compacted into the full file
+        if replay_journal:
+            replayed = replay_journal_records(data, path)
+            if replayed:
+                print(f"[DEBUG] Replayed {replayed} autosave journal records onto {Path(path).name}")
+        
         # Create model from the clean data
         model = cls._load_from_clean_format(data)
         return model
     
+    @classmethod
+    def _load_from_sprite_index(cls, path: str, index: Dict[str, Any]) -> 'SpritesheetModel':
+        """Load header and per-sprite summaries from a sprite index, deferring diamond_info"""
+        model_data = cls._import_header_data(index['header'])
+        stamp = (index['source_size'], index['source_mtime_ns'])
+        schema_version = get_schema_version(index['header'])
+        
+        deferred_count = 0
+        for entry in index['sprites']:
+            sprite = cls._import_sprite_data(migrate_sprite(entry['summary'], schema_version),
+                                             diamond_info_deferred=bool(entry.get('diamond_info')))
+            if entry.get('diamond_info'):
+                start, length = entry['diamond_info']
+                # Older diamond_info is migrated when it is first read, not up front
+                sprite.defer_diamond_info(path, start, length, stamp, entry.get('has_sub_diamonds', False), schema_version)
+                deferred_count += 1
+            model_data['sprites'].append(sprite)
+        
+        print(f"[DEBUG] Opened {Path(path).name} from sprite index: diamond_info deferred for {deferred_count} sprites")
+        return cls(**model_data)
+    
     @classmethod
     def _load_from_clean_format(cls, data: Dict[str, Any]) -> 'SpritesheetModel':
-        """Load from the new clean JSON format"""
-        # Create model with core properties
-        model_data = {
+        """Load from the clean JSON format, upgrading each sprite to the current schema as it is imported"""
+        model_data = cls._import_header_data(data)
+        schema_version = get_schema_version(data)
+        if schema_version < CURRENT_SCHEMA_VERSION:
+            print(f"[DEBUG] Migrating sprites from schema v{schema_version} to v{CURRENT_SCHEMA_VERSION} while loading")
+        for sprite_data in data.get('sprites', []):
+            model_data['sprites'].append(cls._import_sprite_data(migrate_sprite(sprite_data, schema_version)))
+        
+        model = cls(**model_data)
+        return model
+    
+    @classmethod
+    def _import_header_data(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build model constructor arguments from the clean-format header fields"""
+        return {
             'image_path': data['image_path'],
             'total_width': data['total_width'],
             'total_height': data['total_height'],
@@ -1157,101 +1553,90 @@ class SpritesheetModel(BaseModel):
             'show_diamond_vertices': data.get('show_diamond_vertices', False),
             'sprites': []
         }
+    
+    @classmethod
+    def _import_sprite_data(cls, sprite_data: Dict[str, Any], diamond_info_deferred: bool = False) -> SpriteData:
+        """Build one SpriteData from its clean-format dict (diamond_info_deferred: it is read from disk later)"""
+        sprite = SpriteData(
+            sprite_index=sprite_data['sprite_index'],
+            original_size=tuple(sprite_data['original_size']),
+            asset_type=sprite_data.get('asset_type', AssetType.TILE),
+            frame_upper_z_offset=sprite_data.get('frame_upper_z_offset', 0)
+        )
         
-        # Process sprite data
-        for sprite_data in data.get('sprites', []):
-            sprite = SpriteData(
-                sprite_index=sprite_data['sprite_index'],
-                original_size=tuple(sprite_data['original_size']),
-                asset_type=sprite_data.get('asset_type', AssetType.TILE),
-                frame_upper_z_offset=sprite_data.get('frame_upper_z_offset', 0)
+        # Restore bbox if present
+        if 'bbox' in sprite_data:
+            bbox_data = sprite_data['bbox']
+            sprite.bbox = BoundingBox(
+                x=bbox_data['x'],
+                y=bbox_data['y'],
+                width=bbox_data['width'],
+                height=bbox_data['height']
             )
+        
+        # Restore diamond_info if present
+        if 'diamond_info' in sprite_data:
+            print(f"\n[DEBUG] ======= LOADING SPRITE {sprite.sprite_index} DIAMOND_INFO =======")
+            sprite.diamond_info = cls._import_diamond_info(sprite_data['diamond_info'])
             
-            # Restore bbox if present
-            if 'bbox' in sprite_data:
-                bbox_data = sprite_data['bbox']
-                sprite.bbox = BoundingBox(
-                    x=bbox_data['x'],
-                    y=bbox_data['y'],
-                    width=bbox_data['width'],
-                    height=bbox_data['height']
-                )
-            
-            # Restore diamond_info if present
-            if 'diamond_info' in sprite_data:
-                print(f"\n[DEBUG] ======= LOADING SPRITE {sprite.sprite_index} DIAMOND_INFO =======")
-                sprite.diamond_info = cls._import_diamond_info(sprite_data['diamond_info'])
+            if sprite.diamond_info:
+                print(f"[DEBUG] Sprite {sprite.sprite_index} diamond_info loaded:")
+                print(f"[DEBUG] - Lower diamond: {'✓' if sprite.diamond_info.lower_diamond else '✗'}")
+                print(f"[DEBUG] - Upper diamond: {'✓' if sprite.diamond_info.upper_diamond else '✗'}")
+                print(f"[DEBUG] - Extra diamonds: {list(sprite.diamond_info.extra_diamonds.keys()) if sprite.diamond_info.extra_diamonds else 'None'}")
                 
-                if sprite.diamond_info:
-                    print(f"[DEBUG] Sprite {sprite.sprite_index} diamond_info loaded:")
-                    print(f"[DEBUG] - Lower diamond: {'✓' if sprite.diamond_info.lower_diamond else '✗'}")
-                    print(f"[DEBUG] - Upper diamond: {'✓' if sprite.diamond_info.upper_diamond else '✗'}")
-                    print(f"[DEBUG] - Extra diamonds: {list(sprite.diamond_info.extra_diamonds.keys()) if sprite.diamond_info.extra_diamonds else 'None'}")
-                    
-                    # Check sub-diamonds for each diamond
-                    if sprite.diamond_info.lower_diamond:
-                        print(f"[DEBUG] - Lower sub-diamonds: {list(sprite.diamond_info.lower_diamond.sub_diamonds.keys()) if sprite.diamond_info.lower_diamond.sub_diamonds else 'None'}")
-                    if sprite.diamond_info.upper_diamond:
-                        print(f"[DEBUG] - Upper sub-diamonds: {list(sprite.diamond_info.upper_diamond.sub_diamonds.keys()) if sprite.diamond_info.upper_diamond.sub_diamonds else 'None'}")
-                    if sprite.diamond_info.extra_diamonds:
-                        for custom_name, custom_diamond in sprite.diamond_info.extra_diamonds.items():
-                            print(f"[DEBUG] - {custom_name} sub-diamonds: {list(custom_diamond.sub_diamonds.keys()) if custom_diamond.sub_diamonds else 'None'}")
-                else:
-                    print(f"[DEBUG] Sprite {sprite.sprite_index} diamond_info is None after import!")
-                print(f"[DEBUG] ======= SPRITE {sprite.sprite_index} DIAMOND_INFO COMPLETE =======\n")
+                # Check sub-diamonds for each diamond
+                if sprite.diamond_info.lower_diamond:
+                    print(f"[DEBUG] - Lower sub-diamonds: {list(sprite.diamond_info.lower_diamond.sub_diamonds.keys()) if sprite.diamond_info.lower_diamond.sub_diamonds else 'None'}")
+                if sprite.diamond_info.upper_diamond:
+                    print(f"[DEBUG] - Upper sub-diamonds: {list(sprite.diamond_info.upper_diamond.sub_diamonds.keys()) if sprite.diamond_info.upper_diamond.sub_diamonds else 'None'}")
+                if sprite.diamond_info.extra_diamonds:
+                    for custom_name, custom_diamond in sprite.diamond_info.extra_diamonds.items():
+                        print(f"[DEBUG] - {custom_name} sub-diamonds: {list(custom_diamond.sub_diamonds.keys()) if custom_diamond.sub_diamonds else 'None'}")
             else:
-                print(f"[DEBUG] Sprite {sprite.sprite_index}: No diamond_info in JSON data")
-            
-            # Restore custom keypoints if present
-            if 'custom_keypoints' in sprite_data:
-                sprite.custom_keypoints = {
-                    name: Point(x=point_data['x'], y=point_data['y'])
-                    for name, point_data in sprite_data['custom_keypoints'].items()
-                }
-            
-            model_data['sprites'].append(sprite)
+                print(f"[DEBUG] Sprite {sprite.sprite_index} diamond_info is None after import!")
+            print(f"[DEBUG] ======= SPRITE {sprite.sprite_index} DIAMOND_INFO COMPLETE =======\n")
+        elif not diamond_info_deferred:
+            print(f"[DEBUG] Sprite {sprite.sprite_index}: No diamond_info in JSON data")
         
-        model = cls(**model_data)
-        return model
+        # Restore custom keypoints if present
+        if 'custom_keypoints' in sprite_data:
+            sprite.custom_keypoints = {
+                name: Point.intern(point_data['x'], point_data['y'])
+                for name, point_data in sprite_data['custom_keypoints'].items()
+            }
+        
+        return sprite
     
-    def transfer_vertices_to_manual(self, renderer):
-        """Transfer all diamond vertices from model to renderer as manual vertices"""
+    def transfer_vertices_to_manual(self, sprite_indices: Optional[set] = None):
+        """Transfer all diamond vertices from the model into the manual vertex store"""
         for sprite in self.sprites:
+            if sprite_indices is not None and sprite.sprite_index not in sprite_indices:
+                continue
+            if sprite_indices is None and not sprite.is_diamond_info_loaded():
+                # Deferred sprites transfer when first viewed instead of being loaded here
+                self._deferred_vertex_transfer.add(sprite.sprite_index)
+                continue
             if sprite.diamond_info:
-                sprite_key = sprite.sprite_index
-                
-                # Initialize renderer manual vertices for this sprite if not exists
-                if sprite_key not in renderer.manual_vertices:
-                    renderer.manual_vertices[sprite_key] = {}
-                
-                # Transfer lower diamond vertices
-                if sprite.diamond_info.lower_diamond:
-                    lower = sprite.diamond_info.lower_diamond
-                    renderer.manual_vertices[sprite_key]['lower'] = {
-                        'north': (lower.north_vertex.x, lower.north_vertex.y),
-                        'south': (lower.south_vertex.x, lower.south_vertex.y),
-                        'east': (lower.east_vertex.x, lower.east_vertex.y),
-                        'west': (lower.west_vertex.x, lower.west_vertex.y)
-                    }
-                
-                # Transfer upper diamond vertices if present
-                if sprite.diamond_info.upper_diamond:
-                    upper = sprite.diamond_info.upper_diamond
-                    renderer.manual_vertices[sprite_key]['upper'] = {
-                        'north': (upper.north_vertex.x, upper.north_vertex.y),
-                        'south': (upper.south_vertex.x, upper.south_vertex.y),
-                        'east': (upper.east_vertex.x, upper.east_vertex.y),
-                        'west': (upper.west_vertex.x, upper.west_vertex.y)
-                    }
-                
-                # Transfer custom diamond vertices if present
-                for diamond_name, custom_diamond in sprite.diamond_info.extra_diamonds.items():
-                    renderer.manual_vertices[sprite_key][diamond_name] = {
-                        'north': (custom_diamond.north_vertex.x, custom_diamond.north_vertex.y),
-                        'south': (custom_diamond.south_vertex.x, custom_diamond.south_vertex.y),
-                        'east': (custom_diamond.east_vertex.x, custom_diamond.east_vertex.y),
-                        'west': (custom_diamond.west_vertex.x, custom_diamond.west_vertex.y)
-                    }
+                layers = {
+                    'lower': sprite.diamond_info.lower_diamond,
+                    'upper': sprite.diamond_info.upper_diamond,
+                    **sprite.diamond_info.extra_diamonds
+                }
+                for layer, diamond in layers.items():
+                    if diamond:
+                        self._manual_vertices.update_layer(sprite.sprite_index, layer, {
+                            'north': (diamond.north_vertex.x, diamond.north_vertex.y),
+                            'south': (diamond.south_vertex.x, diamond.south_vertex.y),
+                            'east': (diamond.east_vertex.x, diamond.east_vertex.y),
+                            'west': (diamond.west_vertex.x, diamond.west_vertex.y)
+                        })
+    
+    def transfer_deferred_vertices_to_manual(self, sprite_index: int):
+        """Transfer vertices for a deferred sprite the first time it is viewed"""
+        if sprite_index in self._deferred_vertex_transfer:
+            self._deferred_vertex_transfer.discard(sprite_index)
+            self.transfer_vertices_to_manual(sprite_indices={sprite_index})
     
     @classmethod
     def _import_diamond_info(cls, diamond_data: Dict[str, Any]) -> DiamondInfo:
@@ -1315,17 +1700,17 @@ class SpritesheetModel(BaseModel):
         """Import a single diamond from clean JSON format"""
         # Create basic GameplayDiamondData
         gameplay_diamond = GameplayDiamondData(
-            north_vertex=Point(x=diamond_data['north_vertex']['x'], y=diamond_data['north_vertex']['y']),
-            south_vertex=Point(x=diamond_data['south_vertex']['x'], y=diamond_data['south_vertex']['y']),
-            east_vertex=Point(x=diamond_data['east_vertex']['x'], y=diamond_data['east_vertex']['y']),
-            west_vertex=Point(x=diamond_data['west_vertex']['x'], y=diamond_data['west_vertex']['y']),
-            center=Point(x=diamond_data['center']['x'], y=diamond_data['center']['y']),
+            north_vertex=Point.intern(diamond_data['north_vertex']['x'], diamond_data['north_vertex']['y']),
+            south_vertex=Point.intern(diamond_data['south_vertex']['x'], diamond_data['south_vertex']['y']),
+            east_vertex=Point.intern(diamond_data['east_vertex']['x'], diamond_data['east_vertex']['y']),
+            west_vertex=Point.intern(diamond_data['west_vertex']['x'], diamond_data['west_vertex']['y']),
+            center=Point.intern(diamond_data['center']['x'], diamond_data['center']['y']),
             z_offset=diamond_data['z_offset'],
             # Import midpoints if present
-            north_east_midpoint=Point(x=diamond_data['north_east_midpoint']['x'], y=diamond_data['north_east_midpoint']['y']) if 'north_east_midpoint' in diamond_data else None,
-            east_south_midpoint=Point(x=diamond_data['east_south_midpoint']['x'], y=diamond_data['east_south_midpoint']['y']) if 'east_south_midpoint' in diamond_data else None,
-            south_west_midpoint=Point(x=diamond_data['south_west_midpoint']['x'], y=diamond_data['south_west_midpoint']['y']) if 'south_west_midpoint' in diamond_data else None,
-            west_north_midpoint=Point(x=diamond_data['west_north_midpoint']['x'], y=diamond_data['west_north_midpoint']['y']) if 'west_north_midpoint' in diamond_data else None
+            north_east_midpoint=Point.intern(diamond_data['north_east_midpoint']['x'], diamond_data['north_east_midpoint']['y']) if 'north_east_midpoint' in diamond_data else None,
+            east_south_midpoint=Point.intern(diamond_data['east_south_midpoint']['x'], diamond_data['east_south_midpoint']['y']) if 'east_south_midpoint' in diamond_data else None,
+            south_west_midpoint=Point.intern(diamond_data['south_west_midpoint']['x'], diamond_data['south_west_midpoint']['y']) if 'south_west_midpoint' in diamond_data else None,
+            west_north_midpoint=Point.intern(diamond_data['west_north_midpoint']['x'], diamond_data['west_north_midpoint']['y']) if 'west_north_midpoint' in diamond_data else None
         )
         
         # Import sub-diamonds if present
@@ -1344,95 +1729,40 @@ class SpritesheetModel(BaseModel):
                 loaded_props = 0
                 if sub_data.get('is_walkable') is not None:
                     loaded_props += 1
-                # Handle both old format (main_vertex/midpoint_a/midpoint_b) and new format (4 vertices)
-                if 'north_vertex' in sub_data:
-                    # New format with proper 4 vertices
-                    sub_diamond = SubDiamondData(
-                        quadrant=sub_data['quadrant'],
-                        north_vertex=Point(x=sub_data['north_vertex']['x'], y=sub_data['north_vertex']['y']),
-                        south_vertex=Point(x=sub_data['south_vertex']['x'], y=sub_data['south_vertex']['y']),
-                        east_vertex=Point(x=sub_data['east_vertex']['x'], y=sub_data['east_vertex']['y']),
-                        west_vertex=Point(x=sub_data['west_vertex']['x'], y=sub_data['west_vertex']['y']),
-                        center=Point(x=sub_data['center']['x'], y=sub_data['center']['y']),
-                        is_walkable=sub_data.get('is_walkable')
-                    )
-                    
-                    # Import edge properties for this sub-diamond if present
-                    if 'edge_properties' in sub_data:
-                        print(f"[DEBUG] Loading edge properties: {list(sub_data['edge_properties'].keys())}")
-                        for edge_name, edge_data in sub_data['edge_properties'].items():
-                            edge_attr = f"{edge_name}_edge"
-                            print(f"[DEBUG] Loading {edge_attr}: los={edge_data.get('blocks_line_of_sight')}, mov={edge_data.get('blocks_movement')}, portal={edge_data.get('z_portal')}")
-                            if hasattr(sub_diamond, edge_attr):
-                                edge_props = EdgeProperties(
-                                    blocks_line_of_sight=edge_data.get('blocks_line_of_sight'),
-                                    blocks_movement=edge_data.get('blocks_movement'),
-                                    z_portal=edge_data.get('z_portal')
-                                )
-                                setattr(sub_diamond, edge_attr, edge_props)
-                                
-                                # Count loaded properties
-                                if edge_data.get('blocks_line_of_sight') is not None:
-                                    loaded_props += 1
-                                if edge_data.get('blocks_movement') is not None:
-                                    loaded_props += 1
-                                if edge_data.get('z_portal') is not None:
-                                    loaded_props += 1
-                    else:
-                        print(f"[DEBUG] No edge_properties found in sub_data")
-                    
-                    gameplay_diamond.sub_diamonds[quadrant] = sub_diamond
-                    total_loaded_properties += loaded_props
-                    print(f"[DEBUG] {quadrant} sub-diamond loaded with {loaded_props} defined properties")
+                # Geometry is derived from the diamond's vertices; any stored vertices from older
+                # formats (4 vertices, or main_vertex/midpoint_a/midpoint_b) are ignored
+                sub_diamond = SubDiamondData(
+                    quadrant=sub_data.get('quadrant', quadrant),
+                    is_walkable=sub_data.get('is_walkable')
+                )
+                
+                # Import edge properties for this sub-diamond if present
+                if 'edge_properties' in sub_data:
+                    print(f"[DEBUG] Loading edge properties: {list(sub_data['edge_properties'].keys())}")
+                    for edge_name, edge_data in sub_data['edge_properties'].items():
+                        edge_attr = f"{edge_name}_edge"
+                        print(f"[DEBUG] Loading {edge_attr}: los={edge_data.get('blocks_line_of_sight')}, mov={edge_data.get('blocks_movement')}, portal={edge_data.get('z_portal')}")
+                        if hasattr(sub_diamond, edge_attr):
+                            edge_props = EdgeProperties.intern(
+                                blocks_line_of_sight=edge_data.get('blocks_line_of_sight'),
+                                blocks_movement=edge_data.get('blocks_movement'),
+                                z_portal=edge_data.get('z_portal')
+                            )
+                            setattr(sub_diamond, edge_attr, edge_props)
+                            
+                            # Count loaded properties
+                            if edge_data.get('blocks_line_of_sight') is not None:
+                                loaded_props += 1
+                            if edge_data.get('blocks_movement') is not None:
+                                loaded_props += 1
+                            if edge_data.get('z_portal') is not None:
+                                loaded_props += 1
                 else:
-                    # Old format - convert triangular to diamond shape (no edge properties to import)
-                    print(f"[DEBUG] Converting old format triangular to diamond shape")
-                    main_vertex = Point(x=sub_data['main_vertex']['x'], y=sub_data['main_vertex']['y'])
-                    midpoint_a = Point(x=sub_data['midpoint_a']['x'], y=sub_data['midpoint_a']['y'])
-                    midpoint_b = Point(x=sub_data['midpoint_b']['x'], y=sub_data['midpoint_b']['y'])
-                    center = Point(x=sub_data['center']['x'], y=sub_data['center']['y'])
-                    
-                    # Convert to diamond format based on quadrant
-                    if quadrant == 'north':
-                        gameplay_diamond.sub_diamonds[quadrant] = SubDiamondData(
-                            quadrant=quadrant,
-                            north_vertex=main_vertex,
-                            south_vertex=center,
-                            east_vertex=midpoint_b,
-                            west_vertex=midpoint_a,
-                            center=Point(x=(main_vertex.x + center.x) // 2, y=(main_vertex.y + center.y) // 2),
-                            is_walkable=sub_data.get('is_walkable')
-                        )
-                    elif quadrant == 'south':
-                        gameplay_diamond.sub_diamonds[quadrant] = SubDiamondData(
-                            quadrant=quadrant,
-                            north_vertex=center,
-                            south_vertex=main_vertex,
-                            east_vertex=midpoint_b,
-                            west_vertex=midpoint_a,
-                            center=Point(x=(main_vertex.x + center.x) // 2, y=(main_vertex.y + center.y) // 2),
-                            is_walkable=sub_data.get('is_walkable')
-                        )
-                    elif quadrant == 'east':
-                        gameplay_diamond.sub_diamonds[quadrant] = SubDiamondData(
-                            quadrant=quadrant,
-                            north_vertex=midpoint_a,
-                            south_vertex=midpoint_b,
-                            east_vertex=main_vertex,
-                            west_vertex=center,
-                            center=Point(x=(main_vertex.x + center.x) // 2, y=(main_vertex.y + center.y) // 2),
-                            is_walkable=sub_data.get('is_walkable')
-                        )
-                    elif quadrant == 'west':
-                        gameplay_diamond.sub_diamonds[quadrant] = SubDiamondData(
-                            quadrant=quadrant,
-                            north_vertex=midpoint_a,
-                            south_vertex=midpoint_b,
-                            east_vertex=center,
-                            west_vertex=main_vertex,
-                            center=Point(x=(main_vertex.x + center.x) // 2, y=(main_vertex.y + center.y) // 2),
-                            is_walkable=sub_data.get('is_walkable')
-                        )
+                    print(f"[DEBUG] No edge_properties found in sub_data")
+                
+                gameplay_diamond.add_sub_diamond(sub_diamond)
+                total_loaded_properties += loaded_props
+                print(f"[DEBUG] {quadrant} sub-diamond loaded with {loaded_props} defined properties")
             
             print(f"\n[DEBUG] SUB-DIAMONDS IMPORT SUMMARY:")
             print(f"[DEBUG] Total quadrants loaded: {len(gameplay_diamond.sub_diamonds)}")
@@ -1444,104 +1774,6 @@ class SpritesheetModel(BaseModel):
         
         return gameplay_diamond
     
-    def set_manual_vertices_for_export(self, manual_vertices: Dict[int, Dict[str, Dict[str, Tuple[int, int]]]]):
-        """Set manual vertices data from renderer for export"""
-        self._renderer_manual_vertices = manual_vertices
-    
-    @classmethod
-    def _restore_line_data_from_json(cls, data: Dict[str, Any]):
-        """Restore full line data from compact format after JSON loading"""
-        if 'sprites' not in data:
-            return
-            
-        for sprite_data in data['sprites']:
-            if 'detailed_analysis' not in sprite_data or not sprite_data['detailed_analysis']:
-                continue
-                
-            detailed = sprite_data['detailed_analysis']
-            
-            # Restore IsometricAnalysis lines
-            if 'isometric_analysis' in detailed and detailed['isometric_analysis']:
-                iso_analysis = detailed['isometric_analysis']
-                
-                # Restore lines from line_segments (simplified - just start/end for now)
-                if 'line_segments' in iso_analysis:
-                    lines = {}
-                    for direction, segment in iso_analysis['line_segments'].items():
-                        if len(segment) == 2:
-                            # For now, just use start and end points
-                            # In a real implementation, you'd regenerate the full line
-                            lines[direction] = [
-                                {'x': segment[0]['x'], 'y': segment[0]['y']},
-                                {'x': segment[1]['x'], 'y': segment[1]['y']}
-                            ]
-                    iso_analysis['lines'] = lines
-                    del iso_analysis['line_segments']
-                
-                # Restore convex_hulls from hull_bounds (simplified)
-                if 'hull_bounds' in iso_analysis:
-                    convex_hulls = {}
-                    for direction, bounds in iso_analysis['hull_bounds'].items():
-                        if len(bounds) == 2:
-                            # Generate a simple rectangle for the hull
-                            min_point, max_point = bounds
-                            hull_points = [
-                                {'x': min_point['x'], 'y': min_point['y']},
-                                {'x': max_point['x'], 'y': min_point['y']},
-                                {'x': max_point['x'], 'y': max_point['y']},
-                                {'x': min_point['x'], 'y': max_point['y']}
-                            ]
-                            convex_hulls[direction] = hull_points
-                    iso_analysis['convex_hulls'] = convex_hulls
-                    del iso_analysis['hull_bounds']
-                
-                # Restore legacy fields
-                iso_analysis['line_points'] = []
-                iso_analysis['convex_hull_area'] = []
-            
-            # Restore ContactPointsData lines
-            if 'contact_points_data' in detailed and detailed['contact_points_data']:
-                contact_data = detailed['contact_points_data']
-                
-                # Restore upper_line_data
-                if 'upper_line_data' in contact_data:
-                    cls._restore_line_data_dict(contact_data['upper_line_data'])
-                
-                # Restore lower_line_data
-                if 'lower_line_data' in contact_data:
-                    cls._restore_line_data_dict(contact_data['lower_line_data'])
-    
-    @classmethod
-    def _restore_line_data_dict(cls, line_data: Dict[str, Any]):
-        """Restore a LineData dictionary from compact format"""
-        # Restore contact_points_mode
-        if 'contact_points_segments' in line_data:
-            contact_points_mode = {}
-            for direction, segment in line_data['contact_points_segments'].items():
-                if len(segment) == 2:
-                    contact_points_mode[direction] = [
-                        {'x': segment[0]['x'], 'y': segment[0]['y']},
-                        {'x': segment[1]['x'], 'y': segment[1]['y']}
-                    ]
-            line_data['contact_points_mode'] = contact_points_mode
-            del line_data['contact_points_segments']
-        else:
-            line_data['contact_points_mode'] = {}
-        
-        # Restore midpoint_mode
-        if 'midpoint_segments' in line_data:
-            midpoint_mode = {}
-            for direction, segment in line_data['midpoint_segments'].items():
-                if len(segment) == 2:
-                    midpoint_mode[direction] = [
-                        {'x': segment[0]['x'], 'y': segment[0]['y']},
-                        {'x': segment[1]['x'], 'y': segment[1]['y']}
-                    ]
-            line_data['midpoint_mode'] = midpoint_mode
-            del line_data['midpoint_segments']
-        else:
-            line_data['midpoint_mode'] = {}
-    
     @classmethod
     def create_from_image(cls, image_path: str, rows: int, cols: int, 
                          total_width: int, total_height: int) -> 'SpritesheetModel':
@@ -1566,13 +1798,130 @@ class SpritesheetModel(BaseModel):
         """Get a JSON-compatible dictionary representation"""
         return self.model_dump(exclude={'current_sprite_index', 'pixeloid_multiplier', 'pan_x', 'pan_y'})
 
+# Streaming export and sprite index helpers
+
+def write_clean_export(f, header: Dict[str, Any], sprite_dicts, compact: bool = False,
+                       index: Optional[Dict[str, Any]] = None):
+    """Write clean-format export data to a text handle, optionally recording a sprite byte index"""
+    if compact:
+        dump_options = {'separators': (',', ':')}
+        newline, field_indent, sprite_indent = '', '', ''
+    else:
+        dump_options = {'indent': 2}
+        newline, field_indent, sprite_indent = '\n', '  ', '    '
+    
+    # json.dumps escapes non-ASCII by default, so character counts equal byte counts
+    offset = 0
+    def emit(text: str):
+        nonlocal offset
+        f.write(text)
+        offset += len(text)
+    
+    emit('{' + newline)
+    for key, value in header.items():
+        emit(f"{field_indent}{json.dumps(key)}:{'' if compact else ' '}{json.dumps(value, **dump_options)},{newline}")
+    emit(f"{field_indent}\"sprites\":{'' if compact else ' '}[")
+    
+    if index is not None:
+        index['header'] = header
+        index['sprites'] = []
+    decoder = json.JSONDecoder()
+    diamond_key = '"diamond_info":' + ('' if compact else ' ')
+    
+    has_sprites = False
+    for sprite_dict in sprite_dicts:
+        sprite_json = json.dumps(sprite_dict, **dump_options)
+        if not compact:
+            sprite_json = '\n'.join(sprite_indent + line for line in sprite_json.split('\n'))
+        emit(('' if not has_sprites else ',') + newline)
+        sprite_start = offset
+        emit(sprite_json)
+        has_sprites = True
+        
+        if index is not None:
+            entry = {'summary': {key: value for key, value in sprite_dict.items() if key != 'diamond_info'}}
+            diamond_info = sprite_dict.get('diamond_info')
+            if diamond_info is not None:
+                # Keys ahead of diamond_info hold only numbers and the asset type, so the first match is the real key
+                value_start = sprite_json.index(diamond_key) + len(diamond_key)
+                value_end = decoder.raw_decode(sprite_json, value_start)[1]
+                entry['diamond_info'] = [sprite_start + value_start, value_end - value_start]
+                entry['has_sub_diamonds'] = any(
+                    layer.get('sub_diamonds')
+                    for layer in [diamond_info.get('lower_diamond'), diamond_info.get('upper_diamond')]
+                    + list(diamond_info.get('extra_diamonds', {}).values())
+                    if layer
+                )
+            index['sprites'].append(entry)
+    
+    if has_sprites:
+        emit(newline + field_indent)
+    emit(']' + newline + '}')
+
+
+def get_sprite_index_path(analysis_path) -> Path:
+    """Sidecar sprite index that sits next to an analysis file"""
+    return Path(f"{analysis_path}.index")
+
+
+def write_sprite_index(analysis_path, index: Dict[str, Any]) -> Tuple[int, int]:
+    """Stamp the index with the analysis file's size and mtime and write it, returns the stamp"""
+    stat = os.stat(analysis_path)
+    index['version'] = 1
+    index['source_size'] = stat.st_size
+    index['source_mtime_ns'] = stat.st_mtime_ns
+    with open(get_sprite_index_path(analysis_path), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def read_sprite_index(analysis_path) -> Optional[Dict[str, Any]]:
+    """Read the sprite index for an analysis file, or None when missing or stale"""
+    index_path = get_sprite_index_path(analysis_path)
+    if not index_path.exists():
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ignoring unreadable sprite index {index_path}: {e}")
+        return None
+    
+    stat = os.stat(analysis_path)
+    if (index.get('source_size'), index.get('source_mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+        print(f"[DEBUG] Sprite index {index_path.name} is stale, loading {Path(analysis_path).name} eagerly")
+        return None
+    return index
+
+# Last analysis file re-parsed for deferred sprites whose byte ranges went stale:
+# path -> (file stamp, sprite index -> migrated diamond_info dict)
+_reparsed_diamond_infos: Dict[str, Tuple[Tuple[int, int], Dict[int, Optional[Dict[str, Any]]]]] = {}
+
+
+def _read_reparsed_diamond_info(path: str, sprite_index: int) -> Optional[Dict[str, Any]]:
+    """diamond_info of one sprite from a full parse of an analysis file that changed since it was opened lazily"""
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _reparsed_diamond_infos.get(path)
+    if cached is None or cached[0] != stamp:
+        print(f"[DEBUG] {Path(path).name} changed on disk since it was opened, re-reading deferred diamond_info from the full file")
+        with SpritesheetModel._open_export_stream(path, SpritesheetModel._detect_compression(path) or 'none', mode='rt') as f:
+            data = json.load(f)
+        schema_version = get_schema_version(data)
+        diamond_infos = {sprite_data['sprite_index']: migrate_sprite(sprite_data, schema_version).get('diamond_info')
+                         for sprite_data in data.get('sprites', [])}
+        # Only one file is kept: every deferred sprite of a changed file reads from the same parse
+        _reparsed_diamond_infos.clear()
+        cached = _reparsed_diamond_infos[path] = (stamp, diamond_infos)
+    return cached[1].get(sprite_index)
+
 # Helper functions for converting between different formats
 
 def point_from_tuple(point_tuple: Optional[Tuple[int, int]]) -> Optional[Point]:
     """Convert a tuple to a Point object"""
     if point_tuple is None:
         return None
-    return Point(x=point_tuple[0], y=point_tuple[1])
+    return Point.intern(point_tuple[0], point_tuple[1])
 
 def point_to_tuple(point: Optional[Point]) -> Optional[Tuple[int, int]]:
     """Convert a Point object to a tuple"""
@@ -1588,7 +1937,7 @@ def bbox_from_pygame_rect(rect) -> Optional[BoundingBox]:
 
 def points_from_list(points_list: List[Tuple[int, int]]) -> List[Point]:
     """Convert a list of tuples to a list of Point objects"""
-    return [Point(x=x, y=y) for x, y in points_list]
+    return [Point.intern(x, y) for x, y in points_list]
 
 def points_to_list(points: List[Point]) -> List[Tuple[int, int]]:
     """Convert a list of Point objects to a list of tuples"""
@@ -0,0 +1,110 @@
+import struct
+import numpy as np
+from spritesheet_model import (
+    SpritesheetModel, DiamondInfo, GameplayDiamondData, SubDiamondData, EdgeProperties, Point
+)
+from runtime_export import (
+    RUNTIME_MAGIC, RUNTIME_VERSION, HEADER_FORMAT, SECTION_FORMAT, SECTION_ALIGNMENT, VERTEX_ORDER,
+    build_runtime_tables, write_runtime_tables, read_runtime_tables
+)
+
+
+def make_diamond(north_y: int, z_offset: float, sub_diamonds=None) -> GameplayDiamondData:
+    return GameplayDiamondData(
+        north_vertex=Point(x=32, y=north_y),
+        south_vertex=Point(x=32, y=north_y + 32),
+        east_vertex=Point(x=63, y=north_y + 16),
+        west_vertex=Point(x=1, y=north_y + 16),
+        center=Point(x=32, y=north_y + 16),
+        z_offset=z_offset,
+        sub_diamonds=sub_diamonds or {},
+    )
+
+
+def make_model() -> SpritesheetModel:
+    """Two sprites: one with lower, upper and a custom diamond, one with only a lower diamond"""
+    model = SpritesheetModel(image_path='sheet.png', total_width=128, total_height=96, rows=1, cols=2,
+                             sprite_width=64, sprite_height=96)
+    model.initialize_sprites()
+    portal_edge = EdgeProperties(blocks_line_of_sight=True, blocks_movement=False, z_portal=12.5)
+    model.sprites[0].diamond_info = DiamondInfo(
+        diamond_height=32, predicted_flat_height=24, effective_height=56, line_y=40,
+        diamond_width=62, lower_z_offset=0, upper_z_offset=24,
+        lower_diamond=make_diamond(48, 0.0, {
+            'north': SubDiamondData(quadrant='north', is_walkable=True, north_east_edge=portal_edge),
+            'west': SubDiamondData(quadrant='west', is_walkable=False),
+        }),
+        upper_diamond=make_diamond(24, 24.0),
+        extra_diamonds={'roof': make_diamond(10, 38.0)},
+    )
+    model.sprites[1].diamond_info = DiamondInfo(
+        diamond_height=32, predicted_flat_height=0, effective_height=32, line_y=60,
+        diamond_width=62, lower_z_offset=0,
+        lower_diamond=make_diamond(60, 0.0),
+    )
+    return model
+
+
+def test_round_trip_matches_built_tables(tmp_path):
+    model = make_model()
+    path = tmp_path / 'tiles.isot'
+    written = write_runtime_tables(model, str(path))
+    loaded = read_runtime_tables(str(path))
+
+    assert loaded['layer_names'] == ['lower', 'upper', 'roof']
+    assert written['layer_names'] == loaded['layer_names']
+    for name in ('layer_mask', 'vertices', 'z_offsets', 'walkability', 'edges', 'portals'):
+        np.testing.assert_array_equal(loaded[name], written[name])
+    np.testing.assert_array_equal(loaded['layer_mask'], [0b111, 0b001])
+    np.testing.assert_array_equal(loaded['portals'], [12.5])
+
+
+def test_overrides_match_json_export(tmp_path):
+    model = make_model()
+    model.manual_vertices.set(0, 'upper', 'north', (32, 5))
+    model.manual_vertices.set(0, 'lower', 'north', (30, 50))
+    path = tmp_path / 'tiles.isot'
+    write_runtime_tables(model, str(path))
+    loaded = read_runtime_tables(str(path))
+
+    exported = model._export_diamond_info(model.sprites[0].diamond_info, 0)
+    json_diamonds = {'lower': exported['lower_diamond'], 'upper': exported['upper_diamond'],
+                     'roof': exported['extra_diamonds']['roof']}
+    for l, layer in enumerate(loaded['layer_names']):
+        json_diamond = json_diamonds[layer]
+        for v, vertex_name in enumerate(VERTEX_ORDER):
+            vertex = json_diamond[f'{vertex_name}_vertex']
+            assert tuple(loaded['vertices'][0, l, v]) == (vertex['x'], vertex['y'])
+        assert loaded['z_offsets'][0, l] == json_diamond['z_offset']
+    assert loaded['z_offsets'][0, 1] == 45.0
+
+
+def test_binary_layout_is_pinned(tmp_path):
+    model = make_model()
+    path = tmp_path / 'tiles.isot'
+    tables = build_runtime_tables(model)
+    write_runtime_tables(model, str(path))
+    buffer = path.read_bytes()
+
+    assert struct.calcsize(HEADER_FORMAT) == 20
+    assert struct.calcsize(SECTION_FORMAT) == 12
+    assert struct.unpack_from(HEADER_FORMAT, buffer, 0) == (RUNTIME_MAGIC, RUNTIME_VERSION, 3, 2, 1, 7)
+
+    expected_lengths = {
+        b'LNAM': sum(2 + len(name) for name in tables['layer_names']),
+        b'LMSK': 2 * 4,
+        b'VERT': 2 * 3 * 4 * 2 * 4,
+        b'ZOFF': 2 * 3 * 4,
+        b'WALK': 2 * 3,
+        b'EDGE': 2 * 3 * 4 * 4 * 2,
+        b'PORT': 1 * 4,
+    }
+    previous_end = 20 + 12 * 7
+    for i, tag in enumerate(expected_lengths):
+        entry_tag, offset, length = struct.unpack_from(SECTION_FORMAT, buffer, 20 + 12 * i)
+        assert entry_tag == tag
+        assert length == expected_lengths[tag]
+        assert offset % SECTION_ALIGNMENT == 0
+        assert previous_end <= offset < previous_end + SECTION_ALIGNMENT
+        previous_end = offset + length
+    assert len(buffer) == previous_end
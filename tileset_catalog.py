@@ -0,0 +1,390 @@
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any, Callable
+from spritesheet_model import SpritesheetModel
+from analysis_journal import get_journal_path, replay_journal
+from schema_migrations import (
+    migrate_export_data, is_analysis_data, is_analysis_file, NotAnalysisFileError, ANALYSIS_HEADER_FIELDS
+)
+
+DEFAULT_CATALOG_PATH = 'tileset_catalog.db'
+ANALYSIS_SUFFIXES = ('.json', '.json.gz', '.json.xz', '.json.lzma')
+EDGE_NAMES = ('north_west', 'north_east', 'south_west', 'south_east')
+VERTEX_NAMES = ('north', 'south', 'east', 'west')
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    source_size INTEGER NOT NULL,
+    source_mtime_ns INTEGER NOT NULL,
+    journal_mtime_ns INTEGER,
+    image_path TEXT,
+    rows INTEGER,
+    cols INTEGER,
+    sprite_width INTEGER,
+    sprite_height INTEGER
+);
+CREATE TABLE IF NOT EXISTS sprites (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    sprite_index INTEGER NOT NULL,
+    asset_type TEXT NOT NULL,
+    frame_upper_z_offset INTEGER,
+    bbox_x INTEGER, bbox_y INTEGER, bbox_width INTEGER, bbox_height INTEGER,
+    keypoints TEXT,
+    UNIQUE (file_id, sprite_index)
+);
+CREATE TABLE IF NOT EXISTS diamonds (
+    id INTEGER PRIMARY KEY,
+    sprite_id INTEGER NOT NULL REFERENCES sprites(id) ON DELETE CASCADE,
+    layer TEXT NOT NULL,
+    z_offset REAL,
+    north_x INTEGER, north_y INTEGER, south_x INTEGER, south_y INTEGER,
+    east_x INTEGER, east_y INTEGER, west_x INTEGER, west_y INTEGER,
+    UNIQUE (sprite_id, layer)
+);
+CREATE TABLE IF NOT EXISTS sub_diamonds (
+    id INTEGER PRIMARY KEY,
+    diamond_id INTEGER NOT NULL REFERENCES diamonds(id) ON DELETE CASCADE,
+    quadrant TEXT NOT NULL,
+    is_walkable INTEGER,
+    UNIQUE (diamond_id, quadrant)
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    sub_diamond_id INTEGER NOT NULL REFERENCES sub_diamonds(id) ON DELETE CASCADE,
+    edge TEXT NOT NULL,
+    blocks_line_of_sight INTEGER,
+    blocks_movement INTEGER,
+    z_portal REAL,
+    UNIQUE (sub_diamond_id, edge)
+);
+CREATE INDEX IF NOT EXISTS idx_sprites_asset_type ON sprites(asset_type);
+CREATE INDEX IF NOT EXISTS idx_diamonds_layer ON diamonds(layer, sprite_id);
+CREATE INDEX IF NOT EXISTS idx_sub_diamonds_walkable ON sub_diamonds(quadrant, is_walkable);
+CREATE INDEX IF NOT EXISTS idx_edges_portal ON edges(z_portal) WHERE z_portal IS NOT NULL;
+"""
+
+
+def _tristate_to_sql(value: Optional[bool]) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+def _iter_diamonds(diamond_info: Dict[str, Any]):
+    """(layer, exported diamond) pairs of a sprite's diamond_info"""
+    for layer in ('lower', 'upper'):
+        diamond = diamond_info.get(f"{layer}_diamond")
+        if diamond:
+            yield layer, diamond
+    for name, diamond in (diamond_info.get('extra_diamonds') or {}).items():
+        if diamond:
+            yield name, diamond
+
+
+class TilesetCatalog:
+    """
+    SQLite index over saved analysis files for querying analyzed sprites at scale.
+
+    Files are re-ingested only when their size/mtime (or their autosave journal) changed since
+    they were last indexed; files that disappeared from an indexed directory are dropped.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(CATALOG_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'TilesetCatalog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def find_analysis_files(root: str, is_known: Optional[Callable[[Path], bool]] = None) -> List[Path]:
+        """
+        Analysis files under a directory. Sprite indexes, journals and other JSON (frame sidecars,
+        atlas manifests) are skipped. Files is_known accepts are taken without reading their header.
+        """
+        files: List[Path] = []
+        for path in sorted(Path(root).rglob('*')):
+            if not path.is_file() or not path.name.lower().endswith(ANALYSIS_SUFFIXES):
+                continue
+            if not (is_known and is_known(path)):
+                try:
+                    if not is_analysis_file(path):
+                        print(f"Skipping {path}: not an analysis file")
+                        continue
+                except (OSError, ValueError):
+                    pass  # Unreadable files are kept so indexing reports the error
+            files.append(path)
+        return files
+
+    @staticmethod
+    def _file_stamp(path: Path) -> Tuple[int, int, Optional[int]]:
+        stat = os.stat(path)
+        journal_path = get_journal_path(str(path))
+        journal_mtime = os.stat(journal_path).st_mtime_ns if journal_path.exists() else None
+        return stat.st_size, stat.st_mtime_ns, journal_mtime
+
+    @staticmethod
+    def _row_is_current(row, stamp: Tuple[int, int, Optional[int]]) -> bool:
+        """Check a files row against a file stamp; rows without a sheet header were ingested from non-analysis JSON"""
+        return (bool(row) and (row['source_size'], row['source_mtime_ns'], row['journal_mtime_ns']) == stamp and
+                all(row[field] is not None for field in ANALYSIS_HEADER_FIELDS))
+
+    def _is_current(self, path: Path) -> bool:
+        """Check whether the catalog holds this analysis file at its current size and mtimes"""
+        row = self.connection.execute("SELECT * FROM files WHERE path = ?", (str(path),)).fetchone()
+        return self._row_is_current(row, self._file_stamp(path))
+
+    def index_paths(self, paths: List[str], prune: bool = True) -> Dict[str, int]:
+        """
+        Bring the catalog up to date for analysis files and directories of analysis files.
+        With prune, indexed files under the given directories that no longer exist are removed.
+        """
+        files: List[Path] = []
+        roots: List[Path] = []
+        for path in paths:
+            path_obj = Path(path).resolve()
+            if path_obj.is_dir():
+                roots.append(path_obj)
+                files.extend(self.find_analysis_files(str(path_obj), is_known=self._is_current))
+            elif path_obj.exists():
+                files.append(path_obj)
+            else:
+                print(f"Warning: {path} does not exist")
+
+        counts = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'skipped': 0, 'failed': 0}
+        for path in files:
+            try:
+                if self.index_file(path):
+                    counts['indexed'] += 1
+                else:
+                    counts['unchanged'] += 1
+            except NotAnalysisFileError:
+                counts['skipped'] += 1
+                print(f"Skipping {path}: not an analysis file")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                counts['failed'] += 1
+                print(f"Error indexing {path}: {e}")
+
+        if prune and roots:
+            present = {str(path) for path in files}
+            for row in self.connection.execute("SELECT id, path FROM files").fetchall():
+                in_root = any(Path(row['path']).is_relative_to(root) for root in roots)
+                if in_root and row['path'] not in present:
+                    self.connection.execute("DELETE FROM files WHERE id = ?", (row['id'],))
+                    counts['removed'] += 1
+            self.connection.commit()
+
+        print(f"Catalog {self.db_path}: {counts['indexed']} indexed, {counts['unchanged']} unchanged, "
+              f"{counts['removed']} removed, {counts['skipped']} not analysis files, {counts['failed']} failed")
+        return counts
+
+    def index_file(self, path: Path, force: bool = False) -> bool:
+        """
+        (Re)ingest one analysis file if it changed, returns True if it was ingested.
+        Raises NotAnalysisFileError for other JSON files, dropping anything indexed from them.
+        """
+        path = Path(path).resolve()
+        size, mtime_ns, journal_mtime_ns = self._file_stamp(path)
+        row = self.connection.execute("SELECT * FROM files WHERE path = ?", (str(path),)).fetchone()
+        if not force and self._row_is_current(row, (size, mtime_ns, journal_mtime_ns)):
+            return False
+
+        compression = SpritesheetModel._detect_compression(str(path)) or 'none'
+        with SpritesheetModel._open_export_stream(str(path), compression, mode='rt') as f:
+            data = json.load(f)
+        if not is_analysis_data(data):
+            if row:
+                self.remove_file(str(path))
+            raise NotAnalysisFileError(f"{path} is not an analysis file")
+        # Index autosaved edits too, the same way the editor would see the file
+        replay_journal(data, str(path))
+        migrate_export_data(data)
+
+        with self.connection:
+            if row:
+                # Cascades to sprites, diamonds, sub-diamonds and edges
+                self.connection.execute("DELETE FROM files WHERE id = ?", (row['id'],))
+            file_id = self.connection.execute(
+                "INSERT INTO files (path, source_size, source_mtime_ns, journal_mtime_ns, image_path, rows, cols, "
+                "sprite_width, sprite_height) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), size, mtime_ns, journal_mtime_ns, data.get('image_path'), data.get('rows'),
+                 data.get('cols'), data.get('sprite_width'), data.get('sprite_height'))
+            ).lastrowid
+            for sprite_data in data.get('sprites', []):
+                self._insert_sprite(file_id, sprite_data)
+        return True
+
+    def _insert_sprite(self, file_id: int, sprite_data: Dict[str, Any]):
+        bbox = sprite_data.get('bbox') or {}
+        sprite_id = self.connection.execute(
+            "INSERT INTO sprites (file_id, sprite_index, asset_type, frame_upper_z_offset, bbox_x, bbox_y, "
+            "bbox_width, bbox_height, keypoints) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_id, sprite_data['sprite_index'], sprite_data.get('asset_type', 'tile'),
+             sprite_data.get('frame_upper_z_offset', 0), bbox.get('x'), bbox.get('y'), bbox.get('width'),
+             bbox.get('height'), json.dumps(sprite_data.get('custom_keypoints') or {}))
+        ).lastrowid
+
+        for layer, diamond in _iter_diamonds(sprite_data.get('diamond_info') or {}):
+            vertices = []
+            for vertex in VERTEX_NAMES:
+                point = diamond.get(f"{vertex}_vertex") or {}
+                vertices.extend((point.get('x'), point.get('y')))
+            diamond_id = self.connection.execute(
+                "INSERT INTO diamonds (sprite_id, layer, z_offset, north_x, north_y, south_x, south_y, "
+                "east_x, east_y, west_x, west_y) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sprite_id, layer, diamond.get('z_offset'), *vertices)
+            ).lastrowid
+
+            for quadrant, sub_data in (diamond.get('sub_diamonds') or {}).items():
+                sub_id = self.connection.execute(
+                    "INSERT INTO sub_diamonds (diamond_id, quadrant, is_walkable) VALUES (?, ?, ?)",
+                    (diamond_id, quadrant, _tristate_to_sql(sub_data.get('is_walkable')))
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO edges (sub_diamond_id, edge, blocks_line_of_sight, blocks_movement, z_portal) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(sub_id, edge_name, _tristate_to_sql(edge.get('blocks_line_of_sight')),
+                      _tristate_to_sql(edge.get('blocks_movement')), edge.get('z_portal'))
+                     for edge_name, edge in (sub_data.get('edge_properties') or {}).items()]
+                )
+
+    def remove_file(self, path: str) -> bool:
+        """Drop one analysis file and everything indexed from it"""
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM files WHERE path = ?", (str(Path(path).resolve()),))
+        return cursor.rowcount > 0
+
+    def find_sprites(self, asset_type: Optional[str] = None, layer: Optional[str] = None,
+                     walkable_quadrant: Optional[str] = None, has_portal: Optional[bool] = None,
+                     portal_target: Optional[float] = None, blocks_movement: Optional[bool] = None,
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Sprites matching every given condition; diamond conditions apply to the given layer (any layer if None).
+        e.g. all stairs with a z-portal on the upper diamond: find_sprites(asset_type='stair', layer='upper', has_portal=True)
+        """
+        conditions = []
+        params: List[Any] = []
+        if asset_type is not None:
+            conditions.append("s.asset_type = ?")
+            params.append(getattr(asset_type, 'value', asset_type))
+        if layer is not None:
+            conditions.append("EXISTS (SELECT 1 FROM diamonds d WHERE d.sprite_id = s.id AND d.layer = ?)")
+            params.append(layer)
+
+        layer_filter = "d.layer = ? AND " if layer is not None else ""
+        layer_params = [layer] if layer is not None else []
+        if walkable_quadrant is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM diamonds d JOIN sub_diamonds sd ON sd.diamond_id = d.id "
+                f"WHERE d.sprite_id = s.id AND {layer_filter}sd.quadrant = ? AND sd.is_walkable = 1)"
+            )
+            params.extend(layer_params + [walkable_quadrant])
+
+        edge_conditions = []
+        edge_params: List[Any] = []
+        if has_portal:
+            edge_conditions.append("e.z_portal IS NOT NULL")
+        if portal_target is not None:
+            edge_conditions.append("e.z_portal = ?")
+            edge_params.append(portal_target)
+        if blocks_movement is not None:
+            edge_conditions.append("e.blocks_movement = ?")
+            edge_params.append(int(blocks_movement))
+        edge_query = (
+            "EXISTS (SELECT 1 FROM diamonds d JOIN sub_diamonds sd ON sd.diamond_id = d.id "
+            f"JOIN edges e ON e.sub_diamond_id = sd.id WHERE d.sprite_id = s.id AND {layer_filter}"
+        )
+        if edge_conditions:
+            conditions.append(edge_query + " AND ".join(edge_conditions) + ")")
+            params.extend(layer_params + edge_params)
+        if has_portal is False:
+            conditions.append("NOT " + edge_query + "e.z_portal IS NOT NULL)")
+            params.extend(layer_params)
+
+        query = ("SELECT f.path, f.image_path, s.sprite_index, s.asset_type, s.frame_upper_z_offset, "
+                 "s.bbox_x, s.bbox_y, s.bbox_width, s.bbox_height FROM sprites s JOIN files f ON f.id = s.file_id")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY f.path, s.sprite_index"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def find_portals(self, asset_type: Optional[str] = None, layer: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every z-portal edge with the sprite, layer, quadrant and edge it sits on"""
+        query = ("SELECT f.path, s.sprite_index, s.asset_type, d.layer, sd.quadrant, e.edge, e.z_portal "
+                 "FROM edges e JOIN sub_diamonds sd ON sd.id = e.sub_diamond_id JOIN diamonds d ON d.id = sd.diamond_id "
+                 "JOIN sprites s ON s.id = d.sprite_id JOIN files f ON f.id = s.file_id WHERE e.z_portal IS NOT NULL")
+        params: List[Any] = []
+        if asset_type is not None:
+            query += " AND s.asset_type = ?"
+            params.append(getattr(asset_type, 'value', asset_type))
+        if layer is not None:
+            query += " AND d.layer = ?"
+            params.append(layer)
+        query += " ORDER BY f.path, s.sprite_index, d.layer, sd.quadrant, e.edge"
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def summary(self) -> Dict[str, Any]:
+        """File and sprite counts, with sprites per asset type"""
+        counts = {
+            'files': self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            'sprites': self.connection.execute("SELECT COUNT(*) FROM sprites").fetchone()[0],
+            'portals': self.connection.execute("SELECT COUNT(*) FROM edges WHERE z_portal IS NOT NULL").fetchone()[0],
+        }
+        counts['asset_types'] = {
+            row['asset_type']: row['count'] for row in self.connection.execute(
+                "SELECT asset_type, COUNT(*) AS count FROM sprites GROUP BY asset_type ORDER BY asset_type")
+        }
+        return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: index analysis files and run simple queries"""
+    parser = argparse.ArgumentParser(description="Index analysis files into a SQLite catalog and query them")
+    parser.add_argument('--db', default=DEFAULT_CATALOG_PATH, help="Catalog database path")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help="Ingest new or changed analysis files")
+    index_parser.add_argument('paths', nargs='+', help="Analysis files or directories")
+    index_parser.add_argument('--no-prune', action='store_true', help="Keep entries for deleted files")
+
+    find_parser = subparsers.add_parser('find', help="List sprites matching the given conditions")
+    find_parser.add_argument('--asset-type', help="tile, wall, door or stair")
+    find_parser.add_argument('--layer', help="Diamond layer: lower, upper or a custom diamond name")
+    find_parser.add_argument('--walkable', help="Quadrant that must be walkable")
+    find_parser.add_argument('--portal', action='store_true', help="Only sprites with a z-portal edge")
+    find_parser.add_argument('--limit', type=int, default=None)
+
+    subparsers.add_parser('summary', help="Show catalog counts")
+    args = parser.parse_args(argv)
+
+    with TilesetCatalog(args.db) as catalog:
+        if args.command == 'index':
+            catalog.index_paths(args.paths, prune=not args.no_prune)
+        elif args.command == 'find':
+            rows = catalog.find_sprites(asset_type=args.asset_type, layer=args.layer, walkable_quadrant=args.walkable,
+                                        has_portal=True if args.portal else None, limit=args.limit)
+            for row in rows:
+                print(f"{row['path']}  sprite {row['sprite_index']}  ({row['asset_type']})")
+            print(f"{len(rows)} sprites")
+        else:
+            print(json.dumps(catalog.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
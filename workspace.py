@@ -0,0 +1,167 @@
+import os
+import pygame
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any
+from spritesheet_model import SpritesheetModel
+from sprite_analysis import SpriteAnalyzer
+
+DEFAULT_PIXEL_BUDGET_BYTES = 512 * 1024 * 1024
+
+
+class SheetEntry:
+    """One open spritesheet: its model, analyzer and the analysis file it is saved to"""
+
+    def __init__(self, key: str, image_path: str):
+        self.key = key
+        self.image_path = image_path
+        self.name = Path(image_path).name
+        self.model: Optional[SpritesheetModel] = None
+        self.analyzer: Optional[SpriteAnalyzer] = None
+        self.analysis_path: Optional[str] = None
+
+
+class Workspace:
+    """
+    Several open spritesheets with quick switching between them.
+
+    Each sheet keeps its own model and analyzer, so analysis results survive switching.
+    Decoded pixels (the spritesheet surface plus the analyzer's per-sprite surfaces) live in
+    one LRU cache shared by all sheets and bounded by pixel_budget_bytes; evicted sheets are
+    re-decoded the next time they are activated. The active sheet is never evicted.
+    """
+
+    def __init__(self, pixel_budget_bytes: int = DEFAULT_PIXEL_BUDGET_BYTES):
+        self.pixel_budget_bytes = pixel_budget_bytes
+        self.sheets: Dict[str, SheetEntry] = {}
+        self.active_key: Optional[str] = None
+        # Sheet key -> (decoded surface, bytes held for it, image file (size, mtime) when decoded), least recently used first
+        self._pixels: 'OrderedDict[str, Tuple[pygame.Surface, int, Optional[Tuple[int, int]]]]' = OrderedDict()
+
+    @staticmethod
+    def sheet_key(image_path: str) -> str:
+        """Catalog key for an image path"""
+        return os.path.normcase(os.path.abspath(image_path))
+
+    @property
+    def active(self) -> Optional[SheetEntry]:
+        """The sheet currently shown in the UI"""
+        return self.sheets.get(self.active_key) if self.active_key else None
+
+    @staticmethod
+    def _file_stamp(image_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get_surface(self, image_path: str) -> pygame.Surface:
+        """Get a decoded spritesheet surface, decoding it only if it is not cached or the file changed since"""
+        key = self.sheet_key(image_path)
+        stamp = self._file_stamp(image_path)
+        cached = self._pixels.get(key)
+        if cached and cached[2] == stamp:
+            self._pixels.move_to_end(key)
+            return cached[0]
+
+        surface = pygame.image.load(image_path).convert_alpha()
+        if cached:
+            # The image was edited on disk; sprite surfaces extracted from the old pixels are stale too
+            entry = self.sheets.get(key)
+            if entry and entry.analyzer:
+                entry.analyzer.release_sprite_surfaces()
+            print(f"[DEBUG] Workspace re-decoded {Path(image_path).name}: file changed on disk")
+        self._store_pixels(key, surface, stamp)
+        return surface
+
+    def _store_pixels(self, key: str, surface: pygame.Surface, stamp: Optional[Tuple[int, int]] = None):
+        """Cache a surface, counting a second copy for the analyzer's extracted sprite surfaces"""
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize() * 2
+        self._pixels[key] = (surface, size, stamp)
+        self._pixels.move_to_end(key)
+        self._evict_pixels(keep=key)
+
+    def _evict_pixels(self, keep: Optional[str] = None):
+        """Drop least recently used pixel data until the cache fits its budget (never the active sheet or keep)"""
+        total = sum(entry[1] for entry in self._pixels.values())
+        for key in list(self._pixels):
+            if total <= self.pixel_budget_bytes:
+                break
+            if key == self.active_key or key == keep:
+                continue
+            size = self._pixels.pop(key)[1]
+            total -= size
+            entry = self.sheets.get(key)
+            if entry and entry.analyzer:
+                entry.analyzer.release_sprite_surfaces()
+            print(f"[DEBUG] Workspace evicted pixels for {Path(key).name}")
+
+    def open_sheet(self, image_path: str) -> SheetEntry:
+        """Open (or return the already open) sheet for an image and make it active"""
+        key = self.sheet_key(image_path)
+        entry = self.sheets.get(key)
+        if entry is None:
+            entry = SheetEntry(key, image_path)
+            self.sheets[key] = entry
+        self.active_key = key
+        return entry
+
+    def attach_model(self, entry: SheetEntry, model: SpritesheetModel, analysis_path: Optional[str] = None) -> SpriteAnalyzer:
+        """Give a sheet a (new) model with its own analyzer over the cached pixels"""
+        entry.model = model
+        entry.analyzer = SpriteAnalyzer(model)
+        entry.analyzer.load_spritesheet_surface(self.get_surface(entry.image_path))
+        if analysis_path:
+            entry.analysis_path = str(analysis_path)
+        return entry.analyzer
+
+    def activate(self, key: str) -> SheetEntry:
+        """Switch to an open sheet, restoring its pixels only if they were evicted"""
+        entry = self.sheets[key]
+        self.active_key = key
+        surface = self.get_surface(entry.image_path)
+        if entry.analyzer and not entry.analyzer.has_sprite_surfaces():
+            entry.analyzer.load_spritesheet_surface(surface)
+        return entry
+
+    def cycle(self, step: int) -> Optional[SheetEntry]:
+        """Activate the next (step=1) or previous (step=-1) open sheet that has a model"""
+        keys = [key for key, entry in self.sheets.items() if entry.model is not None]
+        if not keys:
+            return None
+        if self.active_key not in keys:
+            return self.activate(keys[0])
+        index = (keys.index(self.active_key) + step) % len(keys)
+        return self.activate(keys[index])
+
+    def entry_for_model(self, model: Optional[SpritesheetModel]) -> Optional[SheetEntry]:
+        """Find the sheet that owns a model"""
+        for entry in self.sheets.values():
+            if entry.model is model:
+                return entry
+        return None
+
+    def close_sheet(self, key: str):
+        """Forget a sheet and its cached pixels"""
+        self.sheets.pop(key, None)
+        self._pixels.pop(key, None)
+        if self.active_key == key:
+            self.active_key = None
+
+    def catalog(self) -> List[Dict[str, Any]]:
+        """Summary of every open sheet for quick switching"""
+        summaries = []
+        for key, entry in self.sheets.items():
+            model = entry.model
+            summaries.append({
+                'key': key,
+                'name': entry.name,
+                'analysis_path': entry.analysis_path,
+                'sprites': len(model.sprites) if model else 0,
+                'analyzed': sum(1 for sprite in model.sprites if sprite.bbox) if model else 0,
+                'unsaved_changes': model.has_unsaved_changes() if model else False,
+                'pixels_cached': key in self._pixels,
+                'active': key == self.active_key
+            })
+        return summaries